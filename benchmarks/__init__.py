@@ -0,0 +1,2 @@
+# Benchmark suite: python -m benchmarks --help
+from benchmarks.runner import BENCHMARKS, benchmark, measure, summarize, percentile, run, compare
@@ -0,0 +1,127 @@
+# Command line entry point: python -m benchmarks [run|compare|alloc|tune|list]
+import argparse
+import fnmatch
+import sys
+from benchmarks import allocations, runner, tuning
+import benchmarks.suites  # noqa: F401  (registers the benchmarks)
+
+
+def select(patterns: list[str]) -> list[str]:
+    """Benchmark names matching any of the glob patterns (all of them if none are given)."""
+    names = list(runner.BENCHMARKS)
+    if not patterns:
+        return names
+    return [name for name in names if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+
+
+def print_result(name: str, result: dict) -> None:
+    line = f"{name:<36} median {runner.format_time(result['median']):>12}   p99 {runner.format_time(result['p99']):>12}"
+    if result["items"] > 1:
+        line += f"   per item {runner.format_time(result['median_per_item']):>12}"
+    print(line, flush=True)
+
+
+def print_comparison(rows: list[dict]) -> int:
+    """Print a comparison table and return the number of regressions."""
+    for row in rows:
+        print(
+            f"{row['name']:<36} {runner.format_time(row['baseline']):>12} -> {runner.format_time(row['current']):>12}"
+            f"   x{row['ratio']:.2f}  {row['status']}"
+        )
+    regressions = [row for row in rows if row["status"] == "regression"]
+    print(f"{len(regressions)} regression(s) in {len(rows)} compared benchmark(s).")
+    return len(regressions)
+
+
+def print_allocations(name: str, result: dict) -> None:
+    print(
+        f"{name:<36} peak {result['peak_per_item']:>9.0f} B/item   retained {result['retained']:>7.0f} B/call"
+        f"   gc {result['gc_collections']:.2f}/call",
+        flush=True,
+    )
+
+
+def print_budgets(rows: list[dict]) -> int:
+    """Print the budget check and return the number of failures."""
+    failures = [row for row in rows if row["status"] != "ok"]
+    for row in failures:
+        print(f"{row['name']:<36} {row['status'].upper()}: peak {row['peak_per_item']:.0f} B/item, budget {row['budget']} B")
+    print(f"{len(failures)} of {len(rows)} allocation budget(s) exceeded.")
+    return len(failures)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks for the X25519 and Ed25519 implementations.")
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="run benchmarks (the default)")
+    run_parser.add_argument("patterns", nargs="*", help="glob patterns of benchmarks to run, e.g. 'ed25519.*'")
+    run_parser.add_argument("--warmup", type=int, default=2, help="untimed calls before measuring")
+    run_parser.add_argument("--repeats", type=int, default=15, help="samples per benchmark")
+    run_parser.add_argument("--min-sample-time", type=float, default=0.02, help="seconds per sample for fast calls")
+    run_parser.add_argument("--output", "-o", help="write the results as JSON to this file")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="compare the results against a saved JSON report")
+    run_parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown flagged as a regression")
+
+    compare_parser = commands.add_parser("compare", help="compare two saved JSON reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    alloc_parser = commands.add_parser("alloc", help="profile allocations with tracemalloc and check the budgets")
+    alloc_parser.add_argument("patterns", nargs="*", help="glob patterns of benchmarks (default: those with a budget)")
+    alloc_parser.add_argument("--warmup", type=int, default=2, help="untraced calls before profiling")
+    alloc_parser.add_argument("--repeats", type=int, default=5, help="profiled calls per benchmark")
+    alloc_parser.add_argument("--output", "-o", help="write the results as JSON to this file")
+    alloc_parser.add_argument("--no-check", action="store_true", help="report only, do not fail on exceeded budgets")
+
+    tune_parser = commands.add_parser("tune", help="measure batch thresholds, window widths and worker counts, and save a tuning profile")
+    tune_parser.add_argument("--output", "-o", help="profile to write (default: P79_TUNING or ~/.cache/p79-25519/tuning.json)")
+    tune_parser.add_argument("--repeats", type=int, default=5, help="samples per measurement")
+    tune_parser.add_argument("--no-workers", action="store_true", help="do not tune the process pool")
+
+    list_parser = commands.add_parser("list", help="list the benchmarks")
+    list_parser.add_argument("patterns", nargs="*")
+
+    args = parser.parse_args(argv if argv is not None else (sys.argv[1:] or ["run"]))
+
+    if args.command == "list":
+        print("\n".join(select(args.patterns)))
+        return 0
+
+    if args.command == "compare":
+        rows = runner.compare(runner.load(args.baseline), runner.load(args.current), args.threshold)
+        return 1 if print_comparison(rows) else 0
+
+    if args.command == "tune":
+        if args.output is None and tuning.tuning.profile_path() is None:
+            parser.error("P79_TUNING is empty: pass --output")
+        path, _ = tuning.run(args.output, repeats=args.repeats, workers=not args.no_workers,
+                             report=lambda name, value: print(f"{name:<36} {value}", flush=True))
+        print(f"Saved the tuning profile to {path}.")
+        return 0
+
+    if args.command == "alloc":
+        names = select(args.patterns) if args.patterns else [name for name in allocations.BUDGETS if name in runner.BENCHMARKS]
+        if not names:
+            parser.error("no benchmark matches the given patterns")
+        report = allocations.run(names, args.warmup, args.repeats, report=print_allocations)
+        if args.output:
+            runner.save(report, args.output)
+        if args.no_check:
+            return 0
+        return 1 if print_budgets(allocations.check_budgets(report)) else 0
+
+    names = select(args.patterns)
+    if not names:
+        parser.error("no benchmark matches the given patterns")
+    report = runner.run(names, args.warmup, args.repeats, args.min_sample_time, report=print_result)
+    if args.output:
+        runner.save(report, args.output)
+    if args.compare:
+        return 1 if print_comparison(runner.compare(runner.load(args.compare), report, args.threshold)) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# Allocation profiling of the benchmarks with tracemalloc, and per-operation budgets
+import gc
+import sys
+import tracemalloc
+from typing import Callable, Optional
+from benchmarks.runner import BENCHMARKS, environment
+
+# Peak traced memory allowed per call (per item for batches), in bytes. The peaks are
+# transient big ints and point tuples; the budgets leave about 2x headroom over the
+# measured values, so doubling the working set of an operation fails the check.
+BUDGETS: dict[str, int] = {
+    "point.scalar_mult": 4 * 1024,
+    "ed25519.keygen": 4 * 1024,
+    "ed25519.keygen_bulk[1000]": 1024,
+    "ed25519.sign": 6 * 1024,
+    "ed25519.verify": 12 * 1024,
+    "ed25519.verify_lattice": 16 * 1024,
+    "ed25519.verify_batch[100]": 2 * 1024,
+    "x25519.ladder": 4 * 1024,
+    "x25519.double_and_add": 4 * 1024,
+    "x25519.scalar_multiply_many[1000]": 8 * 1024,
+}
+
+# Memory a call may leave behind on average (bytes per call). Freed objects kept on
+# CPython's free lists show up as a few dozen bytes now and then; a real leak grows
+# by at least one object per call.
+RETAINED_TOLERANCE = 256
+
+
+class AllocationBudgetExceeded(RuntimeError):
+    """Raised by enforce_budgets when an operation allocates more than its budget."""
+
+
+def profile(function: Callable[[], object], items: int = 1, warmup: int = 2, repeats: int = 5) -> dict:
+    """
+    Run `function` under tracemalloc and report its memory behaviour per call:
+
+        peak: the largest traced memory above the starting point during one call
+            (the transient big ints and tuples of the computation)
+        peak_per_item: peak / items
+        retained: memory still held after a call, averaged over the calls after the
+            first (a leak shows up here; caches are filled by the warm-up calls and
+            CPython's free lists by the first profiled call)
+        blocks: net allocated blocks per call, over the same calls (sys.getallocatedblocks)
+        gc_collections: garbage collections triggered per call (all generations)
+
+    tracemalloc does not see memory that is freed before the peak is read, so the peak,
+    not a count of allocations, is what measures the working set of an operation.
+    """
+    if repeats < 2:
+        raise ValueError("repeats must be at least 2.")
+    for _ in range(warmup):
+        function()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        # Nothing is allocated in this loop that outlives an iteration, so the
+        # profiler itself does not show up as retained memory
+        peak = 0
+        start_collections = sum(stats["collections"] for stats in gc.get_stats())
+        for i in range(repeats):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            function()
+            current, high = tracemalloc.get_traced_memory()
+            peak = max(peak, high - before)
+            if i == 0:
+                first_memory, first_blocks = current, sys.getallocatedblocks()
+        retained = current - first_memory
+        blocks = sys.getallocatedblocks() - first_blocks
+        collections = sum(stats["collections"] for stats in gc.get_stats()) - start_collections
+    finally:
+        if started:
+            tracemalloc.stop()
+    return {
+        "peak": peak,
+        "peak_per_item": peak / items,
+        "retained": retained / (repeats - 1),
+        "blocks": blocks / (repeats - 1),
+        "gc_collections": collections / repeats,
+        "items": items,
+        "repeats": repeats,
+    }
+
+
+def run(
+    names: Optional[list[str]] = None,
+    warmup: int = 2,
+    repeats: int = 5,
+    report: Optional[Callable[[str, dict], None]] = None,
+) -> dict:
+    """Profile the selected benchmarks (those with a budget by default) and return a JSON-serializable report."""
+    results = {}
+    for name in names if names is not None else list(BUDGETS):
+        factory, items = BENCHMARKS[name]
+        results[name] = profile(factory(), items, warmup, repeats)
+        if report is not None:
+            report(name, results[name])
+    return {"meta": environment(), "results": results}
+
+
+def check_budgets(report: dict, budgets: Optional[dict[str, int]] = None) -> list[dict]:
+    """
+    Check the profiled benchmarks that have a budget. Returns one row per checked
+    benchmark, with status "ok", "over budget" (peak per item above the budget) or
+    "leak" (more than RETAINED_TOLERANCE bytes retained per call).
+    """
+    budgets = BUDGETS if budgets is None else budgets
+    rows = []
+    for name, result in report["results"].items():
+        if name not in budgets:
+            continue
+        if result["peak_per_item"] > budgets[name]:
+            status = "over budget"
+        elif result["retained"] > RETAINED_TOLERANCE:
+            status = "leak"
+        else:
+            status = "ok"
+        rows.append({"name": name, "peak_per_item": result["peak_per_item"], "budget": budgets[name],
+                     "retained": result["retained"], "status": status})
+    return rows
+
+
+def enforce_budgets(report: dict, budgets: Optional[dict[str, int]] = None) -> None:
+    """Raise AllocationBudgetExceeded listing every benchmark that fails check_budgets."""
+    failures = [row for row in check_budgets(report, budgets) if row["status"] != "ok"]
+    if failures:
+        raise AllocationBudgetExceeded("; ".join(
+            f"{row['name']}: {row['status']} (peak {row['peak_per_item']:.0f} B per item, "
+            f"budget {row['budget']} B, retained {row['retained']:.0f} B per call)"
+            for row in failures
+        ))
@@ -0,0 +1,161 @@
+# Timing, statistics, JSON output and baseline comparison for the benchmark suite
+import json
+import platform
+import sys
+import time
+from typing import Callable, Optional
+
+# A benchmark is a factory that does its (untimed) setup and returns the function to time
+Factory = Callable[[], Callable[[], object]]
+
+BENCHMARKS: dict[str, tuple[Factory, int]] = {}
+
+
+def benchmark(name: str, items: int = 1) -> Callable[[Factory], Factory]:
+    """
+    Register a benchmark under `name`. `items` is how many operations one call
+    performs (e.g. the batch size), so results can also be reported per item.
+    """
+    def register(factory: Factory) -> Factory:
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name!r} is registered twice.")
+        BENCHMARKS[name] = (factory, items)
+        return factory
+    return register
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """The q-th percentile (0 <= q <= 100) of the samples, by the nearest-rank method."""
+    if not samples:
+        raise ValueError("No samples.")
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples: list[float], items: int = 1) -> dict:
+    """Median, p99, mean, min and max of per-call times (seconds), plus the median per item."""
+    median = percentile(samples, 50)
+    return {
+        "median": median,
+        "p99": percentile(samples, 99),
+        "mean": sum(samples) / len(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "repeats": len(samples),
+        "items": items,
+        "median_per_item": median / items,
+    }
+
+
+def measure(
+    function: Callable[[], object],
+    warmup: int = 2,
+    repeats: int = 15,
+    min_sample_time: float = 0.02,
+    clock: Callable[[], float] = time.perf_counter,
+) -> list[float]:
+    """
+    Time `function` and return `repeats` samples of the time per call.
+
+    After `warmup` untimed calls, the number of calls per sample is doubled until a
+    sample takes at least `min_sample_time`, so fast primitives are not lost in the
+    timer resolution; slow calls are timed one at a time.
+    """
+    for _ in range(warmup):
+        function()
+
+    number = 1
+    while True:
+        start = clock()
+        for _ in range(number):
+            function()
+        elapsed = clock() - start
+        if elapsed >= min_sample_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    samples = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = clock()
+        for _ in range(number):
+            function()
+        samples.append((clock() - start) / number)
+    return samples
+
+
+def run(
+    names: Optional[list[str]] = None,
+    warmup: int = 2,
+    repeats: int = 15,
+    min_sample_time: float = 0.02,
+    report: Optional[Callable[[str, dict], None]] = None,
+) -> dict:
+    """Run the selected benchmarks (all by default) and return a JSON-serializable report."""
+    results = {}
+    for name in names if names is not None else list(BENCHMARKS):
+        factory, items = BENCHMARKS[name]
+        samples = measure(factory(), warmup, repeats, min_sample_time)
+        results[name] = summarize(samples, items)
+        if report is not None:
+            report(name, results[name])
+    return {"meta": environment(), "results": results}
+
+
+def environment() -> dict:
+    """Where the numbers came from, stored with every report."""
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy_version,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def save(report: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> list[dict]:
+    """
+    Compare the medians of two reports, for the benchmarks present in both.
+
+    Returns one row per benchmark with the ratio current / baseline; rows whose
+    ratio exceeds 1 + threshold are flagged as regressions, those below
+    1 - threshold as improvements.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["median"]
+        after = result["median"]
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        rows.append({"name": name, "baseline": before, "current": after, "ratio": ratio, "status": status})
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
@@ -0,0 +1,281 @@
+# The benchmarks: key generation, signing, verification, X25519 and the primitives below them
+import os
+from benchmarks.runner import benchmark
+from ed25519.ed25519 import Ed25519
+from ed25519.pipeline import VerificationPipeline
+from ed25519.threads import CryptoThreadPool
+from ed25519.workers import CryptoWorkerPool
+from ed25519.utils import (
+    prime_mod,
+    decode_edwards_point,
+    encode_edwards_point,
+    edwards_base_mult,
+    edwards_point_add_extended,
+    edwards_point_double_extended,
+    edwards_scalar_mult,
+)
+from x25519.x25519 import X25519
+from x25519.utils import field_mul, mult_inverse, sqrt_mod
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+MESSAGE = b"benchmark message " * 4
+
+
+_SIGNED: list[tuple[bytes, bytes, bytes]] = []
+
+
+def signed_batch(size: int) -> list[tuple[bytes, bytes, bytes]]:
+    """`size` signatures from distinct signers, grown as needed and shared by all benchmarks."""
+    if len(_SIGNED) < size:
+        ed25519 = Ed25519()
+        for private_key, public_key in ed25519.generate_keypairs(size - len(_SIGNED)):
+            message = MESSAGE + len(_SIGNED).to_bytes(4, "little")
+            _SIGNED.append((public_key, message, ed25519.sign(private_key, message)))
+    return _SIGNED[:size]
+
+
+def _point():
+    return edwards_base_mult(int.from_bytes(os.urandom(32), "little"))
+
+
+# Field and point primitives
+
+@benchmark("field.mul")
+def bench_field_mul():
+    a, b = (int.from_bytes(os.urandom(32), "little") % prime_mod for _ in range(2))
+    return lambda: field_mul(a, b, prime_mod)
+
+
+@benchmark("field.inverse")
+def bench_field_inverse():
+    a = int.from_bytes(os.urandom(32), "little") % prime_mod
+    return lambda: mult_inverse(a, prime_mod)
+
+
+@benchmark("field.sqrt")
+def bench_field_sqrt():
+    a = pow(int.from_bytes(os.urandom(32), "little"), 2, prime_mod)
+    return lambda: sqrt_mod(a, prime_mod)
+
+
+@benchmark("point.add")
+def bench_point_add():
+    P, Q = _point(), _point()
+    return lambda: edwards_point_add_extended(P, Q)
+
+
+@benchmark("point.double")
+def bench_point_double():
+    P = _point()
+    return lambda: edwards_point_double_extended(P)
+
+
+@benchmark("point.encode")
+def bench_point_encode():
+    P = _point()
+    return lambda: encode_edwards_point(P)
+
+
+@benchmark("point.decode")
+def bench_point_decode():
+    encoded = encode_edwards_point(_point())
+    return lambda: decode_edwards_point(encoded)
+
+
+@benchmark("point.base_mult")
+def bench_base_mult():
+    scalar = int.from_bytes(os.urandom(32), "little")
+    return lambda: edwards_base_mult(scalar)
+
+
+@benchmark("point.scalar_mult")
+def bench_scalar_mult():
+    P, scalar = _point(), int.from_bytes(os.urandom(32), "little")
+    return lambda: edwards_scalar_mult(scalar, P)
+
+
+# Ed25519
+
+@benchmark("ed25519.keygen")
+def bench_keygen():
+    ed25519, private_key = Ed25519(), os.urandom(32)
+    return lambda: ed25519.generate_public_key(private_key)
+
+
+@benchmark("ed25519.keygen_bulk[1000]", items=1000)
+def bench_keygen_bulk():
+    ed25519 = Ed25519()
+    return lambda: list(ed25519.generate_keypairs(1000))
+
+
+@benchmark("ed25519.sign")
+def bench_sign():
+    ed25519, private_key = Ed25519(), os.urandom(32)
+    return lambda: ed25519.sign(private_key, MESSAGE)
+
+
+@benchmark("ed25519.verify")
+def bench_verify():
+    ed25519 = Ed25519()
+    entry = signed_batch(1)[0]
+    return lambda: ed25519.verify(*entry)
+
+
+@benchmark("ed25519.verify_lattice")
+def bench_verify_lattice():
+    ed25519 = Ed25519(verify_method="lattice")
+    entry = signed_batch(1)[0]
+    return lambda: ed25519.verify(*entry)
+
+
+def _register_verify_batch(size: int) -> None:
+    @benchmark(f"ed25519.verify_batch[{size}]", items=size)
+    def bench_verify_batch():
+        ed25519, batch = Ed25519(), signed_batch(size)
+        return lambda: ed25519.verify_batch(batch)
+
+
+for _size in BATCH_SIZES:
+    _register_verify_batch(_size)
+
+
+# Half-aggregates of the same signatures, for comparison with verify_batch
+
+AGGREGATE_SIZES = (10, 100, 1000)
+
+
+def _register_aggregate(size: int) -> None:
+    @benchmark(f"ed25519.aggregate[{size}]", items=size)
+    def bench_aggregate():
+        ed25519, batch = Ed25519(), signed_batch(size)
+        return lambda: ed25519.aggregate(batch)
+
+    @benchmark(f"ed25519.verify_aggregate[{size}]", items=size)
+    def bench_verify_aggregate():
+        ed25519, batch = Ed25519(), signed_batch(size)
+        entries, aggregate = [entry[:2] for entry in batch], ed25519.aggregate(batch)
+        return lambda: ed25519.verify_aggregate(entries, aggregate)
+
+
+for _size in AGGREGATE_SIZES:
+    _register_aggregate(_size)
+
+
+# X25519
+
+@benchmark("x25519.ladder")
+def bench_ladder():
+    x25519, private_key, public_key = X25519("ladder"), os.urandom(32), X25519().generate_public_key(os.urandom(32))
+    return lambda: x25519.scalar_multiply(private_key, public_key)
+
+
+@benchmark("x25519.double_and_add")
+def bench_double_and_add():
+    x25519, private_key, public_key = X25519("double_and_add"), os.urandom(32), X25519().generate_public_key(os.urandom(32))
+    return lambda: x25519.scalar_multiply(private_key, public_key)
+
+
+@benchmark("x25519.scalar_multiply_many[1000]", items=1000)
+def bench_scalar_multiply_many():
+    x25519 = X25519()
+    pairs = [(os.urandom(32), os.urandom(32)) for _ in range(1000)]
+    return lambda: x25519.scalar_multiply_many(pairs)
+
+
+# Process pool (one worker per core)
+
+_POOL = None
+
+
+def _pool():
+    global _POOL
+    if _POOL is None:
+        _POOL = CryptoWorkerPool()
+    return _POOL
+
+
+@benchmark("workers.sign_many[1000]", items=1000)
+def bench_pool_sign_many():
+    pool, requests = _pool(), [(os.urandom(32), MESSAGE) for _ in range(1000)]
+    return lambda: list(pool.sign_many(requests))
+
+
+@benchmark("workers.scalar_multiply_many[1000]", items=1000)
+def bench_pool_scalar_multiply_many():
+    pool, pairs = _pool(), [(os.urandom(32), os.urandom(32)) for _ in range(1000)]
+    return lambda: list(pool.scalar_multiply_many(pairs))
+
+
+# Thread pool by thread count. Sharding is forced on, so on a GIL build these show
+# what the threads would cost (the pool itself runs serially there by default).
+
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+def _register_threads(threads: int) -> None:
+    @benchmark(f"threads[{threads}].verify_batch[512]", items=512)
+    def bench_threads_verify_batch():
+        pool, batch = CryptoThreadPool(threads, parallel=True), signed_batch(512)
+        return lambda: pool.verify_batch(batch)
+
+    @benchmark(f"threads[{threads}].scalar_multiply_many[1024]", items=1024)
+    def bench_threads_scalar_multiply_many():
+        pool, pairs = CryptoThreadPool(threads, parallel=True), [(os.urandom(32), os.urandom(32)) for _ in range(1024)]
+        return lambda: pool.scalar_multiply_many(pairs)
+
+
+for _threads in THREAD_COUNTS:
+    _register_threads(_threads)
+
+
+# Large messages: a stream of batches verified one after the other, against the
+# pipeline hashing the next batches while the current one is checked
+
+LARGE_MESSAGE_SIZE = 1 << 20
+LARGE_BATCHES = 4
+LARGE_BATCH_SIZE = 16
+
+
+def _large_batches() -> list[list[tuple[bytes, bytes, bytes]]]:
+    ed25519, message = Ed25519(), os.urandom(LARGE_MESSAGE_SIZE)
+    batch = []
+    for private_key, public_key in ed25519.generate_keypairs(LARGE_BATCH_SIZE):
+        batch.append((public_key, message, ed25519.sign(private_key, message)))
+    return [batch] * LARGE_BATCHES
+
+
+@benchmark(f"ed25519.verify_batch[{LARGE_BATCHES}x{LARGE_BATCH_SIZE}x1MB]", items=LARGE_BATCHES * LARGE_BATCH_SIZE)
+def bench_verify_batches_large():
+    ed25519, batches = Ed25519(), _large_batches()
+    return lambda: all([ed25519.verify_batch(batch) for batch in batches])
+
+
+@benchmark(f"pipeline.verify_batches[{LARGE_BATCHES}x{LARGE_BATCH_SIZE}x1MB]", items=LARGE_BATCHES * LARGE_BATCH_SIZE)
+def bench_pipeline_verify_batches_large():
+    pipeline, batches = VerificationPipeline(), _large_batches()
+    return lambda: all(list(pipeline.verify_batches(batches)))
+
+
+# PyNaCl (libsodium) baselines, when installed
+
+try:
+    from nacl import bindings as _nacl
+except ImportError:
+    _nacl = None
+
+if _nacl is not None:
+    @benchmark("pynacl.sign")
+    def bench_pynacl_sign():
+        _, secret_key = _nacl.crypto_sign_seed_keypair(os.urandom(32))
+        return lambda: _nacl.crypto_sign(MESSAGE, secret_key)
+
+    @benchmark("pynacl.verify")
+    def bench_pynacl_verify():
+        public_key, message, signature = signed_batch(1)[0]
+        return lambda: _nacl.crypto_sign_open(signature + message, public_key)
+
+    @benchmark("pynacl.x25519")
+    def bench_pynacl_x25519():
+        private_key, public_key = os.urandom(32), _nacl.crypto_scalarmult_base(os.urandom(32))
+        return lambda: _nacl.crypto_scalarmult(private_key, public_key)
@@ -0,0 +1,186 @@
+# Autotuning: measure the settings of x25519.tuning on this host and save them as a profile
+import os
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+import ed25519.ed25519
+import ed25519.vectorized
+import ed25519.workers
+from benchmarks.runner import environment, measure
+from benchmarks.suites import MESSAGE, signed_batch
+from ed25519.ed25519 import Ed25519
+from ed25519.workers import CryptoWorkerPool
+from x25519 import tuning
+from x25519.utils import HAVE_NUMPY
+from x25519.x25519 import X25519
+
+BATCH_VERIFY_SIZES = (2, 4, 8, 16, 32, 64, 128, 256, 512)
+VECTORIZED_SIZES = (16, 32, 64, 128, 256, 512)
+X25519_SIZES = (8, 16, 32, 64, 128, 256)
+BUCKET_WINDOWS = (5, 6, 7, 8, 9, 10)
+BUCKET_WINDOW_BATCH = 512
+SHARD_SIZES = (16, 64, 256, 1024)
+
+
+@contextmanager
+def override(module, name: str, value) -> Iterator[None]:
+    """Set a module constant for the duration of a measurement."""
+    saved = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, saved)
+
+
+def time_call(function: Callable[[], object], repeats: int) -> float:
+    """
+    Seconds per call, the fastest sample: the choices compare paths on the same
+    host, and the minimum is the estimate least disturbed by other load.
+    """
+    return min(measure(function, warmup=1, repeats=repeats, min_sample_time=0.01))
+
+
+def crossover(
+    sizes: Sequence[int],
+    baseline: Callable[[int], Callable[[], object]],
+    candidate: Callable[[int], Callable[[], object]],
+    repeats: int = 5,
+) -> int:
+    """
+    The smallest of the (increasing) sizes from which the candidate is faster than the
+    baseline at that size and at every larger size measured, or one past the largest
+    size if it never is. baseline(size) and candidate(size) return the calls to time.
+    """
+    faster = [time_call(candidate(size), repeats) < time_call(baseline(size), repeats) for size in sizes]
+    threshold = sizes[-1] + 1
+    for size, won in reversed(list(zip(sizes, faster))):
+        if not won:
+            break
+        threshold = size
+    return threshold
+
+
+def tune_batch_verify_min(sizes: Sequence[int] = BATCH_VERIFY_SIZES, repeats: int = 5) -> int:
+    """
+    Smallest batch for which verify_batch beats verifying each signature, with the
+    batch path verify_batch picks by size (so tune the vectorized settings first).
+    """
+    engine = Ed25519()
+
+    def one_by_one(size):
+        batch = signed_batch(size)
+        return lambda: all(engine.verify(*entry) for entry in batch)
+
+    def batched(size):
+        batch = signed_batch(size)
+        return lambda: engine.verify_batch(batch)
+
+    with override(ed25519.ed25519, "BATCH_VERIFY_MIN", 2):
+        return crossover(sizes, one_by_one, batched, repeats)
+
+
+def tune_bucket_window(
+    windows: Sequence[int] = BUCKET_WINDOWS, size: int = BUCKET_WINDOW_BATCH, repeats: int = 5
+) -> int:
+    """The fastest bucket width for a NumPy batch verification of `size` signatures."""
+    engine, batch = Ed25519(), signed_batch(size)
+    timings = {}
+    for window in windows:
+        with override(ed25519.vectorized, "BUCKET_WINDOW", window):
+            timings[window] = time_call(lambda: engine.verify_batch(batch, vectorized=True), repeats)
+    return min(timings, key=timings.get)
+
+
+def tune_vectorized_batch_min(sizes: Sequence[int] = VECTORIZED_SIZES, repeats: int = 5) -> int:
+    """Smallest batch for which the NumPy bucket method beats the scalar batch path."""
+    engine = Ed25519()
+
+    def path(vectorized):
+        def call(size):
+            batch = signed_batch(size)
+            return lambda: engine.verify_batch(batch, vectorized=vectorized)
+        return call
+
+    return crossover(sizes, path(False), path(True), repeats)
+
+
+def tune_x25519_vectorized_min_batch(sizes: Sequence[int] = X25519_SIZES, repeats: int = 5) -> int:
+    """Smallest bulk X25519 job for which the NumPy ladder beats one ladder per pair."""
+    engine = X25519()
+
+    def path(vectorized):
+        def call(size):
+            pairs = [(os.urandom(32), os.urandom(32)) for _ in range(size)]
+            return lambda: engine.scalar_multiply_many(pairs, vectorized=vectorized)
+        return call
+
+    return crossover(sizes, path(False), path(True), repeats)
+
+
+def tune_workers(
+    sizes: Sequence[int] = SHARD_SIZES, processes: Optional[Sequence[int]] = None, repeats: int = 3
+) -> tuple[int, int]:
+    """
+    (workers.processes, workers.shard_min_items): the pool size with the best signing
+    throughput on the largest job (trying 1, 2, 4, ... up to the number of cores), and
+    the smallest job for which that pool beats signing in the calling process.
+    """
+    cores = os.cpu_count() or 1
+    if processes is None:
+        processes = sorted({min(1 << i, cores) for i in range(cores.bit_length() + 1)})
+    requests = [(os.urandom(32), MESSAGE) for _ in range(max(sizes))]
+    engine = Ed25519()
+
+    def local(size):
+        out = bytearray(64 * size)
+        return lambda: engine.sign_many_into(requests[:size], out)
+
+    with override(ed25519.workers, "SHARD_MIN_ITEMS", 1):
+        timings = {}
+        for count in processes:
+            with CryptoWorkerPool(count) as pool:
+                timings[count] = time_call(lambda: list(pool.sign_many(requests)), repeats)
+        best = min(timings, key=timings.get)
+        with CryptoWorkerPool(best) as pool:
+            shard_min_items = crossover(
+                sizes, local, lambda size: lambda: list(pool.sign_many(requests[:size])), repeats
+            )
+    # 0 keeps "one worker per core", which stays right if the profile is copied to a bigger host
+    return (0 if best == cores else best), shard_min_items
+
+
+def autotune(
+    repeats: int = 5,
+    workers: bool = True,
+    report: Optional[Callable[[str, int], None]] = None,
+) -> dict[str, int]:
+    """
+    Measure every setting that can be measured here and return them (the NumPy
+    settings need NumPy; workers=False skips the process pool, the slowest part).
+    """
+    settings = {}
+
+    def found(name, value):
+        settings[name] = value
+        if report is not None:
+            report(name, value)
+
+    if HAVE_NUMPY:
+        found("ed25519.bucket_window", tune_bucket_window(repeats=repeats))
+        with override(ed25519.vectorized, "BUCKET_WINDOW", settings["ed25519.bucket_window"]):
+            found("ed25519.vectorized_batch_min", tune_vectorized_batch_min(repeats=repeats))
+        found("x25519.vectorized_min_batch", tune_x25519_vectorized_min_batch(repeats=repeats))
+    with override(ed25519.vectorized, "BUCKET_WINDOW", settings.get("ed25519.bucket_window", ed25519.vectorized.BUCKET_WINDOW)), \
+            override(ed25519.ed25519, "VECTORIZED_BATCH_MIN", settings.get("ed25519.vectorized_batch_min", ed25519.ed25519.VECTORIZED_BATCH_MIN)):
+        found("ed25519.batch_verify_min", tune_batch_verify_min(repeats=repeats))
+    if workers:
+        processes, shard_min_items = tune_workers(repeats=min(repeats, 3))
+        found("workers.processes", processes)
+        found("workers.shard_min_items", shard_min_items)
+    return settings
+
+
+def run(path: Optional[str] = None, **options) -> tuple[str, dict[str, int]]:
+    """Autotune and save the profile (to tuning.profile_path() by default); returns (path, settings)."""
+    settings = autotune(**options)
+    return tuning.save(settings, path, meta=environment()), settings
@@ -0,0 +1,265 @@
+# Command line entry point: python -m ed25519 [keygen|sign|verify]
+import argparse
+import functools
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterator, Optional
+from ed25519 import records
+from ed25519.ed25519 import Ed25519
+
+DEFAULT_BATCH_SIZE = 256
+
+_instances: dict[Optional[str], Ed25519] = {}
+
+
+def _ed25519(backend: Optional[str]) -> Ed25519:
+    """One Ed25519 instance per backend and process (worker processes make their own)."""
+    if backend not in _instances:
+        _instances[backend] = Ed25519(backend=backend)
+    return _instances[backend]
+
+
+def verify_batch(backend: Optional[str], batch: list[records.Record]) -> list[bool]:
+    """Verdicts for a batch: one batch equation, and single verifications only if it fails."""
+    ed25519 = _ed25519(backend)
+    if ed25519.verify_batch(batch):
+        return [True] * len(batch)
+    return [ed25519.verify(*record) for record in batch]
+
+
+def sign_batch(private_key: bytes, backend: Optional[str], batch: list[tuple[Optional[dict], bytes]]) -> bytes:
+    """The signatures of the messages of a batch, back to back."""
+    out = bytearray(64 * len(batch))
+    _ed25519(backend).sign_many_into([(private_key, message) for _, message in batch], out)
+    return bytes(out)
+
+
+def read_private_key(path: str) -> bytes:
+    """A 32-byte seed, stored raw or as 64 hex digits."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) == 32:
+        return data
+    try:
+        seed = bytes.fromhex(data.decode("ascii").strip())
+    except ValueError:
+        seed = b""
+    if len(seed) != 32:
+        raise ValueError(f"{path} does not hold a 32-byte private key (raw or hex).")
+    return seed
+
+
+# Checkpoints: after each batch the output is flushed to disk, then the input offset,
+# record count and output size are saved (atomically replacing the previous checkpoint).
+# A restart with the same checkpoint truncates the output to the saved size and
+# continues from the saved offset, so every record is processed and written once.
+
+def load_checkpoint(path: Optional[str], command: str, input_name: str) -> dict:
+    state = {"command": command, "input": input_name, "offset": 0, "records": 0, "invalid": 0, "output_size": 0}
+    if path is None or not os.path.exists(path):
+        return state
+    with open(path) as f:
+        saved = json.load(f)
+    if saved.get("command") != command or saved.get("input") != input_name:
+        raise ValueError(f"The checkpoint {path} belongs to '{saved.get('command')}' of {saved.get('input')}.")
+    state.update(saved)
+    return state
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    temporary = path + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+@contextmanager
+def open_input(path: str, parse: records.Parser, offset: int) -> Iterator[Iterator[tuple[int, object]]]:
+    """(end offset, item) pairs from offset on: the file is memory-mapped, stdin ("-") is streamed."""
+    if path == "-":
+        yield records.read_stream(sys.stdin.buffer, parse, offset)
+        return
+    with records.mapped(path) as buffer:
+        if offset > len(buffer):
+            raise ValueError("The input is shorter than the checkpoint offset.")
+        yield parse(buffer, offset, True)
+
+
+@contextmanager
+def open_output(path: str, resume_size: int) -> Iterator[BinaryIO]:
+    if path == "-":
+        yield sys.stdout.buffer
+        return
+    if resume_size:
+        if not os.path.exists(path) or os.path.getsize(path) < resume_size:
+            raise ValueError(f"The output {path} is shorter than the checkpoint says.")
+        with open(path, "r+b") as f:
+            f.truncate(resume_size)
+            f.seek(resume_size)
+            yield f
+        return
+    with open(path, "wb") as f:
+        yield f
+
+
+def batches(items: Iterator[tuple[int, object]], size: int) -> Iterator[tuple[int, list]]:
+    """Group (end offset, item) pairs into (end offset of the last item, items) batches."""
+    batch = []
+    end = 0
+    for end, item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield end, batch
+            batch = []
+    if batch:
+        yield end, batch
+
+
+def map_batches(work: Callable, batches: Iterator[tuple[int, list]], processes: int) -> Iterator[tuple[int, list, object]]:
+    """
+    (end offset, batch, work(batch)) in input order. With several processes, at most
+    two batches per process are in flight, so the input is read as fast as it is used.
+    """
+    if processes <= 1:
+        for end, batch in batches:
+            yield end, batch, work(batch)
+        return
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque()
+        for end, batch in batches:
+            pending.append((end, batch, executor.submit(work, batch)))
+            if len(pending) >= 2 * processes:
+                end, batch, future = pending.popleft()
+                yield end, batch, future.result()
+        while pending:
+            end, batch, future = pending.popleft()
+            yield end, batch, future.result()
+
+
+def process(args, command: str, parse: records.Parser, work: Callable, render: Callable[[dict, list, object], bytes]) -> dict:
+    """
+    Run work on every batch of the input (from the checkpoint on), write what render
+    makes of each result, and checkpoint after each batch. Returns the final state.
+    """
+    input_name = "-" if args.input == "-" else os.path.abspath(args.input)
+    state = load_checkpoint(args.checkpoint, command, input_name)
+    resume_size = state["output_size"] if args.output != "-" else 0
+    with open_output(args.output, resume_size) as out, open_input(args.input, parse, state["offset"]) as items:
+        for end, batch, result in map_batches(work, batches(items, args.batch_size), args.processes):
+            out.write(render(state, batch, result))
+            out.flush()
+            state["offset"] = end
+            state["records"] += len(batch)
+            if args.checkpoint is not None:
+                if args.output != "-":
+                    os.fsync(out.fileno())
+                    state["output_size"] = out.tell()
+                save_checkpoint(args.checkpoint, state)
+    return state
+
+
+def verify(args) -> int:
+    if args.format == "binary":
+        parse = functools.partial(records.parse_binary_records, message_size=args.message_size)
+    else:
+        parse = functools.partial(records.parse_json_records, encoding=args.encoding)
+
+    def render(state: dict, batch: list, verdicts: list[bool]) -> bytes:
+        first = state["records"]
+        state["invalid"] += verdicts.count(False)
+        return "".join(
+            f"{first + i}\t{'valid' if valid else 'invalid'}\n" for i, valid in enumerate(verdicts)
+        ).encode()
+
+    state = process(args, "verify", parse, functools.partial(verify_batch, args.backend), render)
+    print(f"{state['records']} record(s), {state['invalid']} invalid.", file=sys.stderr)
+    return 1 if state["invalid"] else 0
+
+
+def sign(args) -> int:
+    private_key = read_private_key(args.key)
+    public_key = _ed25519(args.backend).generate_public_key(private_key)
+    if args.format == "binary":
+        messages = functools.partial(records.parse_binary_messages, message_size=args.message_size)
+
+        def parse(buffer, offset, final):
+            for end, message in messages(buffer, offset, final):
+                yield end, (None, message)
+
+        def encode(obj, message, signature):
+            return records.encode_binary_record(public_key, message, signature, args.message_size)
+    else:
+        parse = functools.partial(records.parse_json_messages, encoding=args.encoding)
+
+        def encode(obj, message, signature):
+            return records.encode_json_record(obj, public_key, signature, args.encoding)
+
+    def render(state: dict, batch: list, signatures: bytes) -> bytes:
+        return b"".join(
+            encode(obj, message, signatures[64 * i:64 * (i + 1)]) for i, (obj, message) in enumerate(batch)
+        )
+
+    state = process(args, "sign", parse, functools.partial(sign_batch, private_key, args.backend), render)
+    print(f"{state['records']} record(s) signed.", file=sys.stderr)
+    return 0
+
+
+def keygen(args) -> int:
+    ed25519 = _ed25519(args.backend)
+    private_key = ed25519.generate_private_key()
+    # Never overwrite a key, and keep it readable by the owner only
+    fd = os.open(args.key, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(private_key.hex() + "\n")
+    print(ed25519.generate_public_key(private_key).hex())
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ed25519", description="Bulk Ed25519 signing and verification of record files.")
+    parser.add_argument("--backend", choices=["python", "libsodium", "auto"], help="arithmetic backend (default: P79_BACKEND or python)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    keygen_parser = commands.add_parser("keygen", help="create a private key file and print the public key")
+    keygen_parser.add_argument("key", help="file to create, holding the 32-byte seed in hex")
+
+    def add_record_options(command_parser):
+        command_parser.add_argument("input", nargs="?", default="-", help="input file, or - for stdin (the default)")
+        command_parser.add_argument("--output", "-o", default="-", help="output file, or - for stdout (the default)")
+        command_parser.add_argument("--format", choices=["binary", "jsonl"], default="jsonl",
+                                    help="jsonl: one JSON object per line; binary: public key, signature, "
+                                         "4-byte little-endian message length, message")
+        command_parser.add_argument("--encoding", choices=["hex", "base64"], default="hex", help="encoding of the JSON fields")
+        command_parser.add_argument("--message-size", type=int, help="binary records with fixed-size messages and no length field")
+        command_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="records per batch")
+        command_parser.add_argument("--processes", type=int, default=1, help="worker processes")
+        command_parser.add_argument("--checkpoint", help="progress file; rerunning with it resumes after the last finished batch")
+
+    verify_parser = commands.add_parser("verify", help="verify signed records and write one verdict line per record")
+    add_record_options(verify_parser)
+
+    sign_parser = commands.add_parser("sign", help="sign messages and write signed records")
+    sign_parser.add_argument("key", help="private key file (32 bytes raw, or hex)")
+    add_record_options(sign_parser)
+
+    args = parser.parse_args(argv)
+    if args.command != "keygen":
+        if args.batch_size <= 0 or args.processes <= 0:
+            parser.error("--batch-size and --processes must be positive")
+        if args.message_size is not None and args.message_size < 0:
+            parser.error("--message-size must be non-negative")
+    try:
+        return {"keygen": keygen, "sign": sign, "verify": verify}[args.command](args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# Bounded cache of successful Ed25519 verifications
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from ed25519.utils import sha512
+
+
+class _Stripe:
+    """The entries and counters of the keys that hash to one lock."""
+
+    __slots__ = ("lock", "entries", "hits", "misses", "evictions")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[bytes, float] = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+
+class VerificationCache:
+    """
+    An LRU cache that remembers (public_key, message, signature) triples which
+    have already verified successfully.
+
+    Entries are keyed by SHA-512(public_key || SHA-512(message) || signature), truncated
+    to 32 bytes, so the cache never holds on to the messages themselves. Only positive
+    results are stored: a failed verification is always recomputed, so a cache hit can
+    never turn an invalid signature into a valid one.
+
+    The cache is safe to share between threads. With stripes > 1 the keys are spread
+    over that many independent LRUs, each with its own lock and max_size / stripes
+    entries, so threads looking up different keys rarely wait for each other (on
+    free-threaded builds); eviction is then least recently used per stripe.
+
+    Args:
+        max_size: Maximum number of entries kept before the least recently used is evicted.
+        ttl: Optional lifetime of an entry in seconds (None means entries never expire).
+        clock: Time source used for the TTL (defaults to time.monotonic).
+        stripes: Number of lock stripes (1 keeps a single exact LRU).
+    """
+
+    def __init__(
+        self,
+        max_size: int = 65536,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        stripes: int = 1,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive or None.")
+        if not 0 < stripes <= max_size:
+            raise ValueError("stripes must be between 1 and max_size.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._stripes = [_Stripe() for _ in range(stripes)]
+        self._stripe_size = max_size // stripes
+
+    def _stripe(self, key: bytes) -> _Stripe:
+        # Keys are hash outputs, so their first bytes spread them evenly
+        return self._stripes[int.from_bytes(key[:4], "little") % len(self._stripes)]
+
+    @staticmethod
+    def key(public_key: bytes, message: bytes, signature: bytes) -> bytes:
+        """Compute the cache key for a (public_key, message, signature) triple."""
+        return sha512(bytes(public_key) + sha512(message) + bytes(signature))[:32]
+
+    def contains(self, key: bytes) -> bool:
+        """
+        Look up a key, counting the hit or miss.
+        Expired entries are dropped and reported as misses.
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stored_at = stripe.entries.get(key)
+            if stored_at is not None and self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del stripe.entries[key]
+                stored_at = None
+            if stored_at is None:
+                stripe.misses += 1
+                return False
+            stripe.entries.move_to_end(key)
+            stripe.hits += 1
+            return True
+
+    def add(self, key: bytes) -> None:
+        """Record a key whose triple verified successfully."""
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.entries[key] = self._clock()
+            stripe.entries.move_to_end(key)
+            while len(stripe.entries) > self._stripe_size:
+                stripe.entries.popitem(last=False)
+                stripe.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.hits = stripe.misses = stripe.evictions = 0
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    @property
+    def hits(self) -> int:
+        return sum(stripe.hits for stripe in self._stripes)
+
+    @property
+    def misses(self) -> int:
+        return sum(stripe.misses for stripe in self._stripes)
+
+    @property
+    def evictions(self) -> int:
+        return sum(stripe.evictions for stripe in self._stripes)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits (0.0 before the first lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """Return the counters used for sizing the cache."""
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
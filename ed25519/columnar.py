@@ -0,0 +1,64 @@
+# Columnar (struct-of-arrays) batches for bulk verification
+from typing import Iterator, Sequence
+
+SIGNATURE_SIZE = 64
+PUBLIC_KEY_SIZE = 32
+
+
+class ColumnarBatch:
+    """
+    A verification batch stored as columns instead of a list of tuples.
+
+    Args:
+        signatures: One contiguous buffer of N * 64 signature bytes.
+        public_keys: One contiguous buffer of N * 32 public key bytes.
+        message_offsets: N + 1 offsets into message_data (e.g. an array('Q')), where
+                         message i is message_data[offsets[i]:offsets[i + 1]].
+        message_data: The concatenated messages.
+
+    Items are (public_key, message, signature) tuples of memoryview slices of the
+    caller's buffers, produced one at a time while the batch is iterated. So no list
+    of N tuples is built up front and no message is copied, but each item is still a
+    short-lived tuple of three views, and the batch verification copies each 32-byte
+    public key to bytes (it is a dict key). A ColumnarBatch can be passed anywhere a
+    list of (public_key, message, signature) tuples is accepted, e.g.
+    Ed25519.verify_batch.
+    """
+
+    def __init__(self, signatures, public_keys, message_offsets: Sequence[int], message_data) -> None:
+        self.signatures = memoryview(signatures).cast("B")
+        self.public_keys = memoryview(public_keys).cast("B")
+        self.message_data = memoryview(message_data).cast("B")
+        self.message_offsets = message_offsets
+
+        count = len(self.public_keys) // PUBLIC_KEY_SIZE
+        if len(self.public_keys) != count * PUBLIC_KEY_SIZE:
+            raise ValueError("Public key buffer is not a multiple of 32 bytes.")
+        if len(self.signatures) != count * SIGNATURE_SIZE:
+            raise ValueError("Signature buffer does not hold one 64-byte signature per public key.")
+        if len(message_offsets) != count + 1:
+            raise ValueError("Message offsets must have one more entry than there are signatures.")
+        if count and (message_offsets[0] < 0 or message_offsets[count] > len(self.message_data)):
+            raise ValueError("Message offsets are outside the message data.")
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> tuple[memoryview, memoryview, memoryview]:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("Batch index out of range.")
+        start, end = self.message_offsets[i], self.message_offsets[i + 1]
+        if end < start:
+            raise ValueError("Message offsets must be non-decreasing.")
+        return (
+            self.public_keys[i * PUBLIC_KEY_SIZE:(i + 1) * PUBLIC_KEY_SIZE],
+            self.message_data[start:end],
+            self.signatures[i * SIGNATURE_SIZE:(i + 1) * SIGNATURE_SIZE],
+        )
+
+    def __iter__(self) -> Iterator[tuple[memoryview, memoryview, memoryview]]:
+        for i in range(self._count):
+            yield self[i]
@@ -1,25 +1,39 @@
 import os
-from x25519.utils import mult_inverse
+from typing import Iterable, Iterator, Literal, Optional, Sequence, Union
+from ed25519.cache import VerificationCache
+from ed25519.keys import KeyTableCache
+from ed25519.segment import KeyTableSegment
+from ed25519.keyring import KeyRing
+from ed25519.point import EdwardsPoint
+from ed25519.columnar import ColumnarBatch
+from ed25519.backends import registry
+from x25519.utils import output_view, HAVE_NUMPY
+from x25519.metrics import Metrics, NULL_TRACE
+from x25519 import tuning
 from ed25519.utils import ( 
-    sha512,
+    sha512_concat,
+    challenge,
+    aggregation_coefficients,
     secret_expand,
     compute_public_key,
     edwards_point_add_extended, 
     edwards_scalar_mult, 
-    encode_edwards_point, 
+    edwards_base_mult,
     decode_edwards_point, 
+    encode_edwards_points,
     affine_to_extended, 
-    normalize_extended, 
     edwards_point_negate, 
+    edwards_multi_scalar_mult,
+    edwards_mul_by_cofactor,
+    edwards_points_equal,
+    reduce_scalar_basis,
     is_identity,
+    d,
     )
 
 # The prime modulus (same as for Curve25519)
 P = 2**255 - 19
 
-# Compute d = -121665/121666 mod P
-d = (-121665 * mult_inverse(121666, P)) % P
-
 # Order of the base-point subgroup (a prime number)
 L = 2**252 + 27742317777372353535851937790883648493
 
@@ -29,17 +43,77 @@ B = (
     46316835694926478169428394003475163141307993866256225615783033603165251855960,
 )
 
+# Key pairs generated per bulk randomness read and shared inversion in generate_keypairs
+KEYPAIR_CHUNK_SIZE = 1024
+
+# Batches from this size on use the NumPy bucket method in verify_batch (when available)
+VECTORIZED_BATCH_MIN = tuning.setting("ed25519.vectorized_batch_min")
+
+# Smaller batches are verified one signature at a time, which is faster than the batch equation
+BATCH_VERIFY_MIN = tuning.setting("ed25519.batch_verify_min")
+
+# B as an EdwardsPoint, so that B * scalar uses the precomputed comb
+BASE_POINT = EdwardsPoint.base()
+
 
 class Ed25519:
     """
     An implementation of Ed25519 for key generation, signing, and verification
+
+    An optional VerificationCache can be supplied so that triples which already
+    verified successfully are not verified again (e.g. duplicate gossip deliveries).
+
+    Single signatures can be verified with either:
+        - 'standard': [8][S]B = [8]R + [8][k]A with full-size scalars.
+        - 'lattice': the same cofactored equation rewritten with half-size scalars
+          on A and R via lattice basis reduction (Pornin's method).
+
+    The backend selects who does the arithmetic for key generation, sign and verify:
+    'python' (this implementation), 'libsodium' (forced, errors if unavailable) or
+    'auto' (libsodium when importable and its self-test passes, otherwise Python).
+    None reads the P79_BACKEND environment variable, which defaults to 'python'.
+
+    Multiplications by B use the precomputed comb (ed25519.utils.base_point_table).
+    Decoded public keys and their window tables can come from key_tables: a
+    KeyTableCache (per-process LRU of hot signers), a KeyTableSegment (read-only
+    mapping shared by all verifier processes on a host) or a KeyRing (compact
+    store of decoded keys for very large key sets).
+
+    With metrics (x25519.metrics.Metrics), sign, verify and verify_batch record the
+    duration of their phases (hash, decode, scalar_mult, encode, compare) as the
+    operations "ed25519.sign" (sign_into included), "ed25519.verify" and
+    "ed25519.verify_batch"; sign_many_into records one "ed25519.sign_many_into" per
+    call, with the phases of all its signatures summed.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[VerificationCache] = None,
+        verify_method: Literal['standard', 'lattice'] = 'standard',
+        backend: Optional[str] = None,
+        key_tables: Optional[Union[KeyTableCache, KeyTableSegment, KeyRing]] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        if verify_method not in ['standard', 'lattice']:
+            raise ValueError("Verify method must be 'standard' or 'lattice'.")
         self.P = P
         self.d = d
         self.L = L
         self.B = affine_to_extended(B) 
+        self.cache = cache
+        self.verify_method = verify_method
+        self._backend = registry.resolve(backend)
+        self.key_tables = key_tables
+        self.metrics = metrics
+
+    @property
+    def backend(self) -> str:
+        """Name of the backend in use."""
+        return self._backend.name if self._backend is not None else 'python'
+
+    def _trace(self, operation: str):
+        """A Trace for this call if metrics are on and it is sampled, else NULL_TRACE."""
+        return self.metrics.trace(operation) if self.metrics is not None else NULL_TRACE
 
     def generate_private_key(self) -> bytes:
         """Generate a random 32-byte private key."""
@@ -49,8 +123,38 @@ class Ed25519:
         """
         Generate the public key from a 32-byte private key.
         """
+        if self._backend is not None:
+            return self._backend.generate_public_key(private_key)
         return compute_public_key(private_key)
 
+    def generate_keypairs(self, n: int, chunk_size: int = KEYPAIR_CHUNK_SIZE) -> Iterator[tuple[bytes, bytes]]:
+        """
+        Generate n key pairs, yielding (private_key, public_key) as they are produced.
+
+        Keys are made chunk_size at a time: the seeds of a chunk come from a single
+        os.urandom call, each A = a * B uses the precomputed comb, and all public
+        points of the chunk are normalized with one shared inversion.
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative.")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        return self._generate_keypairs(n, chunk_size)
+
+    def _generate_keypairs(self, n: int, chunk_size: int) -> Iterator[tuple[bytes, bytes]]:
+        while n > 0:
+            count = min(n, chunk_size)
+            n -= count
+            randomness = os.urandom(32 * count)
+            seeds = [randomness[i:i + 32] for i in range(0, 32 * count, 32)]
+            if self._backend is not None:
+                public_keys = [self._backend.generate_public_key(seed) for seed in seeds]
+            else:
+                public_keys = encode_edwards_points(
+                    [edwards_base_mult(secret_expand(seed)[0]) for seed in seeds]
+                )
+            yield from zip(seeds, public_keys)
+
     def sign(self, private_key: bytes, message: bytes) -> bytes:
         """
         Sign a message using Ed25519:
@@ -65,36 +169,127 @@ class Ed25519:
             8. Return the 64-byte signature: encode(R) || S.
             
         """
-        # Step 1 - 3 are handled by secret_expand and compute_public_key
+        trace = self._trace("ed25519.sign")
+        if self._backend is not None:
+            signature = self._backend.sign(private_key, message)
+            trace.mark("backend")
+        else:
+            R_enc, S = self._sign(self._expand_signing_key(private_key, trace), message, trace)
+            signature = R_enc + S.to_bytes(32, "little")
+        trace.finish()
+        return signature
+
+    def sign_into(self, private_key: bytes, message: bytes, out: Union[bytearray, memoryview], offset: int = 0) -> int:
+        """
+        Sign a message and write the 64-byte signature to out[offset:offset + 64]
+        instead of returning a new bytes object. Returns the offset just past it.
+        Raises ValueError if out is read-only or too short.
+        """
+        return self._sign_many_into([(private_key, message)], out, offset, self._trace("ed25519.sign"))
+
+    def sign_many_into(
+        self,
+        entries: Iterable[tuple[bytes, bytes]],
+        out: Union[bytearray, memoryview],
+        offset: int = 0,
+    ) -> int:
+        """
+        Sign each (private_key, message) pair and write the signatures back to back
+        into out, starting at offset. Each distinct key is expanded once per call.
+        Returns the offset just past the last signature.
+        """
+        return self._sign_many_into(entries, out, offset, self._trace("ed25519.sign_many_into"))
+
+    def _sign_many_into(
+        self,
+        entries: Iterable[tuple[bytes, bytes]],
+        out: Union[bytearray, memoryview],
+        offset: int,
+        trace,
+    ) -> int:
+        """Signing into a buffer, with the phases of all signatures summed in one trace."""
+        expanded = {}
+        for private_key, message in entries:
+            view = output_view(out, offset, 64)
+            if self._backend is not None:
+                view[:] = self._backend.sign(private_key, message)
+                trace.mark("backend")
+            else:
+                private_key = bytes(private_key)
+                if private_key not in expanded:
+                    expanded[private_key] = self._expand_signing_key(private_key, trace)
+                R_enc, S = self._sign(expanded[private_key], message, trace)
+                view[:32] = R_enc
+                view[32:] = S.to_bytes(32, "little")
+                trace.mark("encode")
+            offset += 64
+        trace.finish()
+        return offset
+
+    def _expand_signing_key(self, private_key: bytes, trace=NULL_TRACE) -> tuple[int, bytes, bytes]:
+        """Steps 1 - 3 of sign: return (a, prefix, encode(A))."""
         a, prefix = secret_expand(private_key)
-        A_enc = compute_public_key(private_key)
-        
+        trace.mark("hash")
+        A = BASE_POINT * a
+        trace.mark("scalar_mult")
+        A_enc = A.encode()
+        trace.mark("encode")
+        return a, prefix, A_enc
+
+    def _sign(self, expanded_key: tuple[int, bytes, bytes], message: bytes, trace=NULL_TRACE) -> tuple[bytes, int]:
+        """Steps 4 - 7 of sign: return (encode(R), S)."""
+        a, prefix, A_enc = expanded_key
+
         # Step 4
-        r = int.from_bytes(sha512(prefix + message), "little") % self.L
+        r = int.from_bytes(sha512_concat(prefix, message), "little") % self.L
+        trace.mark("hash")
         
         # Step 5
-        R_point = edwards_scalar_mult(r, self.B)
-    
-        R_enc = encode_edwards_point(R_point)
+        R = BASE_POINT * r
+        trace.mark("scalar_mult")
+        R_enc = R.encode()
+        trace.mark("encode")
         
         # Step 6
-        k = int.from_bytes(sha512(R_enc + A_enc + message), "little") % self.L
+        k = int.from_bytes(sha512_concat(R_enc, A_enc, message), "little") % self.L
+        trace.mark("hash")
         
         # Step 7
-        S = (r + k * a) % self.L
-        S_enc = S.to_bytes(32, "little")
-        
-        return R_enc + S_enc
+        return R_enc, (r + k * a) % self.L
 
     def verify(self, public_key: bytes, message: bytes, signature: bytes) -> bool:
+        """
+        Verify an Ed25519 signature, consulting the verification cache if one is set.
+        Only successful verifications are added to the cache.
+        """
+        trace = self._trace("ed25519.verify")
+        if self.cache is None:
+            valid = self._verify(public_key, message, signature, trace)
+        else:
+            cache_key = self.cache.key(public_key, message, signature)
+            hit = self.cache.contains(cache_key)
+            trace.mark("cache")
+            valid = hit or self._verify(public_key, message, signature, trace)
+            if valid and not hit:
+                self.cache.add(cache_key)
+        trace.finish()
+        return valid
+
+    def _verify(
+        self, public_key: bytes, message: bytes, signature: bytes, trace=NULL_TRACE, k: Optional[int] = None
+    ) -> bool:
         """
         Verify an Ed25519 signature:
         
         1. Split the 64-byte signature into R (first 32 bytes) and S (last 32 bytes).
         2. Decode R and the public key A.
-        3. Compute k = SHA-512(encode(R) || public_key || message) mod L.
+        3. Compute k = SHA-512(encode(R) || public_key || message) mod L (unless given).
         4. ~Verify that S * B == R + k * A, 4.~ Verify that [8][S]B = [8]R + [8][k]A.
         """
+        if self._backend is not None:
+            valid = self._backend.verify(public_key, message, signature)
+            trace.mark("backend")
+            return valid
         if len(signature) != 64:
             return False
         # Step 1
@@ -109,25 +304,36 @@ class Ed25519:
         try:
             # Step 2
             R_point = decode_edwards_point(R_enc)
-            A_point = decode_edwards_point(public_key)
+            A_point, A_table = self._decode_public_key(public_key)
         except Exception:
             return False
+        trace.mark("decode")
 
         # Step 3
-        k = int.from_bytes(sha512(R_enc + public_key + message), "little") % self.L
+        if k is None:
+            k = challenge(public_key, message, signature)
+        trace.mark("hash")
+
+        if self.verify_method == 'lattice':
+            valid = self._check_lattice(s_int, k, R_point, A_point, A_table)
+            trace.mark("scalar_mult")
+            return valid
         
         # Compute sB and kA.
-        sB = edwards_scalar_mult(s_int, self.B)
-        kA = edwards_scalar_mult(k, A_point)
+        sB = edwards_base_mult(s_int)
+        kA = edwards_multi_scalar_mult([k], [A_point], tables=[A_table])
         
         # Compute P = sB - kA.
         point = edwards_point_add_extended(sB, edwards_point_negate(kA))
+        trace.mark("scalar_mult")
         
-        # Multiply both sides by 8.
-        eight_R = edwards_scalar_mult(8, R_point)
-        eight_P = edwards_scalar_mult(8, point)
+        # Multiply both sides by 8 and compare projectively (no inversions).
+        eight_R = edwards_mul_by_cofactor(R_point)
+        eight_P = edwards_mul_by_cofactor(point)
         
-        return normalize_extended(eight_R) == normalize_extended(eight_P)
+        valid = edwards_points_equal(eight_R, eight_P)
+        trace.mark("compare")
+        return valid
 
         # This is the code for other verification equation 
         # # Step 4
@@ -143,7 +349,208 @@ class Ed25519:
         # return normalize_extended(SB_point) == normalize_extended(R_calc)
 
 
-    def verify_batch(self, batch: list[tuple[bytes, bytes, bytes]]) -> bool:
+    def _check_lattice(
+        self,
+        s_int: int,
+        k: int,
+        R_point: tuple[int, int, int, int],
+        A_point: tuple[int, int, int, int],
+        A_table: Optional[list] = None,
+    ) -> bool:
+        """
+        Check [8]([S]B - R - [k]A) == identity using half-size scalars.
+
+        Lattice reduction gives c0, c1 of ~127 bits with c0 = c1 * k (mod L).
+        Multiplying the equation by c1 (invertible mod L) gives the equivalent check
+            [8]([c1 * S mod L]B - [c1]R - [c0]A) == identity,
+        which holds for points with torsion components too, because [8]A lies in
+        the prime-order subgroup. The B term uses the precomputed comb, and the two
+        ~128-bit terms share their doublings in a Straus multi-scalar multiplication.
+        """
+        c0, c1 = reduce_scalar_basis(k, self.L)
+        b = (c1 * s_int) % self.L
+        half = edwards_multi_scalar_mult([-c1, -c0], [R_point, A_point], tables=[None, A_table])
+        point = edwards_point_add_extended(edwards_base_mult(b), half)
+        return is_identity(edwards_mul_by_cofactor(point))
+
+    def _decode_public_key(self, public_key: bytes) -> tuple[tuple[int, int, int, int], Optional[list]]:
+        """
+        Decode a public key, returning (A, window table of A or None).
+        Keys go through key_tables when set. Raises on invalid encodings.
+        """
+        if self.key_tables is not None:
+            key = self.key_tables.get(public_key)
+            return key.point, key.table
+        return decode_edwards_point(public_key), None
+
+    def verify_batch(
+        self,
+        batch: Sequence[tuple[bytes, bytes, bytes]],
+        vectorized: Optional[bool] = None,
+        challenges: Optional[Sequence[int]] = None,
+    ) -> bool:
+        """
+        Batch verification, consulting the verification cache if one is set.
+        Entries already in the cache are skipped; if the remaining entries verify,
+        they are all added to the cache.
+
+        challenges can give the challenge k of every entry (ed25519.utils.challenge),
+        computed ahead of time, e.g. on other threads by ed25519.pipeline; the batch
+        then hashes nothing but the cache keys.
+
+        vectorized selects how the combined multi-scalar multiplication is done:
+        None uses the NumPy bucket method (ed25519.vectorized) for batches of at
+        least VECTORIZED_BATCH_MIN signatures when NumPy is installed, True forces
+        it (RuntimeError without NumPy) and False keeps the scalar path. Both give
+        the same verdicts.
+        """
+        if challenges is not None and len(challenges) != len(batch):
+            raise ValueError("challenges must have one entry per signature.")
+        trace = self._trace("ed25519.verify_batch")
+        if self.cache is None:
+            valid = self._verify_batch(batch, vectorized, trace, challenges)
+            trace.finish()
+            return valid
+
+        pending = []
+        pending_keys = []
+        pending_challenges = []
+        for i, (public_key, message, signature) in enumerate(batch):
+            cache_key = self.cache.key(public_key, message, signature)
+            if not self.cache.contains(cache_key):
+                pending.append((public_key, message, signature))
+                pending_keys.append(cache_key)
+                if challenges is not None:
+                    pending_challenges.append(challenges[i])
+        trace.mark("cache")
+
+        valid = not pending or self._verify_batch(
+            pending, vectorized, trace, pending_challenges if challenges is not None else None
+        )
+        if valid:
+            for cache_key in pending_keys:
+                self.cache.add(cache_key)
+        trace.finish()
+        return valid
+
+    def verify_batch_columnar(
+        self,
+        signatures: bytes,
+        public_keys: bytes,
+        message_offsets: Sequence[int],
+        message_data: bytes,
+        vectorized: Optional[bool] = None,
+    ) -> bool:
+        """
+        Batch verification of columnar input: N * 64 signature bytes, N * 32 public
+        key bytes, and the messages as N + 1 offsets into one data buffer (see
+        ColumnarBatch). Entries are read one at a time as memoryview slices of the
+        buffers, so no list of N tuples is built and messages are not copied (each
+        entry still makes a few small objects while it is verified). Raises
+        ValueError if the buffers do not line up.
+        """
+        batch = ColumnarBatch(signatures, public_keys, message_offsets, message_data)
+        if not len(batch):
+            return True
+        return self.verify_batch(batch, vectorized)
+
+    def aggregate(self, batch: Sequence[tuple[bytes, bytes, bytes]]) -> bytes:
+        """
+        Half-aggregate the signatures of a batch of (public_key, message, signature)
+        entries into 32 * n + 32 bytes: R_1 || ... || R_n || S, where
+        S = z_1 * S_1 + ... + z_n * S_n mod L with the coefficients z_i derived from
+        the whole batch (ed25519.utils.aggregation_coefficients). The aggregate is
+        checked by verify_aggregate with the same public keys and messages, in the
+        same order. Nothing is verified here: one bad signature makes the whole
+        aggregate fail, so check untrusted signatures with verify_batch first.
+        Raises ValueError for a signature that is not 64 bytes with a canonical S.
+        """
+        entries = []
+        s_values = []
+        for public_key, message, signature in batch:
+            if len(signature) != 64:
+                raise ValueError("Signatures must be 64 bytes.")
+            s_int = int.from_bytes(signature[32:], "little")
+            if s_int >= self.L:
+                raise ValueError("Signature has a non-canonical S.")
+            public_key = bytes(public_key)
+            entries.append((bytes(signature[:32]), public_key, challenge(public_key, message, signature)))
+            s_values.append(s_int)
+
+        coefficients = aggregation_coefficients(entries)
+        s_agg = sum(z * s_int for z, s_int in zip(coefficients, s_values)) % self.L
+        return b"".join(R_enc for R_enc, _, _ in entries) + s_agg.to_bytes(32, "little")
+
+    def verify_aggregate(
+        self,
+        entries: Sequence[tuple[bytes, bytes]],
+        aggregate: bytes,
+        vectorized: Optional[bool] = None,
+    ) -> bool:
+        """
+        Verify a half-aggregate (see aggregate) of signatures on the (public_key,
+        message) entries with the batch equation, using the coefficients z_i in place
+        of random ones:
+
+            [8][S]B = [8](z_1 * R_1 + ... + z_n * R_n) + [8](z_1 * k_1 * A_1 + ... + z_n * k_n * A_n)
+
+        This is one multi-scalar multiplication, as for verify_batch (which also
+        describes `vectorized`), and it holds exactly when every signature would pass
+        verify, barring a negligible chance. The verification cache is not used.
+        """
+        trace = self._trace("ed25519.verify_aggregate")
+        valid = self._verify_aggregate(entries, aggregate, vectorized, trace)
+        trace.finish()
+        return valid
+
+    def _verify_aggregate(
+        self,
+        entries: Sequence[tuple[bytes, bytes]],
+        aggregate: bytes,
+        vectorized: Optional[bool] = None,
+        trace=NULL_TRACE,
+    ) -> bool:
+        """Half-aggregate verification."""
+        n = len(entries)
+        if len(aggregate) != 32 * n + 32:
+            return False
+        s_agg = int.from_bytes(aggregate[32 * n:], "little")
+        if s_agg >= self.L:
+            return False  # Non-canonical S
+
+        # Decode each R, and each distinct A once.
+        r_points = []
+        a_points = {}
+        transcript = []
+        try:
+            for i, (public_key, message) in enumerate(entries):
+                R_enc = bytes(aggregate[32 * i:32 * i + 32])
+                public_key = bytes(public_key)
+                r_points.append(decode_edwards_point(R_enc))
+                if public_key not in a_points:
+                    a_points[public_key] = self._decode_public_key(public_key)
+                transcript.append((R_enc, public_key, challenge(public_key, message, R_enc)))
+        except Exception:
+            return False
+        trace.mark("decode")
+
+        # Accumulate the weights: z_i on R_i, and z_i * k_i summed per distinct A
+        coefficients = aggregation_coefficients(transcript)
+        r_terms = list(zip(coefficients, r_points))
+        a_coeffs = dict.fromkeys(a_points, 0)
+        for z, (_, public_key, k) in zip(coefficients, transcript):
+            a_coeffs[public_key] = (a_coeffs[public_key] + z * k) % self.L
+        trace.mark("hash")
+
+        return self._batch_equation(s_agg, r_terms, a_points, a_coeffs, vectorized, trace)
+
+    def _verify_batch(
+        self,
+        batch: Sequence[tuple[bytes, bytes, bytes]],
+        vectorized: Optional[bool] = None,
+        trace=NULL_TRACE,
+        challenges: Optional[Sequence[int]] = None,
+    ) -> bool:
         """
         Batch verification.
         Each tuple in 'batch' is (public_key, message, signature).
@@ -151,20 +558,35 @@ class Ed25519:
         - s_sum: the weighted sum of the s scalars.
         - r_sum: the weighted sum of the R points.
         - a_sum: the weighted sum of the public key points scaled by the challenge.
+        Signatures from the same signer share one public key point, so the challenge
+        weights z*k are summed per distinct encoded key and each A is decoded and
+        multiplied only once.
         At the end, we verify that:
         8*(r_sum + a_sum - s_sum*B) == identity
         """
-        # For a single signature, fall back to individual verification
-        if len(batch) == 1:
-            public_key, message, signature = batch[0]
-            return self.verify(public_key, message, signature)
+        # libsodium has no batch equation, but verifying each signature there is
+        # still much faster than the pure-Python batch.
+        if self._backend is not None:
+            valid = all(self._backend.verify(*entry) for entry in batch)
+            trace.mark("backend")
+            return valid
+
+        # For a few signatures, fall back to individual verification
+        if len(batch) < BATCH_VERIFY_MIN:
+            return all(
+                self._verify(public_key, message, signature, trace, challenges[i] if challenges is not None else None)
+                for i, (public_key, message, signature) in enumerate(batch)
+            )
         
         # Initialize the accumulated terms
         s_sum = 0
-        r_sum = (0, 1, 1, 0)
-        a_sum = (0, 1, 1, 0)
+        r_terms = []
+
+        # Per distinct public key: the decoded point and the summed weights z*k mod L
+        a_points = {}
+        a_coeffs = {}
         
-        for (public_key, message, signature) in batch:
+        for i, (public_key, message, signature) in enumerate(batch):
             # Check signature length.
             if len(signature) != 64:
                 return False
@@ -176,15 +598,19 @@ class Ed25519:
             if s_int >= self.L:
                 return False  # Non-canonical s
             
-            # Decode R and A.
+            # Decode R, and A only the first time this key is seen.
+            public_key = bytes(public_key)
             try:
                 R_point = decode_edwards_point(R_enc)
-                A_point = decode_edwards_point(public_key)
+                if public_key not in a_points:
+                    a_points[public_key] = self._decode_public_key(public_key)
+                    a_coeffs[public_key] = 0
             except Exception:
                 return False
+            trace.mark("decode")
             
-            # Compute challenge: k = H(R || public_key || message) mod L.
-            k = int.from_bytes(sha512(R_enc + public_key + message), "little") % self.L
+            # Compute challenge: k = H(R || public_key || message) mod L (unless precomputed).
+            k = challenges[i] if challenges is not None else challenge(public_key, message, signature)
             
             # Choose a random scalar z for this signature (nonzero modulo L).
             z = int.from_bytes(os.urandom(32), "little") % self.L
@@ -192,17 +618,61 @@ class Ed25519:
                 z = 1
             # Accumulate the weighted terms
             s_sum = (s_sum + z * s_int) % self.L
-            r_sum = edwards_point_add_extended(r_sum, edwards_scalar_mult(z, R_point))
-            a_sum = edwards_point_add_extended(a_sum, edwards_scalar_mult(z * k, A_point))
+            r_terms.append((z, R_point))
+            a_coeffs[public_key] = (a_coeffs[public_key] + z * k) % self.L
+            trace.mark("hash")
+
+        return self._batch_equation(s_sum, r_terms, a_points, a_coeffs, vectorized, trace)
+
+    def _batch_equation(
+        self,
+        s_sum: int,
+        r_terms: list[tuple[int, tuple[int, int, int, int]]],
+        a_points: dict,
+        a_coeffs: dict[bytes, int],
+        vectorized: Optional[bool] = None,
+        trace=NULL_TRACE,
+    ) -> bool:
+        """
+        Check 8*(sum z*R + sum c*A - s_sum*B) == identity, from the weighted R terms
+        (z, R), the decoded public keys (point, table) and their summed weights c,
+        with one multi-scalar multiplication (see verify_batch for `vectorized`).
+        """
+        if vectorized is None:
+            vectorized = HAVE_NUMPY and len(r_terms) >= VECTORIZED_BATCH_MIN
+        if vectorized:
+            # Imported here so that importing this module does not import NumPy
+            from ed25519.vectorized import edwards_multi_scalar_mult_lanes
+
+            # All weighted R and A terms in one bucket-method multi-scalar multiplication
+            r_plus_a = edwards_multi_scalar_mult_lanes(
+                [z for z, _ in r_terms] + list(a_coeffs.values()),
+                [R_point for _, R_point in r_terms] + [a_points[public_key][0] for public_key in a_coeffs],
+            )
+        else:
+            r_sum = (0, 1, 1, 0)
+            for z, R_point in r_terms:
+                r_sum = edwards_point_add_extended(r_sum, edwards_scalar_mult(z, R_point))
+
+            # One scalar multiplication per distinct signer.
+            a_sum = (0, 1, 1, 0)
+            for public_key, coeff in a_coeffs.items():
+                A_point, A_table = a_points[public_key]
+                a_sum = edwards_point_add_extended(
+                    a_sum, edwards_multi_scalar_mult([coeff], [A_point], tables=[A_table])
+                )
+            r_plus_a = edwards_point_add_extended(r_sum, a_sum)
             
         # Compute -s_sum mod L and multiply the base point.
         neg_s_sum = (self.L - s_sum) % self.L
-        neg_s_sum_base = edwards_scalar_mult(neg_s_sum, self.B)
+        neg_s_sum_base = edwards_base_mult(neg_s_sum)
 
         # Combine the accumulators.
-        combined = edwards_point_add_extended(r_sum, a_sum)
-        combined = edwards_point_add_extended(combined, neg_s_sum_base)
+        combined = edwards_point_add_extended(r_plus_a, neg_s_sum_base)
+        trace.mark("scalar_mult")
 
         # Multiply by 8 and check against the identity.
-        combined_8 = edwards_scalar_mult(8, combined)
-        return is_identity(combined_8)
+        combined_8 = edwards_mul_by_cofactor(combined)
+        valid = is_identity(combined_8)
+        trace.mark("compare")
+        return valid
@@ -0,0 +1,69 @@
+# Ed25519 signing keys and X25519 agreement keys derived from one seed (RFC 7748, Section 4.1)
+from typing import Iterable
+from ed25519.utils import (
+    prime_mod,
+    secret_expand,
+    edwards_base_mult,
+    decode_edwards_point,
+)
+from x25519.utils import batch_mult_inverse
+
+
+def x25519_private_key(private_key: bytes) -> bytes:
+    """
+    The X25519 private key belonging to an Ed25519 seed: the clamped first half of
+    SHA-512(seed), i.e. the scalar a that signs (as libsodium derives it). The
+    matching X25519 public key is the u-coordinate of A = a * B.
+    """
+    a, _ = secret_expand(private_key)
+    return a.to_bytes(32, "little")
+
+
+def _encode_montgomery(points: list[tuple[int, int, int, int]]) -> list[bytes]:
+    """
+    The X25519 encodings u = (1 + y) / (1 - y) = (Z + Y) / (Z - Y) of extended points,
+    with all denominators inverted together. Raises ValueError for y = 1.
+    """
+    denominators = [(Z - Y) % prime_mod for _, Y, Z, _ in points]
+    if 0 in denominators:
+        raise ValueError("Point has no X25519 equivalent (y = 1).")
+    inverses = batch_mult_inverse(denominators, prime_mod)
+    return [
+        (((Z + Y) * inv) % prime_mod).to_bytes(32, "little")
+        for (_, Y, Z, _), inv in zip(points, inverses)
+    ]
+
+
+def identity_keys(private_key: bytes) -> tuple[bytes, bytes, bytes]:
+    """
+    Derive both key pairs of a node from one 32-byte Ed25519 seed.
+
+    A single fixed-base multiplication A = a * B gives both public keys: the Ed25519
+    key is the encoding of A, and the X25519 key is its u-coordinate. The inversions
+    of Z (for y) and of Z - Y (for u) share one exponentiation.
+
+    Returns:
+        (Ed25519 public key, X25519 private key, X25519 public key)
+    """
+    a, _ = secret_expand(private_key)
+    X, Y, Z, _ = edwards_base_mult(a)
+    inv_z, inv_u = batch_mult_inverse([Z, (Z - Y) % prime_mod], prime_mod)
+    x = (X * inv_z) % prime_mod
+    y = (Y * inv_z) % prime_mod
+    ed_public_key = (y | ((x & 1) << 255)).to_bytes(32, "little")
+    x_public_key = (((Z + Y) * inv_u) % prime_mod).to_bytes(32, "little")
+    return ed_public_key, a.to_bytes(32, "little"), x_public_key
+
+
+def public_key_to_x25519(public_key: bytes) -> bytes:
+    """Convert an Ed25519 public key to the X25519 public key of the same point."""
+    return public_keys_to_x25519([public_key])[0]
+
+
+def public_keys_to_x25519(public_keys: Iterable[bytes]) -> list[bytes]:
+    """
+    Convert many Ed25519 public keys to X25519 public keys with one shared inversion.
+    Each key is decoded first, so invalid encodings raise ValueError as in
+    decode_edwards_point, as do keys with y = 1.
+    """
+    return _encode_montgomery([decode_edwards_point(public_key) for public_key in public_keys])
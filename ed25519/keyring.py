@@ -0,0 +1,164 @@
+# Compact storage for large sets of Ed25519 public keys
+import threading
+from array import array
+from typing import Iterable, Optional
+from ed25519.keys import KeyTableCache, VerifyingKey
+from ed25519.utils import decode_edwards_point, prime_mod
+
+KEY_SIZE = 32
+COORD_SIZE = 32
+
+# Index entries are C ints (slot + 1), so a ring holds up to 2^31 - 2 keys
+INDEX_TYPECODE = "i"
+MAX_KEYS = 2**31 - 2
+
+# Window tables of the most recently used keys kept by get()
+TABLE_CACHE_SIZE = 256
+
+
+class KeyRing:
+    """
+    A container for millions of public keys, backed by contiguous buffers.
+
+    Encoded keys are stored back to back in one bytearray (32 bytes per slot) and,
+    if `decoded` is set, the affine x-coordinate of each key in a second one (32 bytes
+    per slot; y is the encoding without its sign bit), so no per-key Python objects
+    are kept. Lookups go through an open-addressing hash index stored in an array of
+    slot numbers, which gives O(1) lookups at 4 bytes per index entry (the index is
+    kept at most half full). Points are only materialized as tuples when they are
+    asked for. That is about 40 bytes per key, or 72 decoded, against about 380 for
+    a dict of encoded keys to point tuples.
+
+    A KeyRing can be passed to Ed25519(key_tables=...); keys outside the ring are
+    decoded on the fly and are not added to it. Verification needs each key's window
+    table, which costs 14 point additions to build, so get() keeps the tables of the
+    last `table_cache` keys it returned in a KeyTableCache (not counted by memory_usage).
+
+    Lookups take no lock and may run in any number of threads while keys are added:
+    writers are serialized, a key's bytes and coordinates are stored before its
+    index entry, and a grown index is filled before it replaces the old one.
+    """
+
+    def __init__(
+        self, public_keys: Iterable[bytes] = (), decoded: bool = False, table_cache: int = TABLE_CACHE_SIZE
+    ) -> None:
+        self.decoded = decoded
+        self._keys = bytearray()
+        self._coords = bytearray()
+        self._count = 0
+        # index[i] holds slot + 1, or 0 for an empty bucket; kept at most half full
+        self._index = array(INDEX_TYPECODE, bytes(array(INDEX_TYPECODE).itemsize * 16))
+        self._lock = threading.Lock()
+        self._tables = KeyTableCache(max_size=table_cache) if table_cache else None
+        self.extend(public_keys)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, public_key: bytes) -> bool:
+        return self.find(public_key) is not None
+
+    def _bucket(self, public_key: bytes, index: Optional[array] = None) -> int:
+        """Return the index bucket holding public_key, or the empty bucket where it belongs."""
+        index = self._index if index is None else index
+        mask = len(index) - 1
+        i = hash(public_key) & mask
+        keys = self._keys
+        while True:
+            entry = index[i]
+            if entry == 0:
+                return i
+            offset = (entry - 1) * KEY_SIZE
+            if keys[offset:offset + KEY_SIZE] == public_key:
+                return i
+            i = (i + 1) & mask
+
+    def _grow(self) -> None:
+        old = self._index
+        index = array(INDEX_TYPECODE, bytes(old.itemsize * len(old) * 2))
+        for entry in old:
+            if entry:
+                offset = (entry - 1) * KEY_SIZE
+                index[self._bucket(bytes(self._keys[offset:offset + KEY_SIZE]), index)] = entry
+        self._index = index
+
+    def add(self, public_key: bytes) -> int:
+        """
+        Add an encoded key (if not already present) and return its slot.
+        With decoded=True the key is decoded now, raising ValueError if it is invalid.
+        """
+        public_key = bytes(public_key)
+        if len(public_key) != KEY_SIZE:
+            raise ValueError("Invalid public key length")
+        with self._lock:
+            bucket = self._bucket(public_key)
+            if self._index[bucket]:
+                return self._index[bucket] - 1
+            if self._count >= MAX_KEYS:
+                raise ValueError("KeyRing is full.")
+            if self.decoded:
+                # Z = 1 from decoding, so X is the affine x
+                X, _, _, _ = decode_edwards_point(public_key)
+                self._coords += X.to_bytes(COORD_SIZE, "little")
+            slot = self._count
+            self._keys += public_key
+            self._count += 1
+            self._index[bucket] = slot + 1
+            if 2 * self._count > len(self._index):
+                self._grow()
+            return slot
+
+    def extend(self, public_keys: Iterable[bytes]) -> None:
+        """Add many keys."""
+        for public_key in public_keys:
+            self.add(public_key)
+
+    def find(self, public_key: bytes) -> Optional[int]:
+        """Return the slot of an encoded key, or None if it is not in the ring."""
+        public_key = bytes(public_key)
+        entry = self._index[self._bucket(public_key)]
+        return entry - 1 if entry else None
+
+    def lookup_many(self, public_keys: Iterable[bytes]) -> list[Optional[int]]:
+        """Bulk find(): the slot of each key, or None for keys outside the ring."""
+        return [self.find(public_key) for public_key in public_keys]
+
+    def key_at(self, slot: int) -> bytes:
+        """The encoded key stored in a slot."""
+        if not 0 <= slot < self._count:
+            raise IndexError("KeyRing slot out of range.")
+        return bytes(self._keys[slot * KEY_SIZE:(slot + 1) * KEY_SIZE])
+
+    def point_at(self, slot: int) -> tuple[int, int, int, int]:
+        """Materialize the extended point of a slot (decoding the key if coordinates are not stored)."""
+        if not self.decoded:
+            return decode_edwards_point(self.key_at(slot))
+        if not 0 <= slot < self._count:
+            raise IndexError("KeyRing slot out of range.")
+        x = int.from_bytes(memoryview(self._coords)[slot * COORD_SIZE:(slot + 1) * COORD_SIZE], "little")
+        y = int.from_bytes(memoryview(self._keys)[slot * KEY_SIZE:(slot + 1) * KEY_SIZE], "little") & ((1 << 255) - 1)
+        return (x, y, 1, (x * y) % prime_mod)
+
+    def points(self, slots: Iterable[int]) -> list[tuple[int, int, int, int]]:
+        """Bulk point_at()."""
+        return [self.point_at(slot) for slot in slots]
+
+    def get(self, public_key: bytes) -> VerifyingKey:
+        """
+        Return a VerifyingKey for an encoded key, from the table cache if it was used
+        recently. Otherwise the point comes from the stored coordinates when the key
+        is in a decoded ring, or is decoded (raises ValueError if invalid), and the
+        window table is built on first use.
+        """
+        public_key = bytes(public_key)
+        if self._tables is not None and public_key in self._tables:
+            return self._tables.get(public_key)
+        slot = self.find(public_key) if self.decoded else None
+        point = self.point_at(slot) if slot is not None else None
+        if self._tables is None:
+            return VerifyingKey(public_key, point)
+        return self._tables.get(public_key, point)
+
+    def memory_usage(self) -> int:
+        """Bytes held by the key, coordinate and index buffers."""
+        return len(self._keys) + len(self._coords) + self._index.itemsize * len(self._index)
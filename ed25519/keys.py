@@ -0,0 +1,140 @@
+# Decoded public keys with precomputed window tables, for keys that verify often
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence
+from ed25519.utils import decode_edwards_point, edwards_window_table, d, prime_mod
+
+
+class VerifyingKey:
+    """
+    A decoded Ed25519 public key together with its window table [0..15] * A.
+
+    Decoding costs a square root and the table costs 14 point additions, so keeping
+    both around for keys that sign often saves that work on every verification.
+    The table is built on first access and is a tuple: two threads may both build
+    it, but either result is the same and neither is ever modified.
+    """
+
+    __slots__ = ("public_key", "point", "_table")
+
+    def __init__(
+        self,
+        public_key: bytes,
+        point: Optional[tuple[int, int, int, int]] = None,
+        table: Optional[Sequence[tuple[int, int, int, int]]] = None,
+    ) -> None:
+        self.public_key = bytes(public_key)
+        self.point = point if point is not None else decode_edwards_point(self.public_key)
+        self._table = tuple(table) if table is not None else None
+
+    @property
+    def table(self) -> tuple[tuple[int, int, int, int], ...]:
+        """The multiples [0..15] * A."""
+        if self._table is None:
+            self._table = tuple(edwards_window_table(self.point))
+        return self._table
+
+    def to_record(self) -> list[int]:
+        """Flatten to integers: the encoded key, then X, Y, Z, T of multiples 1..15."""
+        record = [int.from_bytes(self.public_key, "little")]
+        for entry in self.table[1:]:
+            record.extend(entry)
+        return record
+
+    @classmethod
+    def from_record(cls, record: list[int]) -> "VerifyingKey":
+        """
+        Rebuild a key from to_record() output without decoding or recomputing the table.
+        Nothing is checked: call check() on keys from records that are not trusted.
+        """
+        table = [(0, 1, 1, 0)]
+        for i in range(1, len(record), 4):
+            table.append(tuple(record[i:i + 4]))
+        return cls(record[0].to_bytes(32, "little"), table[1], table)
+
+    def check(self) -> None:
+        """
+        Raise ValueError unless the point is the decoding of the encoded key and the
+        table holds its multiples [0..15] * A.
+
+        A decoded point has Z = 1, so the first part needs a few multiplications
+        instead of a square root: x and y must satisfy the curve equation, y must be
+        the encoded y and the parity of x the sign bit (which fixes x). The multiples
+        must equal, coordinate for coordinate, the table edwards_window_table builds
+        from the point (14 point additions).
+        """
+        X, Y, Z, T = self.point
+        # Like decode_edwards_point, x = P stands for x = 0 with the sign bit set
+        encoded = int.from_bytes(self.public_key, "little")
+        if Z != 1 or Y != encoded & ((1 << 255) - 1) or not 0 <= X <= prime_mod or (X & 1) != encoded >> 255:
+            raise ValueError("Point does not match the encoded public key.")
+        x2, y2 = X * X % prime_mod, Y * Y % prime_mod
+        if (y2 - x2 - 1 - d * x2 * y2) % prime_mod or T != X * Y % prime_mod:
+            raise ValueError("Point does not match the encoded public key.")
+        if self.table != tuple(edwards_window_table(self.point)):
+            raise ValueError("Window table does not match the public key.")
+
+
+class KeyTableCache:
+    """
+    An LRU cache of VerifyingKey objects for hot public keys.
+
+    The cache lives in memory only. Loading tables from disk would have to check each
+    one against its decoded key before trusting it, which costs about as much as
+    building it, so a new process starts cold.
+
+    Like VerificationCache, the cache is safe to share between threads and can be
+    split into lock stripes, each an LRU of max_size / stripes keys.
+
+    Args:
+        max_size: Maximum number of keys kept before the least recently used is evicted.
+        stripes: Number of lock stripes (1 keeps a single exact LRU).
+    """
+
+    def __init__(self, max_size: int = 1024, stripes: int = 1) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive.")
+        if not 0 < stripes <= max_size:
+            raise ValueError("stripes must be between 1 and max_size.")
+        self.max_size = max_size
+        self._stripes: list[tuple[OrderedDict[bytes, VerifyingKey], threading.Lock]] = [
+            (OrderedDict(), threading.Lock()) for _ in range(stripes)
+        ]
+        self._stripe_size = max_size // stripes
+
+    def _stripe(self, public_key: bytes) -> tuple[OrderedDict, threading.Lock]:
+        return self._stripes[hash(public_key) % len(self._stripes)]
+
+    def get(self, public_key: bytes, point: Optional[tuple[int, int, int, int]] = None) -> VerifyingKey:
+        """
+        Return the VerifyingKey for an encoded public key, decoding it on a miss
+        (unless its decoded point is given). Raises ValueError if the encoding is
+        invalid (as decode_edwards_point does).
+        """
+        public_key = bytes(public_key)
+        keys, lock = self._stripe(public_key)
+        with lock:
+            key = keys.get(public_key)
+            if key is not None:
+                keys.move_to_end(public_key)
+                return key
+        # Decoded outside the lock: another thread may decode the same key meanwhile
+        key = VerifyingKey(public_key, point)
+        self.add(key)
+        return key
+
+    def add(self, key: VerifyingKey) -> None:
+        """Insert a VerifyingKey (replacing any entry for the same key) as the most recently used."""
+        keys, lock = self._stripe(key.public_key)
+        with lock:
+            keys[key.public_key] = key
+            keys.move_to_end(key.public_key)
+            while len(keys) > self._stripe_size:
+                keys.popitem(last=False)
+
+    def __contains__(self, public_key: bytes) -> bool:
+        public_key = bytes(public_key)
+        return public_key in self._stripe(public_key)[0]
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _ in self._stripes)
@@ -0,0 +1,100 @@
+# Pipelined batch verification: challenges are hashed on threads while the curve math runs
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Sequence
+from ed25519.ed25519 import Ed25519
+from ed25519.utils import challenge
+
+# Batches hashed ahead of the one in the curve stage
+DEFAULT_DEPTH = 2
+
+Batch = Sequence[tuple[bytes, bytes, bytes]]
+
+
+def batch_challenges(batch: Batch, start: int = 0, stop: Optional[int] = None) -> list[int]:
+    """The challenge k of entries start..stop of a batch."""
+    stop = len(batch) if stop is None else stop
+    return [challenge(*batch[i]) for i in range(start, stop)]
+
+
+class VerificationPipeline:
+    """
+    Verify a stream of batches in two overlapping stages:
+
+        hash:  the challenges k = SHA-512(R || A || M) mod L of the next batches,
+               on a pool of threads
+        curve: the batch equation of the current batch (Ed25519.verify_batch with
+               the precomputed challenges), in the calling thread
+
+    hashlib releases the GIL while it hashes more than a couple of kilobytes, so with
+    large messages (tens of kilobytes and up) the hashing of batch N + 1 runs while
+    the big-integer arithmetic of batch N holds the GIL, and most of its cost is
+    hidden. The stages are joined by a bounded queue: at most `depth` batches are
+    hashed ahead, and the input is only read as fast as the curve stage drains it,
+    so a large or endless input is never buffered.
+
+    Each batch's entries are split into one slice per hash thread. Cache keys, if
+    the instance has a VerificationCache, are still hashed in the curve stage.
+
+    Args:
+        ed25519: The instance that verifies (default: Ed25519()).
+        hash_threads: Threads of the hash stage (default: up to 4, one per core).
+        depth: Batches hashed ahead of the curve stage.
+        vectorized: Passed on to verify_batch.
+    """
+
+    def __init__(
+        self,
+        ed25519: Optional[Ed25519] = None,
+        hash_threads: Optional[int] = None,
+        depth: int = DEFAULT_DEPTH,
+        vectorized: Optional[bool] = None,
+    ) -> None:
+        hash_threads = hash_threads if hash_threads is not None else min(4, os.cpu_count() or 1)
+        if hash_threads <= 0:
+            raise ValueError("hash_threads must be positive.")
+        if depth <= 0:
+            raise ValueError("depth must be positive.")
+        self.ed25519 = ed25519 if ed25519 is not None else Ed25519()
+        self.hash_threads = hash_threads
+        self.depth = depth
+        self.vectorized = vectorized
+        self._executor = ThreadPoolExecutor(hash_threads, thread_name_prefix="p79-hash")
+
+    def _hash(self, batch: Batch) -> list[Future]:
+        """Submit the hashing of a batch, one slice of entries per thread."""
+        slices = min(self.hash_threads, len(batch)) or 1
+        bounds = [len(batch) * i // slices for i in range(slices + 1)]
+        return [self._executor.submit(batch_challenges, batch, bounds[i], bounds[i + 1]) for i in range(slices)]
+
+    def verify_batches(self, batches: Iterable[Batch]) -> Iterator[bool]:
+        """The verify_batch verdict of each batch, in order."""
+        batches = iter(batches)
+        pending = deque()
+        while True:
+            # The batch for the curve stage, plus up to `depth` being hashed
+            while len(pending) <= self.depth:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                pending.append((batch, self._hash(batch)))
+            if not pending:
+                return
+            batch, futures = pending.popleft()
+            challenges = [k for future in futures for k in future.result()]
+            yield self.ed25519.verify_batch(batch, self.vectorized, challenges)
+
+    def verify_batch(self, batch: Batch) -> bool:
+        """One batch: its challenges hashed in parallel, then the batch equation."""
+        return next(self.verify_batches([batch]))
+
+    def close(self) -> None:
+        """Stop the hash threads."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "VerificationPipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
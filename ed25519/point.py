@@ -0,0 +1,152 @@
+# An object wrapper around the tuple-based Edwards point formulas in ed25519.utils
+from typing import Optional
+from ed25519.utils import (
+    B_AFFINE,
+    prime_mod,
+    affine_to_extended,
+    decode_edwards_point,
+    edwards_base_mult,
+    edwards_multi_scalar_mult,
+    edwards_mul_by_cofactor,
+    edwards_point_add_extended,
+    edwards_point_add_niels,
+    edwards_point_double_extended,
+    edwards_point_negate,
+    edwards_points_equal,
+    extended_to_niels,
+    is_identity,
+    niels_negate,
+    normalize_extended,
+)
+
+EXTENDED = "extended"
+NIELS = "niels"
+
+
+class EdwardsPoint:
+    """
+    A point on the Ed25519 curve with its representation and memoized conversions.
+
+    The coordinates are either extended (X, Y, Z, T) or, for affine points prepared for
+    repeated addition, Niels (y + x, y - x, 2*d*x*y). The normalized (Z = 1) form and
+    the 32-byte encoding are computed at most once per object, so code that needs the
+    encoding of the same point several times pays for a single inversion.
+
+    Operators route to the engines in ed25519.utils:
+        P + Q, P - Q   complete extended addition, or mixed addition if Q is in Niels form
+        P * k, k * P   the precomputed comb for the base point, Straus windows otherwise
+        -P, P == Q     negation and projective comparison (no inversion)
+    Points are immutable; every operation returns a new EdwardsPoint.
+    """
+
+    __slots__ = ("representation", "coords", "_normalized", "_encoding", "_is_base")
+
+    def __init__(self, coords: tuple, representation: str = EXTENDED) -> None:
+        if representation not in (EXTENDED, NIELS):
+            raise ValueError("Representation must be 'extended' or 'niels'.")
+        self.representation = representation
+        self.coords = coords
+        self._normalized: Optional[tuple[int, int, int, int]] = None
+        self._encoding: Optional[bytes] = None
+        self._is_base = False
+
+    @classmethod
+    def identity(cls) -> "EdwardsPoint":
+        return cls((0, 1, 1, 0))
+
+    @classmethod
+    def base(cls) -> "EdwardsPoint":
+        """The base point B; multiplying it uses the precomputed comb."""
+        point = cls(affine_to_extended(B_AFFINE))
+        point._normalized = point.coords
+        point._is_base = True
+        return point
+
+    @classmethod
+    def decode(cls, data: bytes) -> "EdwardsPoint":
+        """Decode a 32-byte encoding (raises ValueError if it is not a point)."""
+        point = cls(decode_edwards_point(data))
+        point._normalized = point.coords
+        return point
+
+    def extended(self) -> tuple[int, int, int, int]:
+        """The extended coordinates, converting from Niels form if needed."""
+        if self.representation == EXTENDED:
+            return self.coords
+        ypx, ymx, _ = self.coords
+        inv2 = (prime_mod + 1) // 2
+        x = ((ypx - ymx) * inv2) % prime_mod
+        y = ((ypx + ymx) * inv2) % prime_mod
+        return (x, y, 1, (x * y) % prime_mod)
+
+    def normalize(self) -> tuple[int, int, int, int]:
+        """The extended coordinates with Z = 1 (memoized)."""
+        if self._normalized is None:
+            self._normalized = normalize_extended(self.extended())
+        return self._normalized
+
+    def to_niels(self) -> "EdwardsPoint":
+        """This point in Niels form, for use as the right operand of many additions."""
+        if self.representation == NIELS:
+            return self
+        niels = EdwardsPoint(extended_to_niels(self.normalize()), NIELS)
+        niels._normalized = self._normalized
+        niels._encoding = self._encoding
+        return niels
+
+    def encode(self) -> bytes:
+        """The 32-byte encoding (memoized)."""
+        if self._encoding is None:
+            x, y, _, _ = self.normalize()
+            self._encoding = (y | ((x & 1) << 255)).to_bytes(32, "little")
+        return self._encoding
+
+    def __bytes__(self) -> bytes:
+        return self.encode()
+
+    def __add__(self, other: "EdwardsPoint") -> "EdwardsPoint":
+        if not isinstance(other, EdwardsPoint):
+            return NotImplemented
+        if other.representation == NIELS:
+            return EdwardsPoint(edwards_point_add_niels(self.extended(), other.coords))
+        return EdwardsPoint(edwards_point_add_extended(self.extended(), other.coords))
+
+    def __neg__(self) -> "EdwardsPoint":
+        if self.representation == NIELS:
+            return EdwardsPoint(niels_negate(self.coords), NIELS)
+        return EdwardsPoint(edwards_point_negate(self.coords))
+
+    def __sub__(self, other: "EdwardsPoint") -> "EdwardsPoint":
+        if not isinstance(other, EdwardsPoint):
+            return NotImplemented
+        return self + (-other)
+
+    def __mul__(self, scalar: int) -> "EdwardsPoint":
+        if not isinstance(scalar, int):
+            return NotImplemented
+        if self._is_base:
+            return EdwardsPoint(edwards_base_mult(scalar))
+        return EdwardsPoint(edwards_multi_scalar_mult([scalar], [self.extended()]))
+
+    __rmul__ = __mul__
+
+    def double(self) -> "EdwardsPoint":
+        return EdwardsPoint(edwards_point_double_extended(self.extended()))
+
+    def mul_by_cofactor(self) -> "EdwardsPoint":
+        """[8] * this point."""
+        return EdwardsPoint(edwards_mul_by_cofactor(self.extended()))
+
+    def is_identity(self) -> bool:
+        return is_identity(self.extended())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EdwardsPoint):
+            return NotImplemented
+        return edwards_points_equal(self.extended(), other.extended())
+
+    def __hash__(self) -> int:
+        return hash(self.encode())
+
+    def __repr__(self) -> str:
+        return f"EdwardsPoint({self.encode().hex()})"
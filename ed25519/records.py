@@ -0,0 +1,179 @@
+# Signed-record files for the command-line tool (python -m ed25519): binary frames and JSON lines
+import base64
+import binascii
+import json
+import mmap
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterator, Literal, Optional
+
+PUBLIC_KEY_SIZE = 32
+SIGNATURE_SIZE = 64
+LENGTH_SIZE = 4
+
+# (public_key, message, signature), the entry order of Ed25519.verify_batch
+Record = tuple[bytes, bytes, bytes]
+
+# A parser yields (offset just past the item, item) for every complete item of
+# buffer[offset:]. With final=False it stops quietly at an incomplete item at the
+# end (more data may follow); with final=True that item is an error.
+Parser = Callable[[bytes, int, bool], Iterator[tuple[int, object]]]
+
+Encoding = Literal['hex', 'base64']
+
+
+def _frames(buffer, offset: int, final: bool, header: int, message_size: Optional[int]) -> Iterator[tuple[int, int, int]]:
+    """Yield (start, message start, end) for each frame: header bytes, then a 4-byte
+    little-endian message length and the message (or a message of message_size bytes)."""
+    size = len(buffer)
+    prefix = header + (LENGTH_SIZE if message_size is None else 0)
+    while offset < size:
+        if offset + prefix > size:
+            break
+        if message_size is None:
+            length = int.from_bytes(buffer[offset + header:offset + prefix], "little")
+        else:
+            length = message_size
+        if offset + prefix + length > size:
+            break
+        yield offset, offset + prefix, offset + prefix + length
+        offset += prefix + length
+    if final and offset < size:
+        raise ValueError(f"Truncated record at byte {offset}.")
+
+
+def parse_binary_records(buffer, offset: int = 0, final: bool = True, message_size: Optional[int] = None) -> Iterator[tuple[int, Record]]:
+    """
+    Signed records in the binary layout: 32-byte public key, 64-byte signature,
+    4-byte little-endian message length, message. With message_size, every message
+    has that many bytes and the length field is left out.
+    """
+    for start, message_start, end in _frames(buffer, offset, final, PUBLIC_KEY_SIZE + SIGNATURE_SIZE, message_size):
+        yield end, (
+            buffer[start:start + PUBLIC_KEY_SIZE],
+            buffer[message_start:end],
+            buffer[start + PUBLIC_KEY_SIZE:start + PUBLIC_KEY_SIZE + SIGNATURE_SIZE],
+        )
+
+
+def parse_binary_messages(buffer, offset: int = 0, final: bool = True, message_size: Optional[int] = None) -> Iterator[tuple[int, bytes]]:
+    """Messages to sign: each a 4-byte little-endian length and the message (or message_size bytes)."""
+    for _, message_start, end in _frames(buffer, offset, final, 0, message_size):
+        yield end, buffer[message_start:end]
+
+
+def encode_binary_record(public_key: bytes, message: bytes, signature: bytes, message_size: Optional[int] = None) -> bytes:
+    if message_size is None:
+        return bytes(public_key) + bytes(signature) + len(message).to_bytes(LENGTH_SIZE, "little") + bytes(message)
+    if len(message) != message_size:
+        raise ValueError(f"Message of {len(message)} bytes in a file of {message_size}-byte messages.")
+    return bytes(public_key) + bytes(signature) + bytes(message)
+
+
+def parse_lines(buffer, offset: int = 0, final: bool = True) -> Iterator[tuple[int, bytes]]:
+    """Non-blank lines, without the line break."""
+    size = len(buffer)
+    while offset < size:
+        newline = buffer.find(b"\n", offset)
+        if newline < 0:
+            if not final:
+                return
+            newline = end = size
+        else:
+            end = newline + 1
+        line = buffer[offset:newline].strip()
+        if line:
+            yield end, line
+        offset = end
+
+
+def decode_field(value: str, encoding: Encoding) -> bytes:
+    if encoding == 'hex':
+        return bytes.fromhex(value)
+    return base64.b64decode(value, validate=True)
+
+
+def encode_field(value: bytes, encoding: Encoding) -> str:
+    if encoding == 'hex':
+        return bytes(value).hex()
+    return base64.b64encode(value).decode("ascii")
+
+
+def parse_json_object(line: bytes, offset: int) -> dict:
+    try:
+        obj = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"Malformed JSON record at byte {offset}: {e}") from None
+    if not isinstance(obj, dict):
+        raise ValueError(f"Malformed JSON record at byte {offset}: not an object.")
+    return obj
+
+
+def parse_json_records(buffer, offset: int = 0, final: bool = True, encoding: Encoding = 'hex') -> Iterator[tuple[int, Record]]:
+    """JSON lines with "public_key", "message" and "signature" fields, hex or base64 encoded."""
+    start = offset
+    for end, line in parse_lines(buffer, offset, final):
+        obj = parse_json_object(line, start)
+        try:
+            record = tuple(decode_field(obj[field], encoding) for field in ("public_key", "message", "signature"))
+        except (KeyError, TypeError, ValueError, binascii.Error) as e:
+            raise ValueError(f"Malformed JSON record at byte {start}: {e!r}") from None
+        yield end, record
+        start = end
+
+
+def parse_json_messages(buffer, offset: int = 0, final: bool = True, encoding: Encoding = 'hex') -> Iterator[tuple[int, tuple[dict, bytes]]]:
+    """Messages to sign: JSON lines with a "message" field; yields (object, message)."""
+    start = offset
+    for end, line in parse_lines(buffer, offset, final):
+        obj = parse_json_object(line, start)
+        try:
+            message = decode_field(obj["message"], encoding)
+        except (KeyError, TypeError, ValueError, binascii.Error) as e:
+            raise ValueError(f"Malformed JSON record at byte {start}: {e!r}") from None
+        yield end, (obj, message)
+        start = end
+
+
+def encode_json_record(obj: dict, public_key: bytes, signature: bytes, encoding: Encoding = 'hex') -> bytes:
+    """The object with public_key and signature fields added, as one JSON line."""
+    obj = dict(obj, public_key=encode_field(public_key, encoding), signature=encode_field(signature, encoding))
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+@contextmanager
+def mapped(path: str) -> Iterator[bytes]:
+    """A read-only memory map of the file (an empty bytes object for an empty file)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def read_stream(stream: BinaryIO, parse: Parser, offset: int = 0, chunk_size: int = 1 << 20) -> Iterator[tuple[int, object]]:
+    """
+    Parse a stream that cannot be mapped (stdin) chunk by chunk, after skipping
+    offset bytes. Offsets yielded are from the start of the stream.
+    """
+    remaining = offset
+    while remaining > 0:
+        skipped = len(stream.read(min(remaining, chunk_size)))
+        if not skipped:
+            raise ValueError("The input is shorter than the checkpoint offset.")
+        remaining -= skipped
+    buffer = b""
+    base = offset
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        buffer += chunk
+        consumed = 0
+        for end, item in parse(buffer, 0, final):
+            consumed = end
+            yield base + end, item
+        buffer = buffer[consumed:]
+        base += consumed
+        if final:
+            return
@@ -0,0 +1,155 @@
+# A read-only key-table segment that many verifier processes can map at once
+import mmap
+from typing import Iterable, Optional
+from ed25519.keys import KeyTableCache, VerifyingKey
+from ed25519.tables import CELL_SIZE, HEADER, pack_table, parse_header, write_atomic
+
+# Table kind of a segment (see ed25519.tables for the header layout)
+SEGMENT_KIND = "ed25519-keyseg"
+
+# Each record is the encoded key followed by X, Y, Z, T of the multiples [1..15] * A
+RECORD_CELLS = 1 + 15 * 4
+
+# Checked keys kept per process by get()
+TABLE_CACHE_SIZE = 1024
+
+
+class KeyTableSegment:
+    """
+    A packed, fixed-layout file of decoded public keys and their window tables.
+
+    The file uses the ed25519.tables layout with one 61-cell record per key, sorted by
+    the encoded key so that a lookup is a binary search over the mapping itself: no
+    per-process index or decoded copy is built. Every worker that opens the same file
+    maps the same page-cache pages read-only, so memory stays flat as workers are added
+    and the decoding happens once per host (put the file on a tmpfs such as /dev/shm
+    to keep it in RAM).
+
+    The file is not trusted: its checksum only catches corruption, and anyone who can
+    write it could swap in the multiples of another point. So key_at() checks each
+    record against its encoded key (VerifyingKey.check, about a fifth of the cost of
+    decoding and building the table) and raises ValueError if it does not match, which
+    makes verification against that key fail. get() keeps the last `table_cache`
+    checked keys of this process in a KeyTableCache, so a key is checked once per
+    worker rather than on every lookup.
+
+    The segment can be passed to Ed25519(key_tables=...). Keys that are not in the
+    segment are decoded on the fly and are not added to it.
+    """
+
+    def __init__(self, buffer, check: bool = False, table_cache: int = TABLE_CACHE_SIZE) -> None:
+        with memoryview(buffer) as view:
+            self._view = view.toreadonly()
+        try:
+            self._count, width = parse_header(self._view, SEGMENT_KIND, check=check)
+            if width != RECORD_CELLS and self._count:
+                raise ValueError("Unexpected key segment record width.")
+        except Exception:
+            self._view.release()
+            raise
+        self._record_size = RECORD_CELLS * CELL_SIZE
+        self._mmap = None
+        self._tables = KeyTableCache(max_size=table_cache) if table_cache else None
+
+    @staticmethod
+    def pack(public_keys: Iterable[bytes]) -> bytearray:
+        """
+        Decode the keys, build their window tables and return the packed segment.
+        Raises ValueError if a key is not a valid point encoding.
+        """
+        keys = sorted({bytes(public_key) for public_key in public_keys})
+        return pack_table(SEGMENT_KIND, [VerifyingKey(public_key).to_record() for public_key in keys])
+
+    @classmethod
+    def create(cls, path: str, public_keys: Iterable[bytes], table_cache: int = TABLE_CACHE_SIZE) -> "KeyTableSegment":
+        """Build a segment file (atomically) and open it."""
+        write_atomic(path, cls.pack(public_keys))
+        return cls.open(path, check=True, table_cache=table_cache)
+
+    @classmethod
+    def open(cls, path: str, check: bool = False, table_cache: int = TABLE_CACHE_SIZE) -> "KeyTableSegment":
+        """
+        Map an existing segment file read-only. The checksum is only verified if
+        `check` is set, so attaching a large segment stays cheap for every worker
+        (records are checked one by one as they are used).
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            segment = cls(mapped, check=check, table_cache=table_cache)
+        except Exception:
+            mapped.close()
+            raise
+        segment._mmap = mapped
+        return segment
+
+    def close(self) -> None:
+        """Unmap the segment (lookups afterwards are an error)."""
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "KeyTableSegment":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, public_key: bytes) -> bool:
+        return self.find(public_key) is not None
+
+    def find(self, public_key: bytes) -> Optional[int]:
+        """Return the slot of an encoded key, or None if it is not in the segment."""
+        public_key = bytes(public_key)
+        view = self._view
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER.size + mid * self._record_size
+            stored = view[offset:offset + CELL_SIZE].tobytes()
+            if stored < public_key:
+                lo = mid + 1
+            elif stored > public_key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def key_at(self, slot: int) -> VerifyingKey:
+        """
+        Materialize the VerifyingKey stored in a slot.
+        Raises ValueError if the record does not match its encoded key.
+        """
+        if not 0 <= slot < self._count:
+            raise IndexError("Key segment slot out of range.")
+        offset = HEADER.size + slot * self._record_size
+        view = self._view
+        record = [
+            int.from_bytes(view[offset + i * CELL_SIZE:offset + (i + 1) * CELL_SIZE], "little")
+            for i in range(RECORD_CELLS)
+        ]
+        key = VerifyingKey.from_record(record)
+        key.check()
+        return key
+
+    def get(self, public_key: bytes) -> VerifyingKey:
+        """
+        Return the VerifyingKey for an encoded key: from the checked keys of this
+        process, else from the segment if present (raises ValueError if its record
+        does not match), otherwise by decoding it (raises ValueError for invalid
+        encodings).
+        """
+        public_key = bytes(public_key)
+        if self._tables is not None and public_key in self._tables:
+            return self._tables.get(public_key)
+        slot = self.find(public_key)
+        if slot is None:
+            return VerifyingKey(public_key)
+        key = self.key_at(slot)
+        if self._tables is not None:
+            self._tables.add(key)
+        return key
@@ -0,0 +1,108 @@
+# Binary files of precomputed point tables (the format of key segments)
+#
+# File layout (all integers little-endian):
+#     magic       8 bytes   b"P79TABLE"
+#     version     u32       FORMAT_VERSION
+#     records     u32       number of records
+#     width       u32       32-byte cells per record
+#     reserved    u32       0
+#     kind        16 bytes  ASCII table name, NUL padded
+#     checksum    32 bytes  SHA-256 of the payload
+#     payload     records * width * 32 bytes, each cell an unsigned 256-bit integer
+import hashlib
+import mmap
+import os
+import struct
+from typing import Optional
+
+MAGIC = b"P79TABLE"
+FORMAT_VERSION = 1
+CELL_SIZE = 32
+HEADER = struct.Struct("<8sIIII16s32s")
+
+def pack_table(kind: str, records: list[list[int]]) -> bytearray:
+    """Serialize records of integers (all of the same width) to the table layout."""
+    width = len(records[0]) if records else 0
+    data = bytearray(HEADER.size + len(records) * width * CELL_SIZE)
+    offset = HEADER.size
+    for record in records:
+        if len(record) != width:
+            raise ValueError("All records must have the same width.")
+        for value in record:
+            data[offset:offset + CELL_SIZE] = value.to_bytes(CELL_SIZE, "little")
+            offset += CELL_SIZE
+    HEADER.pack_into(
+        data, 0, MAGIC, FORMAT_VERSION, len(records), width, 0,
+        kind.encode("ascii"), hashlib.sha256(memoryview(data)[HEADER.size:]).digest(),
+    )
+    return data
+
+
+def parse_header(view: memoryview, kind: str, check: bool = True) -> tuple[int, int]:
+    """
+    Validate a table header and return (records, width).
+    Raises ValueError on a different magic, version or kind, a wrong size, or
+    (if check is set) a checksum mismatch.
+    """
+    if len(view) < HEADER.size:
+        raise ValueError("Table is truncated.")
+    magic, version, count, width, _, stored_kind, checksum = HEADER.unpack_from(view)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a table file of this version.")
+    if stored_kind.rstrip(b"\0") != kind.encode("ascii"):
+        raise ValueError(f"Table kind is not '{kind}'.")
+    if len(view) != HEADER.size + count * width * CELL_SIZE:
+        raise ValueError("Table size does not match its header.")
+    if check:
+        with view[HEADER.size:] as payload:
+            if hashlib.sha256(payload).digest() != checksum:
+                raise ValueError("Table checksum mismatch.")
+    return count, width
+
+
+def write_table(path: str, kind: str, records: list[list[int]]) -> None:
+    """
+    Write records of integers to a table file.
+    The file is written to a temporary name and renamed, so readers never see a partial file.
+    """
+    write_atomic(path, pack_table(kind, records))
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write data to a temporary file next to `path` and rename it into place."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def read_table(path: str, kind: str) -> Optional[list[list[int]]]:
+    """
+    Memory-map a table file and decode its records into Python integers (the
+    mapping is closed again once they are decoded).
+    Returns None if the file is missing, from another version or kind, truncated,
+    or fails its checksum.
+    """
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                return _decode(view, kind)
+    except (OSError, ValueError):
+        return None
+
+
+def _decode(view: memoryview, kind: str) -> list[list[int]]:
+    count, width = parse_header(view, kind)
+    records = []
+    offset = HEADER.size
+    for _ in range(count):
+        record = []
+        for _ in range(width):
+            record.append(int.from_bytes(view[offset:offset + CELL_SIZE], "little"))
+            offset += CELL_SIZE
+        records.append(record)
+    return records
+
@@ -0,0 +1,104 @@
+# Thread pool for batch verification and bulk X25519, for free-threaded CPython builds
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+from ed25519.ed25519 import Ed25519, VECTORIZED_BATCH_MIN
+from x25519.utils import HAVE_NUMPY
+from x25519.x25519 import X25519, VECTORIZED_MIN_BATCH
+
+# True when threads really run in parallel: a free-threaded build (3.13t and later)
+# with the GIL disabled
+FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# Smallest shard worth handing to a thread of its own
+MIN_SHARD_SIZE = 8
+
+
+class CryptoThreadPool:
+    """
+    Batch verification and bulk X25519 on a pool of threads sharing one Ed25519 and
+    one X25519 instance.
+
+    Everything those instances touch is safe to share: the precomputed tables are
+    immutable and built under a lock, VerificationCache and KeyTableCache lock (per
+    stripe), KeyRing lookups need no lock and Metrics serializes its updates. So
+    unlike CryptoWorkerPool nothing is copied or pickled. A call is split into one
+    shard per thread and each thread runs the usual batch path on its shard. Shards
+    have at least MIN_SHARD_SIZE items, or as many as the NumPy paths need
+    (VECTORIZED_BATCH_MIN signatures, VECTORIZED_MIN_BATCH pairs) when they apply.
+
+    This only pays off when threads run in parallel, i.e. on free-threaded builds.
+    Under the GIL the shards would take turns, and a batch verification split into
+    shards loses part of the saving of one large batch, so by default the pool then
+    runs each call in the calling thread and its throughput is that of serial code.
+
+    Args:
+        threads: Number of threads (default: os.cpu_count()).
+        backend: Backend of the instances created when none are given.
+        ed25519: Ed25519 instance to share, e.g. one with a cache or key tables.
+        x25519: X25519 instance to share.
+        parallel: Shard calls over the threads; None does so only if FREE_THREADED.
+    """
+
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        backend: Optional[str] = None,
+        ed25519: Optional[Ed25519] = None,
+        x25519: Optional[X25519] = None,
+        parallel: Optional[bool] = None,
+    ) -> None:
+        threads = threads if threads is not None else os.cpu_count() or 1
+        if threads <= 0:
+            raise ValueError("threads must be positive.")
+        self.threads = threads
+        self.ed25519 = ed25519 if ed25519 is not None else Ed25519(backend=backend)
+        self.x25519 = x25519 if x25519 is not None else X25519(backend=backend)
+        self.parallel = (FREE_THREADED if parallel is None else parallel) and threads > 1
+        self._executor = ThreadPoolExecutor(threads, thread_name_prefix="p79") if self.parallel else None
+        # Shards stay large enough for the NumPy paths
+        self._min_verify_shard = (
+            VECTORIZED_BATCH_MIN if HAVE_NUMPY and self.ed25519.backend == 'python' else MIN_SHARD_SIZE
+        )
+        self._min_x25519_shard = (
+            VECTORIZED_MIN_BATCH if HAVE_NUMPY and self.x25519.backend == 'python' else MIN_SHARD_SIZE
+        )
+
+    def _shards(self, items: Sequence, min_size: int) -> list[Sequence]:
+        """Split items into at most `threads` contiguous shards of at least min_size items."""
+        count = max(1, min(self.threads, len(items) // min_size))
+        bounds = [len(items) * i // count for i in range(count + 1)]
+        return [items[bounds[i]:bounds[i + 1]] for i in range(count)]
+
+    def verify_batch(self, batch: Sequence[tuple[bytes, bytes, bytes]], vectorized: Optional[bool] = None) -> bool:
+        """Ed25519.verify_batch, each thread checking the batch equation of one shard."""
+        if self._executor is None:
+            return self.ed25519.verify_batch(batch, vectorized)
+        shards = self._shards(list(batch), self._min_verify_shard)
+        if len(shards) == 1:
+            return self.ed25519.verify_batch(shards[0], vectorized)
+        return all(list(self._executor.map(lambda shard: self.ed25519.verify_batch(shard, vectorized), shards)))
+
+    def scalar_multiply_many(self, pairs: Sequence[tuple[bytes, bytes]]) -> list[bytes]:
+        """X25519.scalar_multiply_many, each thread computing one shard of the pairs."""
+        if self._executor is None:
+            return self.x25519.scalar_multiply_many(pairs)
+        shards = self._shards(list(pairs), self._min_x25519_shard)
+        if len(shards) == 1:
+            return self.x25519.scalar_multiply_many(shards[0])
+        results = []
+        for shard_results in self._executor.map(self.x25519.scalar_multiply_many, shards):
+            results.extend(shard_results)
+        return results
+
+    def close(self) -> None:
+        """Stop the threads (after the calls in progress)."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "CryptoThreadPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
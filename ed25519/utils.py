@@ -1,11 +1,14 @@
-from x25519.utils import mult_inverse, field_add, field_mul, sqrt_mod
+from x25519.utils import mult_inverse, batch_mult_inverse, field_add, field_mul, sqrt_mod
 import hashlib
+import threading
 
 # Prime modulus (same as Curve25519)
 prime_mod = 2**255 - 19
 
-# d = -121665/121666 mod P
-d = (-121665 * mult_inverse(121666, prime_mod)) % prime_mod
+# d = -121665/121666 mod P, and 2*d mod P as used by the addition formulas.
+# Both are literals so importing the module does not pay for an inversion.
+d = 37095705934669439343138083508754565189542113879843219016388785533085940283555
+D2 = 16295367250680780974490674513165176452449235426866156013048779062215315747161
 
 # Order of the base-point subgroup
 L = 2**252 + 27742317777372353535851937790883648493
@@ -20,6 +23,39 @@ def sha512(data: bytes) -> bytes:
     """Compute the SHA-512 hash of the input data."""
     return hashlib.sha512(data).digest()
 
+def sha512_concat(*parts: bytes) -> bytes:
+    """SHA-512 of the concatenated parts, fed to the hash one by one instead of joined first."""
+    h = hashlib.sha512()
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+def challenge(public_key: bytes, message: bytes, signature: bytes) -> int:
+    """The challenge k = SHA-512(R || A || M) mod L of a signature R || S on M under key A."""
+    return int.from_bytes(sha512_concat(signature[:32], public_key, message), "little") % L
+
+# Domain separation of the half-aggregation transcript
+AGGREGATE_DOMAIN = b"p79-25519 ed25519 half-aggregation v1"
+
+def aggregation_coefficients(entries: list[tuple[bytes, bytes, int]]) -> list[int]:
+    """
+    The coefficients z_1..z_n of a half-aggregate, from its (R, A, k) entries:
+    z_i = SHA-512(T || i) mod L, where the transcript T = SHA-512(domain || n ||
+    R_1 || A_1 || k_1 || ... || R_n || A_n || k_n) binds every signature to all the
+    others. Each k_i already commits to its message, so messages are not rehashed.
+    """
+    h = hashlib.sha512(AGGREGATE_DOMAIN)
+    h.update(len(entries).to_bytes(8, "little"))
+    for R_enc, public_key, k in entries:
+        h.update(R_enc)
+        h.update(public_key)
+        h.update(k.to_bytes(32, "little"))
+    transcript = h.digest()
+    return [
+        int.from_bytes(sha512_concat(transcript, i.to_bytes(8, "little")), "little") % L
+        for i in range(len(entries))
+    ]
+
 def secret_expand(secret: bytes) -> tuple[int, bytes]:
     """
     Expand the 32-byte Ed25519 private key:
@@ -51,7 +87,7 @@ def compute_public_key(private_key: bytes) -> bytes:
     the compressed encoding of A.
     """
     a, _ = secret_expand(private_key)  # Expand and clamp the private key
-    A_point = edwards_scalar_mult(a, affine_to_extended(B_AFFINE))  # Compute A = a * B
+    A_point = edwards_base_mult(a)  # Compute A = a * B
     return encode_edwards_point(A_point)  # Encode A to compressed form
     
 # Conversions Between Affine and Extended Coordinates
@@ -85,12 +121,21 @@ def encode_edwards_point(P_ext: tuple[int, int, int, int]) -> bytes:
     most significant bit set to the least significant bit of the x-coordinate.
     """
     x, y = extended_to_affine(P_ext)
-    y_bytes = y.to_bytes(32, "little")
-    if x & 1:
-        y_bytes = bytearray(y_bytes)
-        y_bytes[-1] |= 0x80
-        y_bytes = bytes(y_bytes)
-    return y_bytes
+    # Set the sign bit on the integer, so only the final bytes object is allocated
+    return (y | ((x & 1) << 255)).to_bytes(32, "little")
+
+def encode_edwards_points(points: list[tuple[int, int, int, int]]) -> list[bytes]:
+    """
+    Encode many extended points, sharing one field inversion between all of them
+    (batch_mult_inverse) instead of inverting each Z separately.
+    """
+    inverses = batch_mult_inverse([Z for _, _, Z, _ in points], prime_mod)
+    encodings = []
+    for (X, Y, _, _), invZ in zip(points, inverses):
+        x = (X * invZ) % prime_mod
+        y = (Y * invZ) % prime_mod
+        encodings.append((y | ((x & 1) << 255)).to_bytes(32, "little"))
+    return encodings
 
 def decode_edwards_point(s: bytes) -> tuple[int, int, int, int]:
     """
@@ -144,7 +189,7 @@ def edwards_point_add_extended(
     X2, Y2, Z2, T2 = Q
     A = field_mul((Y1 - X1) % prime_mod, (Y2 - X2) % prime_mod, prime_mod)
     B = field_mul((Y1 + X1) % prime_mod, (Y2 + X2) % prime_mod, prime_mod)
-    C = field_mul(T1, field_mul(2 * d, T2, prime_mod), prime_mod)
+    C = field_mul(T1, field_mul(D2, T2, prime_mod), prime_mod)
     D = field_mul(2 * Z1, Z2, prime_mod)
     E = field_add(B, -A, prime_mod)
     F = field_add(D, -C, prime_mod)
@@ -156,6 +201,47 @@ def edwards_point_add_extended(
     Z3 = field_mul(F, G, prime_mod)
     return (X3 % prime_mod, Y3 % prime_mod, Z3 % prime_mod, T3 % prime_mod)
 
+# Niels form of an affine point: (y + x, y - x, 2*d*x*y). Adding it to an extended point
+# saves the 2d*T2 and Z1*Z2 products of the general addition (7 multiplications instead of 9).
+
+def extended_to_niels(P_ext: tuple[int, int, int, int]) -> tuple[int, int, int]:
+    """Convert an extended point with Z = 1 (see normalize_extended) to Niels form."""
+    x, y, Z, t = P_ext
+    if Z != 1:
+        raise ValueError("Niels form needs a normalized point (Z = 1)")
+    return ((y + x) % prime_mod, (y - x) % prime_mod, (D2 * t) % prime_mod)
+
+def niels_negate(N: tuple[int, int, int]) -> tuple[int, int, int]:
+    """Negate a point in Niels form: -(x, y) = (-x, y) swaps y+x and y-x and negates 2dxy."""
+    ypx, ymx, xy2d = N
+    return (ymx, ypx, -xy2d % prime_mod)
+
+def edwards_point_add_niels(
+    P: tuple[int, int, int, int], N: tuple[int, int, int]
+) -> tuple[int, int, int, int]:
+    """
+    Add an extended point P = (X1,Y1,Z1,T1) and an affine point in Niels form
+    N = (y2 + x2, y2 - x2, 2*d*x2*y2) (mixed addition):
+    
+        A = (Y1 - X1)*(y2 - x2)
+        B = (Y1 + X1)*(y2 + x2)
+        C = T1 * 2*d*x2*y2
+        D = 2 * Z1
+        E = B - A, F = D - C, G = D + C, H = B + A
+        X3 = E * F, Y3 = G * H, T3 = E * H, Z3 = F * G
+    """
+    X1, Y1, Z1, T1 = P
+    ypx, ymx, xy2d = N
+    A = ((Y1 - X1) * ymx) % prime_mod
+    B = ((Y1 + X1) * ypx) % prime_mod
+    C = (T1 * xy2d) % prime_mod
+    D = (2 * Z1) % prime_mod
+    E = B - A
+    F = D - C
+    G = D + C
+    H = B + A
+    return ((E * F) % prime_mod, (G * H) % prime_mod, (F * G) % prime_mod, (E * H) % prime_mod)
+
 def edwards_point_double_extended(
     P: tuple[int, int, int, int]
 ) -> tuple[int, int, int, int]:
@@ -214,6 +300,161 @@ def edwards_scalar_mult(
 
     return result
 
+def edwards_window_table(
+    P_ext: tuple[int, int, int, int], window: int = 4
+) -> list[tuple[int, int, int, int]]:
+    """Return the multiples [0, 1, ..., 2^window - 1] * P used by windowed multiplication."""
+    table = [(0, 1, 1, 0), P_ext]
+    for _ in range((1 << window) - 2):
+        table.append(edwards_point_add_extended(table[-1], P_ext))
+    return table
+
+def edwards_multi_scalar_mult(
+    scalars: list[int],
+    points: list[tuple[int, int, int, int]],
+    window: int = 4,
+    tables: list = None,
+) -> tuple[int, int, int, int]:
+    """
+    Compute the sum of [scalars[i]] * points[i] with Straus' interleaved method.
+    
+    Each point gets a table of its multiples [0..2^window - 1] * P, then the scalars are
+    processed together from the top window down, so the doublings are shared by all
+    the terms instead of being repeated for every scalar multiplication.
+    A negative scalar subtracts its term. Precomputed edwards_window_table() results
+    can be passed in `tables` (None entries are built here).
+    Note: This implementation is not constant-time.
+    """
+    identity = (0, 1, 1, 0)
+    mask = (1 << window) - 1
+    if tables is None:
+        tables = [None] * len(points)
+    terms = []
+    for scalar, P_ext, table in zip(scalars, points, tables):
+        if table is None:
+            table = edwards_window_table(P_ext, window)
+        terms.append((abs(scalar), scalar < 0, table))
+
+    max_bits = max((scalar.bit_length() for scalar, _, _ in terms), default=0)
+    result = identity
+    for shift in range(((max_bits + window - 1) // window - 1) * window, -1, -window):
+        for _ in range(window):
+            result = edwards_point_double_extended(result)
+        for scalar, negative, table in terms:
+            digit = (scalar >> shift) & mask
+            if digit:
+                entry = table[digit]
+                if negative:
+                    entry = edwards_point_negate(entry)
+                result = edwards_point_add_extended(result, entry)
+    return result
+
+# Fixed-base comb for B: row i holds [1..8] * 16^i * B (normalized, Z = 1), so [s]B is
+# one table addition per signed radix-16 digit of s and needs no doublings at all.
+BASE_TABLE_ROWS = 64
+BASE_TABLE_COLUMNS = 8
+
+_base_point_table = None
+_base_point_table_lock = threading.Lock()
+
+def build_base_point_table() -> list[list[int]]:
+    """
+    Build the comb for B as records of integers (one record per row, (x, y, x*y) per entry),
+    normalizing all 512 points with a single shared inversion.
+    """
+    points = []
+    row_base = affine_to_extended(B_AFFINE)
+    for _ in range(BASE_TABLE_ROWS):
+        entry = row_base
+        points.append(entry)
+        for _ in range(BASE_TABLE_COLUMNS - 1):
+            entry = edwards_point_add_extended(entry, row_base)
+            points.append(entry)
+        for _ in range(4):
+            row_base = edwards_point_double_extended(row_base)
+
+    inverses = batch_mult_inverse([Z for _, _, Z, _ in points], prime_mod)
+    records = []
+    for row in range(BASE_TABLE_ROWS):
+        record = []
+        for col in range(BASE_TABLE_COLUMNS):
+            X, Y, _, _ = points[row * BASE_TABLE_COLUMNS + col]
+            inv_Z = inverses[row * BASE_TABLE_COLUMNS + col]
+            x = (X * inv_Z) % prime_mod
+            y = (Y * inv_Z) % prime_mod
+            record.extend((x, y, (x * y) % prime_mod))
+        records.append(record)
+    return records
+
+def base_point_table() -> tuple[tuple[tuple[int, int, int], ...], ...]:
+    """
+    Return the comb for B in Niels form, building it on the first call in this process.
+    It is never read from the disk table cache: signing takes R = [r]B and the public
+    key from it, so a stale or planted file would leak the private key, and checking
+    every entry of a loaded file costs as much as the build (a few milliseconds).
+    The table is built under a lock and is immutable, so threads share it freely.
+    """
+    global _base_point_table
+    if _base_point_table is None:
+        with _base_point_table_lock:
+            if _base_point_table is None:
+                records = build_base_point_table()
+                _base_point_table = tuple(
+                    tuple(
+                        extended_to_niels((record[3 * j], record[3 * j + 1], 1, record[3 * j + 2]))
+                        for j in range(BASE_TABLE_COLUMNS)
+                    )
+                    for record in records
+                )
+    return _base_point_table
+
+def edwards_base_mult(scalar: int) -> tuple[int, int, int, int]:
+    """
+    Compute [scalar]B with the precomputed comb.
+    
+    The scalar is reduced mod L (B has order L) and recoded into 64 signed radix-16
+    digits in [-8, 8]; each non-zero digit adds one (possibly negated) table entry
+    with the mixed Niels addition.
+    Note: This implementation is not constant-time.
+    """
+    table = base_point_table()
+    scalar %= L
+    result = (0, 1, 1, 0)
+    carry = 0
+    for row in range(BASE_TABLE_ROWS):
+        digit = ((scalar >> (4 * row)) & 15) + carry
+        carry = (digit + 8) >> 4
+        digit -= carry << 4
+        if digit > 0:
+            result = edwards_point_add_niels(result, table[row][digit - 1])
+        elif digit < 0:
+            result = edwards_point_add_niels(result, niels_negate(table[row][-digit - 1]))
+    return result
+
+def reduce_scalar_basis(k: int, n: int = L) -> tuple[int, int]:
+    """
+    Find a short pair (c0, c1) with c0 = c1 * k (mod n) and c1 != 0.
+    
+    This is Lagrange (Gauss) reduction of the 2-dimensional lattice spanned by
+    (n, 0) and (k, 1); every lattice vector (v0, v1) satisfies v0 = v1 * k (mod n),
+    and the shortest one has both entries of about sqrt(n), i.e. ~127 bits for
+    the Ed25519 group order (see Pornin, "Optimized Lattice Basis Reduction in
+    Dimension 2, and Fast Schnorr and EdDSA Signature Verification", 2020).
+    The returned entries may be negative.
+    """
+    u = (n, 0)
+    v = (k % n, 1)
+    if u[0] * u[0] + u[1] * u[1] < v[0] * v[0] + v[1] * v[1]:
+        u, v = v, u
+    while True:
+        norm_v = v[0] * v[0] + v[1] * v[1]
+        dot = u[0] * v[0] + u[1] * v[1]
+        q = (2 * dot + norm_v) // (2 * norm_v)  # round(dot / norm_v)
+        r = (u[0] - q * v[0], u[1] - q * v[1])
+        if r[0] * r[0] + r[1] * r[1] >= norm_v:
+            return v
+        u, v = v, r
+
 def normalize_extended(P: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
     """Normalize an extended Edwards point so that Z = 1."""
     X, Y, Z, T = P
@@ -230,8 +471,26 @@ def edwards_point_negate(P: tuple[int, int, int, int]) -> tuple[int, int, int, i
     X, Y, Z, T = P
     return (-X % prime_mod, Y, Z, -T % prime_mod)
 
+def edwards_mul_by_cofactor(P: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+    """Compute [8]P with three doublings."""
+    return edwards_point_double_extended(
+        edwards_point_double_extended(edwards_point_double_extended(P))
+    )
+
+def edwards_points_equal(P: tuple[int, int, int, int], Q: tuple[int, int, int, int]) -> bool:
+    """
+    Compare two extended points without normalizing them.
+    (X1:Y1:Z1) and (X2:Y2:Z2) are the same point iff X1*Z2 == X2*Z1 and Y1*Z2 == Y2*Z1,
+    which avoids the two inversions needed to bring both points to Z = 1.
+    """
+    X1, Y1, Z1, _ = P
+    X2, Y2, Z2, _ = Q
+    return (X1 * Z2 - X2 * Z1) % prime_mod == 0 and (Y1 * Z2 - Y2 * Z1) % prime_mod == 0
+
 def is_identity(P: tuple[int, int, int, int]) -> bool:
-    # Assuming normalize_extended returns the normalized extended point (with Z == 1)
-    # and the identity (neutral element) is (0, 1, 1, 0)
-    norm = normalize_extended(P)
-    return norm == (0, 1, 1, 0)
+    """
+    Check whether an extended point is the identity (0, 1, 1, 0) up to scaling,
+    i.e. X == 0 and Y == Z, without normalizing it.
+    """
+    X, Y, Z, _ = P
+    return X % prime_mod == 0 and (Y - Z) % prime_mod == 0
@@ -0,0 +1,181 @@
+# Edwards point arithmetic on NumPy limb arrays, for large batch verification
+from x25519 import limbs, tuning
+from x25519.limbs import np
+from ed25519.utils import (
+    D2,
+    edwards_point_add_extended,
+    edwards_point_double_extended,
+)
+
+# Pippenger window: with the default 8-bit signed digits, 32 windows of 128 buckets for 253-bit scalars
+BUCKET_WINDOW = tuning.setting("ed25519.bucket_window")
+
+
+def edwards_add_lanes(P: tuple, Q: tuple) -> tuple:
+    """
+    Lane-wise complete addition of extended points given as (X, Y, Z, T) limb arrays,
+    with the formulas of edwards_point_add_extended. Every output is carried, so it
+    can be fed back in.
+    """
+    X1, Y1, Z1, T1 = P
+    X2, Y2, Z2, T2 = Q
+    A = limbs.mul(Y1 - X1, Y2 - X2)
+    B = limbs.mul(Y1 + X1, Y2 + X2)
+    C = limbs.mul(limbs.mul(T1, _D2), T2)
+    D = limbs.mul_small(limbs.mul(Z1, Z2), 2)
+    E = B - A
+    F = D - C
+    G = D + C
+    H = B + A
+    return limbs.mul(E, F), limbs.mul(G, H), limbs.mul(F, G), limbs.mul(E, H)
+
+
+# 2*d as a read-only lane, built at import so threads never race to create it
+_D2 = None
+if limbs.HAVE_NUMPY:
+    _D2 = limbs.to_limbs([D2])
+    _D2.setflags(write=False)
+
+
+def _points_to_lanes(points: list[tuple[int, int, int, int]]) -> tuple:
+    """Pack extended points into four (10, K) limb arrays."""
+    return tuple(limbs.to_limbs([point[c] for point in points]) for c in range(4))
+
+
+def _lanes_to_points(P: tuple) -> list[tuple[int, int, int, int]]:
+    return list(zip(*(limbs.from_limbs(coordinate) for coordinate in P)))
+
+
+def _signed_digits(scalars: list[int], windows: int):
+    """
+    Signed radix-2^BUCKET_WINDOW digits of non-negative scalars, shape (n, windows),
+    each in [-2^(BUCKET_WINDOW - 1), 2^(BUCKET_WINDOW - 1)), computed column by column
+    for all scalars at once.
+    """
+    size = (windows * BUCKET_WINDOW + 7) // 8
+    data = b"".join(scalar.to_bytes(size, "little") for scalar in scalars)
+    if BUCKET_WINDOW == 8:
+        digits = np.frombuffer(data, dtype=np.uint8).reshape(len(scalars), windows).astype(np.int64)
+    else:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8).reshape(len(scalars), size), axis=1, bitorder="little")
+        bits = bits[:, :windows * BUCKET_WINDOW].reshape(len(scalars), windows, BUCKET_WINDOW)
+        digits = bits.astype(np.int64) @ (np.int64(1) << np.arange(BUCKET_WINDOW, dtype=np.int64))
+    half = 1 << (BUCKET_WINDOW - 1)
+    carry = np.zeros(len(scalars), dtype=np.int64)
+    for w in range(windows):
+        digit = digits[:, w] + carry
+        carry = (digit >= half).astype(np.int64)
+        digits[:, w] = digit - (carry << BUCKET_WINDOW)
+    return digits
+
+
+def _sum_groups(points: tuple, index, sign, group, groups: int) -> tuple:
+    """
+    Sum lists of points as lanes: entry e adds sign[e] * points[index[e]] to lane
+    group[e]. Round r adds the r-th entry of every lane in one vectorized addition;
+    lanes whose list is exhausted add the identity, the last column of points
+    (the complete formulas allow it). Returns the (10, groups) limb arrays of the sums.
+    """
+    X, Y, Z, T = points
+    identity_index = X.shape[1] - 1
+    order = np.argsort(group, kind="stable")
+    index, sign, group = index[order], sign[order], group[order]
+    rank = np.arange(len(group)) - np.searchsorted(group, group, side="left")
+    rounds = int(rank.max()) + 1 if len(group) else 0
+
+    schedule = np.full((rounds, groups), identity_index, dtype=np.int64)
+    signs = np.ones((rounds, groups), dtype=np.int64)
+    schedule[rank, group] = index
+    signs[rank, group] = sign
+
+    sums = tuple(np.repeat(c[:, identity_index:], groups, axis=1) for c in points)
+    for r in range(rounds):
+        i, s = schedule[r], signs[r]
+        # -P = (-X, Y, Z, -T)
+        sums = edwards_add_lanes(sums, (X[:, i] * s, Y[:, i], Z[:, i], T[:, i] * s))
+    return sums
+
+
+def _append_identity(P: tuple) -> tuple:
+    identity = _points_to_lanes([(0, 1, 1, 0)])
+    return tuple(np.concatenate([c, e], axis=1) for c, e in zip(P, identity))
+
+
+def edwards_multi_scalar_mult_lanes(
+    scalars: list[int],
+    points: list[tuple[int, int, int, int]],
+) -> tuple[int, int, int, int]:
+    """
+    Compute the sum of [scalars[i]] * points[i] with Pippenger's bucket method, the
+    bucket additions running as NumPy lanes.
+
+    Scalars are split into signed BUCKET_WINDOW-bit digits, and window w, bucket b
+    collects every point whose digit w is +-b. Filling the buckets is a set of
+    independent additions, so each bucket's list is cut into chunks of about the
+    average bucket size and every chunk is one lane; the chunks of a bucket are then
+    summed the same way.
+    (Without chunking, the few buckets used by the top window of scalars below L
+    would need several times more rounds than the others.) Each window is reduced
+    with running sums, the windows being the lanes, and the windows are combined
+    in Python with doublings. Scalars must be non-negative and below 2^256.
+    Requires NumPy.
+    """
+    limbs.require_numpy()
+    n = len(points)
+    if n == 0:
+        return (0, 1, 1, 0)
+    # One spare window for the final carry of the signed recoding
+    windows = (max(scalar.bit_length() for scalar in scalars) + BUCKET_WINDOW - 1) // BUCKET_WINDOW + 1
+    buckets_per_window = 1 << (BUCKET_WINDOW - 1)
+    lanes = windows * buckets_per_window
+
+    # Every (point, window) with a non-zero digit, and the bucket lane it goes to
+    digits = _signed_digits(scalars, windows)
+    point_index, window = np.nonzero(digits)
+    digit = digits[point_index, window]
+    bucket = window * buckets_per_window + np.abs(digit) - 1
+
+    # Cut each bucket's list into chunks of at most chunk_size entries
+    order = np.argsort(bucket, kind="stable")
+    point_index, digit, bucket = point_index[order], digit[order], bucket[order]
+    rank = np.arange(len(bucket)) - np.searchsorted(bucket, bucket, side="left")
+    chunk_size = max(1, -(-len(bucket) // (windows * buckets_per_window)))
+    chunk_key = bucket * (n // chunk_size + 1) + rank // chunk_size
+    chunk_keys, chunk = np.unique(chunk_key, return_inverse=True)
+    chunk_bucket = chunk_keys // (n // chunk_size + 1)
+
+    points_lanes = _append_identity(_points_to_lanes(points))
+    chunks = _sum_groups(points_lanes, point_index, np.sign(digit), chunk, len(chunk_keys))
+    buckets = _sum_groups(
+        _append_identity(chunks),
+        np.arange(len(chunk_keys)),
+        np.ones(len(chunk_keys), dtype=np.int64),
+        chunk_bucket,
+        lanes,
+    )
+
+    # sum of b * bucket_b over b = sum of 2^k * (sum of the buckets with bit k of b set):
+    # the inner sums for every (window, k) are pairwise trees over lanes
+    # (padded with the identity, which sits in the extra lane after all the buckets)
+    members = np.full((BUCKET_WINDOW, buckets_per_window), -1, dtype=np.int64)
+    for k in range(BUCKET_WINDOW):
+        with_bit = [b - 1 for b in range(1, buckets_per_window + 1) if (b >> k) & 1]
+        members[k, :len(with_bit)] = with_bit
+    gather = np.arange(windows)[:, None, None] * buckets_per_window + members[None]
+    gather = np.where(members[None] < 0, lanes, gather).reshape(-1)
+    buckets = _append_identity(buckets)
+    sums = tuple(c[:, gather] for c in buckets)
+    width = buckets_per_window
+    while width > 1:
+        width //= 2
+        halves = [c.reshape(limbs.NUM_LIMBS, -1, 2 * width) for c in sums]
+        sums = edwards_add_lanes(
+            tuple(h[:, :, :width].reshape(limbs.NUM_LIMBS, -1) for h in halves),
+            tuple(h[:, :, width:].reshape(limbs.NUM_LIMBS, -1) for h in halves),
+        )
+
+    # Combine: the sum of 2^(BUCKET_WINDOW * w + k) * sums[w, k], by Horner's rule from the top bit
+    result = (0, 1, 1, 0)
+    for bit_sum in reversed(_lanes_to_points(sums)):
+        result = edwards_point_add_extended(edwards_point_double_extended(result), bit_sum)
+    return result
@@ -0,0 +1,167 @@
+# Process pool for bulk X25519 and signing jobs, with adaptive chunking
+import gc
+import itertools
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+from ed25519.ed25519 import Ed25519
+from ed25519.utils import base_point_table
+from x25519 import tuning
+from x25519.utils import HAVE_NUMPY
+from x25519.x25519 import X25519, VECTORIZED_MIN_BATCH
+
+# Chunks are sized so that one takes about TARGET_CHUNK_SECONDS in a worker, which keeps
+# the pickling and queueing cost of a chunk (well under a millisecond) negligible
+TARGET_CHUNK_SECONDS = 0.05
+MIN_CHUNK_SIZE = 8
+MAX_CHUNK_SIZE = 4096
+
+# Jobs with fewer items than this are not worth shipping to the workers (see x25519.tuning)
+SHARD_MIN_ITEMS = tuning.setting("workers.shard_min_items")
+
+# Per-worker instances and start-up barrier, set by the pool initializer
+_ed25519: Optional[Ed25519] = None
+_x25519: Optional[X25519] = None
+_started = None
+
+
+def _init_worker(backend: Optional[str], started) -> None:
+    global _ed25519, _x25519, _started
+    _ed25519 = Ed25519(backend=backend)
+    _x25519 = X25519(backend=backend)
+    _started = started
+
+
+def _ready() -> int:
+    # Every worker waits here until all have arrived, so each answers exactly one call
+    _started.wait()
+    return os.getpid()
+
+
+def _scalar_multiply_chunk(pairs: list[tuple[bytes, bytes]], x25519: Optional[X25519] = None) -> tuple[float, list[bytes]]:
+    start = time.perf_counter()
+    results = (x25519 or _x25519).scalar_multiply_many(pairs)
+    return time.perf_counter() - start, results
+
+
+def _sign_chunk(requests: list[tuple[bytes, bytes]], ed25519: Optional[Ed25519] = None) -> tuple[float, list[bytes]]:
+    start = time.perf_counter()
+    out = bytearray(64 * len(requests))
+    (ed25519 or _ed25519).sign_many_into(requests, out)
+    return time.perf_counter() - start, [bytes(out[i:i + 64]) for i in range(0, len(out), 64)]
+
+
+class CryptoWorkerPool:
+    """
+    A pool of worker processes for bulk X25519 and Ed25519 signing.
+
+    The workers are started once, when the pool is created, after the precomputed
+    base-point comb has been loaded in the parent: with the 'fork' start method they
+    inherit it copy-on-write instead of each building their own (the collector is
+    frozen before forking so that it does not touch, and copy, those pages).
+
+    Jobs are submitted in chunks and results come back in input order from a
+    generator, so inputs can be streamed. The chunk size of each kind of job adapts
+    to the time the workers report per item, aiming at TARGET_CHUNK_SECONDS of work
+    per chunk, and at most two chunks per worker are in flight. X25519 chunks are
+    never smaller than VECTORIZED_MIN_BATCH when the workers can use the NumPy
+    ladder. Throughput grows with the number of processes up to the number of cores,
+    since each worker runs its own interpreter. Jobs with fewer than SHARD_MIN_ITEMS
+    items run in the calling process instead.
+
+    Args:
+        processes: Number of worker processes (default: the tuning profile's
+            workers.processes, or os.cpu_count() if it is 0).
+        backend: Backend of the workers' Ed25519 and X25519 instances.
+        chunk_size: Initial chunk size; None starts at MIN_CHUNK_SIZE.
+        adaptive: Resize chunks from the measured time per item.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        backend: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        adaptive: bool = True,
+    ) -> None:
+        if processes is None:
+            processes = tuning.setting("workers.processes") or os.cpu_count() or 1
+        if processes <= 0:
+            raise ValueError("processes must be positive.")
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        self.processes = processes
+        self.adaptive = adaptive
+        # Instances for the jobs that run in this process
+        self._local = {"scalar_multiply": X25519(backend=backend), "sign": Ed25519(backend=backend)}
+        # The workers run the NumPy ladder on chunks that are large enough
+        self._min_x25519_chunk = (
+            VECTORIZED_MIN_BATCH if HAVE_NUMPY and self._local["scalar_multiply"].backend == 'python' else MIN_CHUNK_SIZE
+        )
+        # Current chunk size per kind of job
+        self.chunk_sizes = {"scalar_multiply": chunk_size or MIN_CHUNK_SIZE, "sign": chunk_size or MIN_CHUNK_SIZE}
+
+        base_point_table()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        gc.collect()
+        gc.freeze()
+        try:
+            self._executor = ProcessPoolExecutor(
+                processes, mp_context=context, initializer=_init_worker, initargs=(backend, context.Barrier(processes))
+            )
+            # Start every worker now rather than on the first job
+            self.pids = sorted({future.result() for future in [self._executor.submit(_ready) for _ in range(processes)]})
+        finally:
+            gc.unfreeze()
+
+    def scalar_multiply_many(self, pairs: Iterable[tuple[bytes, bytes]]) -> Iterator[bytes]:
+        """X25519 of each (private_key, public_key) pair, yielded in order."""
+        return self._map("scalar_multiply", _scalar_multiply_chunk, pairs, self._min_x25519_chunk)
+
+    def sign_many(self, requests: Iterable[tuple[bytes, bytes]]) -> Iterator[bytes]:
+        """The 64-byte signature of each (private_key, message) pair, yielded in order."""
+        return self._map("sign", _sign_chunk, requests, MIN_CHUNK_SIZE)
+
+    def _map(self, job: str, function: Callable, items: Iterable, min_chunk: int) -> Iterator:
+        items = iter(items)
+        # A job too small to pay for the round trip to the workers runs here
+        head = list(itertools.islice(items, SHARD_MIN_ITEMS))
+        if len(head) < SHARD_MIN_ITEMS:
+            if head:
+                yield from function(head, self._local[job])[1]
+            return
+        items = itertools.chain(head, items)
+        pending = deque()
+        while True:
+            while len(pending) < 2 * self.processes:
+                chunk = list(itertools.islice(items, max(min_chunk, self.chunk_sizes[job])))
+                if not chunk:
+                    break
+                pending.append((len(chunk), self._executor.submit(function, chunk)))
+            if not pending:
+                return
+            size, future = pending.popleft()
+            elapsed, results = future.result()
+            if self.adaptive:
+                self._adapt(job, size, elapsed)
+            yield from results
+
+    def _adapt(self, job: str, size: int, elapsed: float) -> None:
+        current = self.chunk_sizes[job]
+        wanted = int(TARGET_CHUNK_SECONDS * size / elapsed) if elapsed > 0 else MAX_CHUNK_SIZE
+        # Move at most a factor of 2 per chunk, so one slow chunk does not swing it
+        self.chunk_sizes[job] = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, 2 * current, max(current // 2, wanted)))
+
+    def close(self) -> None:
+        """Stop the workers (after the chunks in flight)."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "CryptoWorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,2 +1,4 @@
 #!/bin/bash
+# Keep the tests away from the user's tuning profile
+export P79_TUNING=""
 python3 -m unittest discover -v -s tests
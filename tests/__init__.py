@@ -0,0 +1,6 @@
+# Keep test runs away from the user's settings: a saved tuning profile does not change
+# the thresholds under test. This runs before any test module imports the packages;
+# run_tests.sh sets the same variable.
+import os
+
+os.environ["P79_TUNING"] = ""
@@ -0,0 +1,11 @@
+# Fixtures shared by the test modules
+import os
+
+
+def signed_batch(ed25519, size: int, message_size: int = 16) -> list[tuple[bytes, bytes, bytes]]:
+    """`size` (public_key, message, signature) entries from distinct signers, each message random."""
+    batch = []
+    for private_key, public_key in ed25519.generate_keypairs(size):
+        message = os.urandom(message_size)
+        batch.append((public_key, message, ed25519.sign(private_key, message)))
+    return batch
@@ -0,0 +1,99 @@
+import unittest
+import os
+from unittest import mock
+from ed25519.ed25519 import Ed25519
+from ed25519.backends import registry as ed25519_registry
+from x25519.x25519 import X25519
+from x25519.backends import BackendRegistry, BACKEND_ENV_VAR, registry as x25519_registry
+
+HAVE_SODIUM = "libsodium" in ed25519_registry.available()
+
+
+class FakeBackend:
+    name = "fake"
+
+
+class TestBackendRegistry(unittest.TestCase):
+    def test_python_and_default(self):
+        registry = BackendRegistry(lambda backend: None)
+        registry.register("fake", FakeBackend)
+        self.assertIsNone(registry.resolve("python"))
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(registry.resolve())
+        with mock.patch.dict(os.environ, {BACKEND_ENV_VAR: "fake"}):
+            self.assertIsInstance(registry.resolve(), FakeBackend)
+
+    def test_auto_falls_back_when_unavailable(self):
+        def missing():
+            raise ImportError("no such module")
+        registry = BackendRegistry(lambda backend: None)
+        registry.register("missing", missing)
+        self.assertIsNone(registry.resolve("auto"))
+        with self.assertRaises(RuntimeError):
+            registry.resolve("missing")
+
+    def test_failed_self_test_disables_backend(self):
+        def self_test(backend):
+            raise RuntimeError("mismatch")
+        registry = BackendRegistry(self_test)
+        registry.register("fake", FakeBackend)
+        with self.assertWarns(UserWarning):
+            self.assertIsNone(registry.resolve("auto"))
+        self.assertEqual(registry.available(), [])
+        with self.assertRaises(RuntimeError):
+            registry.resolve("fake")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            Ed25519(backend="gpu")
+        with self.assertRaises(ValueError):
+            X25519(backend="gpu")
+
+
+@unittest.skipUnless(HAVE_SODIUM, "libsodium (PyNaCl) is not available")
+class TestSodiumBackend(unittest.TestCase):
+    def test_ed25519_matches_python(self):
+        sodium = Ed25519(backend="libsodium")
+        python = Ed25519(backend="python")
+        self.assertEqual(sodium.backend, "libsodium")
+        self.assertEqual(python.backend, "python")
+
+        private_key = os.urandom(32)
+        message = os.urandom(100)
+        public_key = sodium.generate_public_key(private_key)
+        self.assertEqual(public_key, python.generate_public_key(private_key))
+        signature = sodium.sign(private_key, message)
+        self.assertEqual(signature, python.sign(private_key, message))
+        self.assertTrue(sodium.verify(public_key, message, signature))
+        self.assertFalse(sodium.verify(public_key, message + b"!", signature))
+        self.assertTrue(sodium.verify_batch([(public_key, message, signature)] * 3))
+
+    def test_x25519_matches_python(self):
+        sodium = X25519(backend="libsodium")
+        python = X25519(backend="python")
+        private_key = os.urandom(32)
+        peer_public_key = python.generate_public_key(os.urandom(32))
+        self.assertEqual(sodium.generate_public_key(private_key), python.generate_public_key(private_key))
+        self.assertEqual(
+            sodium.scalar_multiply(private_key, peer_public_key),
+            python.scalar_multiply(private_key, peer_public_key)
+        )
+
+    def test_x25519_low_order_point_falls_back(self):
+        # libsodium refuses low-order points; the result must match the Python engine.
+        sodium = X25519(backend="libsodium")
+        zero_point = b"\x00" * 32
+        self.assertEqual(sodium.scalar_multiply(os.urandom(32), zero_point), b"\x00" * 32)
+
+    def test_x25519_key_length_errors_match(self):
+        for backend in ("libsodium", "python"):
+            with self.assertRaises(ValueError):
+                X25519(backend=backend).generate_public_key(b"\x01" * 31)
+
+    def test_auto_selects_sodium(self):
+        self.assertEqual(Ed25519(backend="auto").backend, "libsodium")
+        self.assertIn("libsodium", x25519_registry.available())
+
+
+if __name__ == "__main__":
+    unittest.main()
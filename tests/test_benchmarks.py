@@ -0,0 +1,76 @@
+import unittest
+import itertools
+from benchmarks import allocations, runner
+import benchmarks.suites  # noqa: F401  (registers the benchmarks)
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    def test_statistics(self):
+        samples = [float(i) for i in range(1, 101)]
+        self.assertEqual(runner.percentile(samples, 50), 50.0)
+        self.assertEqual(runner.percentile(samples, 99), 99.0)
+        self.assertEqual(runner.percentile([3.0], 99), 3.0)
+        summary = runner.summarize(samples, items=10)
+        self.assertEqual(summary["median"], 50.0)
+        self.assertEqual(summary["median_per_item"], 5.0)
+        self.assertEqual((summary["min"], summary["max"], summary["repeats"]), (1.0, 100.0, 100))
+
+    def test_measure_calibrates_calls_per_sample(self):
+        # A fake clock that advances 1 ms per call of the measured function.
+        ticks = itertools.count()
+        now = [0.0]
+        def function():
+            next(ticks)
+            now[0] += 0.001
+        samples = runner.measure(function, warmup=1, repeats=3, min_sample_time=0.008, clock=lambda: now[0])
+        self.assertEqual(len(samples), 3)
+        for sample in samples:
+            self.assertAlmostEqual(sample, 0.001)
+        # 1 warm-up call, calibration with 1, 2, 4, 8 calls, then 2 more samples of 8.
+        self.assertEqual(next(ticks), 1 + 15 + 16)
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}, "c": {"median": 1.0}}}
+        current = {"results": {"a": {"median": 1.05}, "b": {"median": 1.5}, "c": {"median": 0.5}, "new": {"median": 1.0}}}
+        rows = {row["name"]: row for row in runner.compare(baseline, current, threshold=0.10)}
+        self.assertEqual(set(rows), {"a", "b", "c"})
+        self.assertEqual(rows["a"]["status"], "unchanged")
+        self.assertEqual(rows["b"]["status"], "regression")
+        self.assertEqual(rows["c"]["status"], "improvement")
+        self.assertAlmostEqual(rows["b"]["ratio"], 1.5)
+
+
+class TestAllocationProfiling(unittest.TestCase):
+    def test_profile_measures_peak_and_retained(self):
+        kept = []
+        def transient():
+            bytearray(100_000)
+        def leaking():
+            kept.append(bytearray(10_000))
+        result = allocations.profile(transient, items=10, warmup=1, repeats=3)
+        self.assertGreaterEqual(result["peak"], 100_000)
+        self.assertEqual(result["peak_per_item"], result["peak"] / 10)
+        self.assertLess(result["retained"], allocations.RETAINED_TOLERANCE)
+        self.assertGreaterEqual(allocations.profile(leaking, repeats=3)["retained"], 10_000)
+
+    def test_budgets(self):
+        report = {"results": {
+            "a": {"peak_per_item": 900.0, "retained": 0.0},
+            "b": {"peak_per_item": 1100.0, "retained": 0.0},
+            "c": {"peak_per_item": 100.0, "retained": 4096.0},
+            "unbudgeted": {"peak_per_item": 1e9, "retained": 1e9},
+        }}
+        budgets = {"a": 1000, "b": 1000, "c": 1000}
+        statuses = {row["name"]: row["status"] for row in allocations.check_budgets(report, budgets)}
+        self.assertEqual(statuses, {"a": "ok", "b": "over budget", "c": "leak"})
+        with self.assertRaisesRegex(allocations.AllocationBudgetExceeded, "b: over budget.*c: leak"):
+            allocations.enforce_budgets(report, budgets)
+        allocations.enforce_budgets({"results": {"a": report["results"]["a"]}}, budgets)
+
+    def test_hot_paths_within_budgets(self):
+        report = allocations.run(["ed25519.sign", "ed25519.verify", "x25519.ladder"], warmup=1, repeats=2)
+        allocations.enforce_budgets(report)
+
+
+if __name__ == "__main__":
+    unittest.main()
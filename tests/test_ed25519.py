@@ -1,13 +1,19 @@
 import unittest
 import os
-import time
+from array import array
 from ed25519.utils import (
     edwards_scalar_mult,
+    affine_to_extended,
     encode_edwards_point,
     decode_edwards_point,
-    normalize_extended
+    normalize_extended,
+    reduce_scalar_basis,
+    edwards_points_equal,
+    edwards_mul_by_cofactor,
+    is_identity
 )
 from ed25519.ed25519 import Ed25519
+from ed25519.cache import VerificationCache
 
 # The prime modulus (same as for Curve25519)
 P = 2**255 - 19
@@ -21,6 +27,45 @@ B = (
     46316835694926478169428394003475163141307993866256225615783033603165251855960,
 )
 
+# Test vectors from RFC 8032, Section 7.1
+RFC_8032_VECTORS = [
+    {
+        "name": "Vector 1",
+        "private_key": "9d61b19deffd5a60ba844af492ec2cc44449c5697b326919703bac031cae7f60",
+        "public_key": "d75a980182b10ab7d54bfed3c964073a0ee172f3daa62325af021a68f707511a",
+        "message": "",
+        "signature": "e5564300c360ac729086e2cc806e828a84877f1eb8e5d974d873e065224901555fb8821590a33bacc61e39701cf9b46bd25bf5f0595bbe24655141438e7a100b",
+    },
+    {
+        "name": "Vector 2",
+        "private_key": "4ccd089b28ff96da9db6c346ec114e0f5b8a319f35aba624da8cf6ed4fb8a6fb",
+        "public_key": "3d4017c3e843895a92b70aa74d1b7ebc9c982ccf2ec4968cc0cd55f12af4660c",
+        "message": "72",
+        "signature": "92a009a9f0d4cab8720e820b5f642540a2b27b5416503f8fb3762223ebdb69da085ac1e43e15996e458f3613d0f11d8c387b2eaeb4302aeeb00d291612bb0c00",
+    },
+    {
+        "name": "Vector 3",
+        "private_key": "c5aa8df43f9f837bedb7442f31dcb7b166d38535076f094b85ce3a2e0b4458f7",
+        "public_key": "fc51cd8e6218a1a38da47ed00230f0580816ed13ba3303ac5deb911548908025",
+        "message": "af82",
+        "signature": "6291d657deec24024827e69c3abe01a30ce548a284743a445e3680d7db5ac3ac18ff9b538d16f290ae67f760984dc6594a7c15e9716ed28dc027beceea1ec40a",
+    },
+    {
+        "name": "Vector 1024",
+        "private_key": "f5e5767cf153319517630f226876b86c8160cc583bc013744c6bf255f5cc0ee5",
+        "public_key": "278117fc144c72340f67d0f2316e8386ceffbf2b2428c9c51fef7c597f1d426e",
+        "message": "08b8b2b733424243760fe426a4b54908632110a66c2f6591eabd3345e3e4eb98fa6e264bf09efe12ee50f8f54e9f77b1e355f6c50544e23fb1433ddf73be84d879de7c0046dc4996d9e773f4bc9efe5738829adb26c81b37c93a1b270b20329d658675fc6ea534e0810a4432826bf58c941efb65d57a338bbd2e26640f89ffbc1a858efcb8550ee3a5e1998bd177e93a7363c344fe6b199ee5d02e82d522c4feba15452f80288a821a579116ec6dad2b3b310da903401aa62100ab5d1a36553e06203b33890cc9b832f79ef80560ccb9a39ce767967ed628c6ad573cb116dbefefd75499da96bd68a8a97b928a8bbc103b6621fcde2beca1231d206be6cd9ec7aff6f6c94fcd7204ed3455c68c83f4a41da4af2b74ef5c53f1d8ac70bdcb7ed185ce81bd84359d44254d95629e9855a94a7c1958d1f8ada5d0532ed8a5aa3fb2d17ba70eb6248e594e1a2297acbbb39d502f1a8c6eb6f1ce22b3de1a1f40cc24554119a831a9aad6079cad88425de6bde1a9187ebb6092cf67bf2b13fd65f27088d78b7e883c8759d2c4f5c65adb7553878ad575f9fad878e80a0c9ba63bcbcc2732e69485bbc9c90bfbd62481d9089beccf80cfe2df16a2cf65bd92dd597b0707e0917af48bbb75fed413d238f5555a7a569d80c3414a8d0859dc65a46128bab27af87a71314f318c782b23ebfe808b82b0ce26401d2e22f04d83d1255dc51addd3b75a2b1ae0784504df543af8969be3ea7082ff7fc9888c144da2af58429ec96031dbcad3dad9af0dcbaaaf268cb8fcffead94f3c7ca495e056a9b47acdb751fb73e666c6c655ade8297297d07ad1ba5e43f1bca32301651339e22904cc8c42f58c30c04aafdb038dda0847dd988dcda6f3bfd15c4b4c4525004aa06eeff8ca61783aacec57fb3d1f92b0fe2fd1a85f6724517b65e614ad6808d6f6ee34dff7310fdc82aebfd904b01e1dc54b2927094b2db68d6f903b68401adebf5a7e08d78ff4ef5d63653a65040cf9bfd4aca7984a74d37145986780fc0b16ac451649de6188a7dbdf191f64b5fc5e2ab47b57f7f7276cd419c17a3ca8e1b939ae49e488acba6b965610b5480109c8b17b80e1b7b750dfc7598d5d5011fd2dcc5600a32ef5b52a1ecc820e308aa342721aac0943bf6686b64b2579376504ccc493d97e6aed3fb0f9cd71a43dd497f01f17c0e2cb3797aa2a2f256656168e6c496afc5fb93246f6b1116398a346f1a641f3b041e989f7914f90cc2c7fff357876e506b50d334ba77c225bc307ba537152f3f1610e4eafe595f6d9d90d11faa933a15ef1369546868a7f3a45a96768d40fd9d03412c091c6315cf4fde7cb68606937380db2eaaa707b4c4185c32eddcdd306705e4dc1ffc872eeee475a64dfac86aba41c0618983f8741c5ef68d3a101e8a3b8cac60c905c15fc910840b94c00a0b9d0",
+        "signature": "0aab4c900501b3e24d7cdf4663326a3a87df5e4843b2cbdb67cbf6e460fec350aa5371b1508f9f4528ecea23c436d94b5e8fcd4f681e30a6ac00a9704a188a03",
+    },
+    {
+        "name": "Vector SHA(abc)",
+        "private_key": "833fe62409237b9d62ec77587520911e9a759cec1d19755b7da901b96dca3d42",
+        "public_key": "ec172b93ad5e563bf4932c70e1245034c35467ef2efd4d64ebf819683467e2bf",
+        "message": "ddaf35a193617abacc417349ae20413112e6fa4e89a97ea20a9eeee64b55d39a2192992a274fc1a836ba3c23a3feebbd454d4423643ce80e2a9ac94fa54ca49f",
+        "signature": "dc2a4459e7369633a52b1bf277839a00201009a3efbf3ecb69bea2186c26b58909351fc9ac90b3ecfdfbc7c66431e0303dca179c138ac17ad9bef1177331a704",
+    },
+]
+
 class TestEd25519(unittest.TestCase):
     def setUp(self):
         """Set up the Ed25519 instance for testing."""
@@ -37,6 +82,17 @@ class TestEd25519(unittest.TestCase):
         public_key = self.ed25519.generate_public_key(private_key)
         self.assertEqual(len(public_key), 32)
 
+    def test_generate_keypairs(self):
+        keypairs = list(self.ed25519.generate_keypairs(7, chunk_size=3))
+        self.assertEqual(len(keypairs), 7)
+        self.assertEqual(len({private_key for private_key, _ in keypairs}), 7)
+        for private_key, public_key in keypairs:
+            self.assertEqual(len(private_key), 32)
+            self.assertEqual(public_key, self.ed25519.generate_public_key(private_key))
+        self.assertEqual(list(self.ed25519.generate_keypairs(0)), [])
+        with self.assertRaises(ValueError):
+            self.ed25519.generate_keypairs(-1)
+
     def test_sign_and_verify(self):
         """Test if a message can be signed and verified successfully."""
         private_key = self.ed25519.generate_private_key()
@@ -46,6 +102,23 @@ class TestEd25519(unittest.TestCase):
         signature = self.ed25519.sign(private_key, message)
         self.assertTrue(self.ed25519.verify(public_key, message, signature))
 
+    def test_sign_into(self):
+        keys = [self.ed25519.generate_private_key() for _ in range(2)]
+        entries = [(keys[i % 2], os.urandom(i)) for i in range(5)]
+        out = bytearray(4 + 64 * len(entries))
+        self.assertEqual(self.ed25519.sign_many_into(entries, out, 4), len(out))
+        for i, (private_key, message) in enumerate(entries):
+            self.assertEqual(out[4 + 64 * i:4 + 64 * (i + 1)], self.ed25519.sign(private_key, message))
+
+        view = memoryview(bytearray(64))
+        self.assertEqual(self.ed25519.sign_into(*entries[0], view), 64)
+        self.assertEqual(view.tobytes(), out[4:68])
+
+        with self.assertRaises(ValueError):
+            self.ed25519.sign_into(*entries[0], bytearray(63))
+        with self.assertRaises(ValueError):
+            self.ed25519.sign_into(*entries[0], bytes(64))
+
     def test_invalid_signature(self):
         """Test if an invalid signature fails verification."""
         private_key = self.ed25519.generate_private_key()
@@ -90,45 +163,7 @@ class TestEd25519(unittest.TestCase):
 
 
     def test_rfc_8032_vectors(self):
-        test_vectors = [
-            {
-                "name": "Vector 1",
-                "private_key": "9d61b19deffd5a60ba844af492ec2cc44449c5697b326919703bac031cae7f60",
-                "public_key": "d75a980182b10ab7d54bfed3c964073a0ee172f3daa62325af021a68f707511a",
-                "message": "",
-                "signature": "e5564300c360ac729086e2cc806e828a84877f1eb8e5d974d873e065224901555fb8821590a33bacc61e39701cf9b46bd25bf5f0595bbe24655141438e7a100b",
-            },
-            {
-                "name": "Vector 2",
-                "private_key": "4ccd089b28ff96da9db6c346ec114e0f5b8a319f35aba624da8cf6ed4fb8a6fb",
-                "public_key": "3d4017c3e843895a92b70aa74d1b7ebc9c982ccf2ec4968cc0cd55f12af4660c",
-                "message": "72",
-                "signature": "92a009a9f0d4cab8720e820b5f642540a2b27b5416503f8fb3762223ebdb69da085ac1e43e15996e458f3613d0f11d8c387b2eaeb4302aeeb00d291612bb0c00",
-            },
-            {
-                "name": "Vector 3",
-                "private_key": "c5aa8df43f9f837bedb7442f31dcb7b166d38535076f094b85ce3a2e0b4458f7",
-                "public_key": "fc51cd8e6218a1a38da47ed00230f0580816ed13ba3303ac5deb911548908025",
-                "message": "af82",
-                "signature": "6291d657deec24024827e69c3abe01a30ce548a284743a445e3680d7db5ac3ac18ff9b538d16f290ae67f760984dc6594a7c15e9716ed28dc027beceea1ec40a",
-            },
-            {
-                "name": "Vector 1024",
-                "private_key": "f5e5767cf153319517630f226876b86c8160cc583bc013744c6bf255f5cc0ee5",
-                "public_key": "278117fc144c72340f67d0f2316e8386ceffbf2b2428c9c51fef7c597f1d426e",
-                "message": "08b8b2b733424243760fe426a4b54908632110a66c2f6591eabd3345e3e4eb98fa6e264bf09efe12ee50f8f54e9f77b1e355f6c50544e23fb1433ddf73be84d879de7c0046dc4996d9e773f4bc9efe5738829adb26c81b37c93a1b270b20329d658675fc6ea534e0810a4432826bf58c941efb65d57a338bbd2e26640f89ffbc1a858efcb8550ee3a5e1998bd177e93a7363c344fe6b199ee5d02e82d522c4feba15452f80288a821a579116ec6dad2b3b310da903401aa62100ab5d1a36553e06203b33890cc9b832f79ef80560ccb9a39ce767967ed628c6ad573cb116dbefefd75499da96bd68a8a97b928a8bbc103b6621fcde2beca1231d206be6cd9ec7aff6f6c94fcd7204ed3455c68c83f4a41da4af2b74ef5c53f1d8ac70bdcb7ed185ce81bd84359d44254d95629e9855a94a7c1958d1f8ada5d0532ed8a5aa3fb2d17ba70eb6248e594e1a2297acbbb39d502f1a8c6eb6f1ce22b3de1a1f40cc24554119a831a9aad6079cad88425de6bde1a9187ebb6092cf67bf2b13fd65f27088d78b7e883c8759d2c4f5c65adb7553878ad575f9fad878e80a0c9ba63bcbcc2732e69485bbc9c90bfbd62481d9089beccf80cfe2df16a2cf65bd92dd597b0707e0917af48bbb75fed413d238f5555a7a569d80c3414a8d0859dc65a46128bab27af87a71314f318c782b23ebfe808b82b0ce26401d2e22f04d83d1255dc51addd3b75a2b1ae0784504df543af8969be3ea7082ff7fc9888c144da2af58429ec96031dbcad3dad9af0dcbaaaf268cb8fcffead94f3c7ca495e056a9b47acdb751fb73e666c6c655ade8297297d07ad1ba5e43f1bca32301651339e22904cc8c42f58c30c04aafdb038dda0847dd988dcda6f3bfd15c4b4c4525004aa06eeff8ca61783aacec57fb3d1f92b0fe2fd1a85f6724517b65e614ad6808d6f6ee34dff7310fdc82aebfd904b01e1dc54b2927094b2db68d6f903b68401adebf5a7e08d78ff4ef5d63653a65040cf9bfd4aca7984a74d37145986780fc0b16ac451649de6188a7dbdf191f64b5fc5e2ab47b57f7f7276cd419c17a3ca8e1b939ae49e488acba6b965610b5480109c8b17b80e1b7b750dfc7598d5d5011fd2dcc5600a32ef5b52a1ecc820e308aa342721aac0943bf6686b64b2579376504ccc493d97e6aed3fb0f9cd71a43dd497f01f17c0e2cb3797aa2a2f256656168e6c496afc5fb93246f6b1116398a346f1a641f3b041e989f7914f90cc2c7fff357876e506b50d334ba77c225bc307ba537152f3f1610e4eafe595f6d9d90d11faa933a15ef1369546868a7f3a45a96768d40fd9d03412c091c6315cf4fde7cb68606937380db2eaaa707b4c4185c32eddcdd306705e4dc1ffc872eeee475a64dfac86aba41c0618983f8741c5ef68d3a101e8a3b8cac60c905c15fc910840b94c00a0b9d0",
-                "signature": "0aab4c900501b3e24d7cdf4663326a3a87df5e4843b2cbdb67cbf6e460fec350aa5371b1508f9f4528ecea23c436d94b5e8fcd4f681e30a6ac00a9704a188a03",
-            },
-            {
-                "name": "Vector SHA(abc)",
-                "private_key": "833fe62409237b9d62ec77587520911e9a759cec1d19755b7da901b96dca3d42",
-                "public_key": "ec172b93ad5e563bf4932c70e1245034c35467ef2efd4d64ebf819683467e2bf",
-                "message": "ddaf35a193617abacc417349ae20413112e6fa4e89a97ea20a9eeee64b55d39a2192992a274fc1a836ba3c23a3feebbd454d4423643ce80e2a9ac94fa54ca49f",
-                "signature": "dc2a4459e7369633a52b1bf277839a00201009a3efbf3ecb69bea2186c26b58909351fc9ac90b3ecfdfbc7c66431e0303dca179c138ac17ad9bef1177331a704",
-            },
-        ]
-
-        for vector in test_vectors:
+        for vector in RFC_8032_VECTORS:
             self.run_vector(
                 vector["name"],
                 vector["private_key"],
@@ -137,6 +172,46 @@ class TestEd25519(unittest.TestCase):
                 vector["signature"]
             )
 
+    def test_rfc_8032_vectors_lattice(self):
+        ed25519 = Ed25519(verify_method="lattice")
+        for vector in RFC_8032_VECTORS:
+            public_key = bytes.fromhex(vector["public_key"])
+            message = bytes.fromhex(vector["message"])
+            signature = bytes.fromhex(vector["signature"])
+            self.assertTrue(
+                ed25519.verify(public_key, message, signature),
+                f"Lattice verification failed for {vector['name']}"
+            )
+            tampered_message = message + b"\x00"
+            self.assertFalse(ed25519.verify(public_key, tampered_message, signature))
+
+    def test_lattice_agrees_with_standard(self):
+        lattice = Ed25519(verify_method="lattice")
+        for _ in range(20):
+            private_key = self.ed25519.generate_private_key()
+            public_key = self.ed25519.generate_public_key(private_key)
+            message = os.urandom(32)
+            signature = self.ed25519.sign(private_key, message)
+            forged = signature[:32] + os.urandom(31) + b"\x00"
+            for sig in (signature, forged):
+                self.assertEqual(
+                    lattice.verify(public_key, message, sig),
+                    self.ed25519.verify(public_key, message, sig)
+                )
+
+    def test_reduce_scalar_basis(self):
+        for _ in range(50):
+            k = int.from_bytes(os.urandom(64), "little") % L
+            c0, c1 = reduce_scalar_basis(k)
+            self.assertNotEqual(c1, 0)
+            self.assertEqual((c0 - c1 * k) % L, 0)
+            self.assertLessEqual(abs(c0).bit_length(), 128)
+            self.assertLessEqual(abs(c1).bit_length(), 128)
+
+    def test_invalid_verify_method(self):
+        with self.assertRaises(ValueError):
+            Ed25519(verify_method="fast")
+
     def test_tampered_message(self):
         private_key = self.ed25519.generate_private_key()
         public_key = self.ed25519.generate_public_key(private_key)
@@ -172,6 +247,19 @@ class TestEd25519(unittest.TestCase):
 
         self.assertEqual(normalized[2], 1) # Z-coordinate should be 1
         
+    def test_projective_comparisons(self):
+        point = edwards_scalar_mult(12345, affine_to_extended(B))
+        # The same point with a different Z.
+        X, Y, Z, T = point
+        scaled = (X * 7 % P, Y * 7 % P, Z * 7 % P, T * 7 % P)
+        self.assertTrue(edwards_points_equal(point, scaled))
+        self.assertFalse(edwards_points_equal(point, edwards_scalar_mult(12346, affine_to_extended(B))))
+
+        self.assertTrue(is_identity((0, 5, 5, 0)))
+        self.assertFalse(is_identity(point))
+        self.assertTrue(is_identity(edwards_scalar_mult(L, affine_to_extended(B))))
+        self.assertTrue(edwards_points_equal(edwards_mul_by_cofactor(point), edwards_scalar_mult(8, point)))
+
     def test_invalid_input_lengths(self):
         private_key = self.ed25519.generate_private_key()
         public_key = self.ed25519.generate_public_key(private_key)
@@ -251,106 +339,55 @@ class TestEd25519(unittest.TestCase):
         batch[0] = (pk, m, bytes(tampered_sig))
         self.assertFalse(self.ed25519.verify_batch(batch))
 
-    def test_verification_performance(self):
-        batch = []
-        number_of_signatures = 1000
-        for _ in range(number_of_signatures):
+    def test_batch_verification_shared_signers(self):
+        # Few signers, many signatures each, so the per-key coefficients are aggregated.
+        keys = []
+        for _ in range(3):
             private_key = self.ed25519.generate_private_key()
-            public_key = self.ed25519.generate_public_key(private_key)
+            keys.append((private_key, self.ed25519.generate_public_key(private_key)))
+        batch = []
+        for i in range(30):
+            private_key, public_key = keys[i % len(keys)]
             message = os.urandom(32)
-            signature = self.ed25519.sign(private_key, message)
-            batch.append((public_key, message, signature))
-        
-        # Measure performance of individual verifications.
-        start_individual = time.perf_counter()
-        for public_key, message, signature in batch:
-            self.assertTrue(self.ed25519.verify(public_key, message, signature))
-        individual_time = time.perf_counter() - start_individual
-
-        # Measure performance of batch verification.
-        start_batch = time.perf_counter()
+            batch.append((public_key, message, self.ed25519.sign(private_key, message)))
         self.assertTrue(self.ed25519.verify_batch(batch))
-        batch_time = time.perf_counter() - start_batch
-
-        print(f"Individual verification time for {number_of_signatures} signatures: {individual_time:.6f} seconds")
-        print(f"Batch verification time for {number_of_signatures} signatures: {batch_time:.6f} seconds")
-
-    def test_signing_verification_performance_comparison(self):
-        """
-        Compare performance of our Ed25519 signing and verifying with PyNaCl's implementation.
-        The test runs multiple iterations, prints the average times, and reports the speedup factors.
-        """
-        import time
-        from nacl.signing import SigningKey as PyNaClSigningKey
-        
-        iterations = 1000
-        message = b"Performance test message for signing and verifying" * 10
 
-        # Set up our implementation keys.
-        private_key = self.ed25519.generate_private_key()
-        public_key = self.ed25519.generate_public_key(private_key)
-        our_total_sign_time = 0.0
-        our_total_verify_time = 0.0
-
-        # Set up PyNaCl keys.
-        seed = os.urandom(32)
-        pynacl_signing_key = PyNaClSigningKey(seed)
-        pynacl_verify_key = pynacl_signing_key.verify_key
-        pynacl_total_sign_time = 0.0
-        pynacl_total_verify_time = 0.0
-
-        for _ in range(iterations):
-            # Time our signing.
-            start = time.perf_counter()
-            our_signature = self.ed25519.sign(private_key, message)
-            our_total_sign_time += time.perf_counter() - start
-
-            # Time PyNaCl signing.
-            start = time.perf_counter()
-            pynacl_signature = pynacl_signing_key.sign(message).signature
-            pynacl_total_sign_time += time.perf_counter() - start
-
-            # Time our verification.
-            start = time.perf_counter()
-            valid_our = self.ed25519.verify(public_key, message, our_signature)
-            our_total_verify_time += time.perf_counter() - start
-            self.assertTrue(valid_our)
-
-            # Time PyNaCl verification.
-            start = time.perf_counter()
-            try:
-                pynacl_verify_key.verify(message, pynacl_signature)
-                valid_pynacl = True
-            except Exception:
-                valid_pynacl = False
-            pynacl_total_verify_time += time.perf_counter() - start
-            self.assertTrue(valid_pynacl)
-
-        avg_our_sign_time = our_total_sign_time / iterations
-        avg_pynacl_sign_time = pynacl_total_sign_time / iterations
-        avg_our_verify_time = our_total_verify_time / iterations
-        avg_pynacl_verify_time = pynacl_total_verify_time / iterations
-
-        print(f"Our signing average: {avg_our_sign_time:.6f} s")
-        print(f"PyNaCl signing average: {avg_pynacl_sign_time:.6f} s")
-        print(f"Our verification average: {avg_our_verify_time:.6f} s")
-        print(f"PyNaCl verification average: {avg_pynacl_verify_time:.6f} s")
-
-        # Compute and print speedup factors for signing.
-        if avg_our_sign_time < avg_pynacl_sign_time:
-            sign_speedup = avg_pynacl_sign_time / avg_our_sign_time
-            print(f"Our signing implementation is {sign_speedup:.2f} times faster than PyNaCl's.")
-        else:
-            sign_speedup = avg_our_sign_time / avg_pynacl_sign_time
-            print(f"PyNaCl's signing implementation is {sign_speedup:.2f} times faster than ours.")
-
-        # Compute and print speedup factors for verifying.
-        if avg_our_verify_time < avg_pynacl_verify_time:
-            verify_speedup = avg_pynacl_verify_time / avg_our_verify_time
-            print(f"Our verification implementation is {verify_speedup:.2f} times faster than PyNaCl's.")
-        else:
-            verify_speedup = avg_our_verify_time / avg_pynacl_verify_time
-            print(f"PyNaCl's verification implementation is {verify_speedup:.2f} times faster than ours.")
+        # A valid signature attributed to the wrong (but known) signer must fail.
+        pk, m, sig = batch[4]
+        batch[4] = (keys[0][1], m, sig)
+        self.assertFalse(self.ed25519.verify_batch(batch))
+
+    def test_batch_verification_columnar(self):
+        # Pack a batch the way a block stores it: signature and key columns, and the
+        # messages as offsets into one buffer (including an empty message).
+        signatures, public_keys, data = bytearray(), bytearray(), bytearray()
+        offsets = array("Q", [0])
+        for size in (10, 0, 300, 7):
+            private_key = self.ed25519.generate_private_key()
+            message = os.urandom(size)
+            public_keys += self.ed25519.generate_public_key(private_key)
+            signatures += self.ed25519.sign(private_key, message)
+            data += message
+            offsets.append(len(data))
+        self.assertTrue(self.ed25519.verify_batch_columnar(signatures, public_keys, offsets, data))
+        self.assertTrue(self.ed25519.verify_batch_columnar(signatures[:64], public_keys[:32], offsets[:2], data))
+        self.assertTrue(self.ed25519.verify_batch_columnar(b"", b"", [0], b""))
+
+        cached = Ed25519(cache=VerificationCache())
+        for _ in range(2):
+            self.assertTrue(cached.verify_batch_columnar(signatures, public_keys, offsets, data))
+        self.assertEqual(len(cached.cache), 4)
+
+        tampered = bytearray(data)
+        tampered[-1] ^= 1
+        self.assertFalse(self.ed25519.verify_batch_columnar(signatures, public_keys, offsets, tampered))
+
+        with self.assertRaises(ValueError):
+            self.ed25519.verify_batch_columnar(signatures[:-1], public_keys, offsets, data)
+        with self.assertRaises(ValueError):
+            self.ed25519.verify_batch_columnar(signatures, public_keys, offsets[:-1], data)
+        with self.assertRaises(ValueError):
+            self.ed25519.verify_batch_columnar(signatures, public_keys, offsets, data[:-1])
 
 if __name__ == "__main__":
     unittest.main()
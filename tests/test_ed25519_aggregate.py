@@ -0,0 +1,79 @@
+import unittest
+from ed25519.ed25519 import Ed25519, L
+from ed25519.utils import aggregation_coefficients
+from x25519.utils import HAVE_NUMPY
+from x25519.metrics import Metrics
+from tests.helpers import signed_batch
+
+
+class TestHalfAggregation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ed25519 = Ed25519()
+        cls.batch = signed_batch(cls.ed25519, 8)
+        cls.entries = [(public_key, message) for public_key, message, _ in cls.batch]
+        cls.aggregate = cls.ed25519.aggregate(cls.batch)
+
+    def test_layout(self):
+        self.assertEqual(len(self.aggregate), 32 * len(self.batch) + 32)
+        for i, (_, _, signature) in enumerate(self.batch):
+            self.assertEqual(self.aggregate[32 * i:32 * i + 32], signature[:32])
+        self.assertEqual(self.ed25519.aggregate(self.batch), self.aggregate)
+
+    def test_verify_aggregate(self):
+        self.assertTrue(self.ed25519.verify_aggregate(self.entries, self.aggregate))
+        self.assertTrue(self.ed25519.verify_aggregate(self.entries, self.aggregate, vectorized=False))
+        if HAVE_NUMPY:
+            self.assertTrue(self.ed25519.verify_aggregate(self.entries, self.aggregate, vectorized=True))
+        # One signature, the same signer twice, and no signatures at all
+        self.assertTrue(self.ed25519.verify_aggregate(self.entries[:1], self.ed25519.aggregate(self.batch[:1])))
+        twice = self.batch[:2] + self.batch[:1]
+        self.assertTrue(self.ed25519.verify_aggregate([entry[:2] for entry in twice], self.ed25519.aggregate(twice)))
+        self.assertTrue(self.ed25519.verify_aggregate([], self.ed25519.aggregate([])))
+
+    def test_rejects_tampering(self):
+        public_key, message = self.entries[3]
+        forged = self.entries[:3] + [(public_key, message + b"!")] + self.entries[4:]
+        self.assertFalse(self.ed25519.verify_aggregate(forged, self.aggregate))
+        # The coefficients depend on the order, so reordering fails
+        self.assertFalse(self.ed25519.verify_aggregate(self.entries[::-1], self.aggregate))
+        self.assertFalse(self.ed25519.verify_aggregate(self.entries[:-1], self.aggregate))
+        self.assertFalse(self.ed25519.verify_aggregate(self.entries, self.aggregate[:-1]))
+        s_agg = int.from_bytes(self.aggregate[-32:], "little")
+        for s in ((s_agg + 1) % L, s_agg + L):
+            if s < 2**256:
+                self.assertFalse(self.ed25519.verify_aggregate(self.entries, self.aggregate[:-32] + s.to_bytes(32, "little")))
+        undecodable = b"\xff" * 32
+        self.assertFalse(self.ed25519.verify_aggregate(self.entries, undecodable + self.aggregate[32:]))
+
+    def test_bad_signature_fails_the_aggregate(self):
+        public_key, message, signature = self.batch[5]
+        bad = bytearray(signature)
+        bad[40] ^= 1
+        batch = self.batch[:5] + [(public_key, message, bytes(bad))] + self.batch[6:]
+        self.assertFalse(self.ed25519.verify_aggregate(self.entries, self.ed25519.aggregate(batch)))
+
+    def test_malformed_signatures_are_rejected(self):
+        public_key, message, signature = self.batch[0]
+        with self.assertRaises(ValueError):
+            self.ed25519.aggregate([(public_key, message, signature[:63])])
+        non_canonical = signature[:32] + (int.from_bytes(signature[32:], "little") + L).to_bytes(32, "little")
+        with self.assertRaises(ValueError):
+            self.ed25519.aggregate([(public_key, message, non_canonical)])
+
+    def test_coefficients_bind_the_whole_batch(self):
+        entries = [(bytes([i]) * 32, bytes([i + 1]) * 32, i) for i in range(4)]
+        coefficients = aggregation_coefficients(entries)
+        self.assertEqual(len(set(coefficients)), 4)
+        self.assertNotEqual(aggregation_coefficients(entries[:3]), coefficients[:3])
+        self.assertNotEqual(aggregation_coefficients(entries[:3] + [(entries[3][0], entries[3][1], 5)])[0], coefficients[0])
+
+    def test_metrics(self):
+        metrics = Metrics()
+        ed25519 = Ed25519(metrics=metrics)
+        self.assertTrue(ed25519.verify_aggregate(self.entries, self.aggregate))
+        self.assertEqual(metrics.histogram("ed25519.verify_aggregate").count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
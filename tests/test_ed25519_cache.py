@@ -0,0 +1,83 @@
+import unittest
+import os
+from ed25519.ed25519 import Ed25519
+from ed25519.cache import VerificationCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestVerificationCache(unittest.TestCase):
+    def setUp(self):
+        self.ed25519 = Ed25519()
+        self.private_key = self.ed25519.generate_private_key()
+        self.public_key = self.ed25519.generate_public_key(self.private_key)
+
+    def signed(self, message):
+        return (self.public_key, message, self.ed25519.sign(self.private_key, message))
+
+    def test_lru_eviction(self):
+        cache = VerificationCache(max_size=2)
+        for key in (b"a", b"b", b"c"):
+            cache.add(key)
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(cache.contains(b"a"))
+        self.assertTrue(cache.contains(b"b"))
+        self.assertEqual(cache.evictions, 1)
+
+        # "b" was just used, so "c" is now the least recently used entry.
+        cache.add(b"d")
+        self.assertTrue(cache.contains(b"b"))
+        self.assertFalse(cache.contains(b"c"))
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = VerificationCache(max_size=10, ttl=5.0, clock=clock)
+        cache.add(b"a")
+        clock.now = 4.0
+        self.assertTrue(cache.contains(b"a"))
+        clock.now = 10.0
+        self.assertFalse(cache.contains(b"a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_verify_uses_cache(self):
+        cache = VerificationCache()
+        ed25519 = Ed25519(cache=cache)
+        entry = self.signed(b"gossip")
+        self.assertTrue(ed25519.verify(*entry))
+        self.assertTrue(ed25519.verify(*entry))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_rate, 0.5)
+
+    def test_negative_results_not_cached(self):
+        cache = VerificationCache()
+        ed25519 = Ed25519(cache=cache)
+        public_key, message, _ = self.signed(b"gossip")
+        bad_signature = os.urandom(64)
+        self.assertFalse(ed25519.verify(public_key, message, bad_signature))
+        self.assertFalse(ed25519.verify(public_key, message, bad_signature))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+
+    def test_verify_batch_uses_cache(self):
+        cache = VerificationCache()
+        ed25519 = Ed25519(cache=cache)
+        batch = [self.signed(os.urandom(16)) for _ in range(4)]
+        self.assertTrue(ed25519.verify_batch(batch))
+        self.assertEqual(len(cache), 4)
+
+        # Cached entries are skipped; the new invalid one still fails the batch.
+        pk, m, sig = self.signed(b"tampered")
+        batch.append((pk, m + b"!", sig))
+        self.assertFalse(ed25519.verify_batch(batch))
+        self.assertEqual(cache.hits, 4)
+        self.assertEqual(len(cache), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import os
+from nacl.bindings import crypto_sign_ed25519_pk_to_curve25519, crypto_sign_ed25519_sk_to_curve25519
+from ed25519.ed25519 import Ed25519
+from ed25519.identity import identity_keys, public_key_to_x25519, public_keys_to_x25519
+from x25519.x25519 import X25519
+
+
+class TestIdentityKeys(unittest.TestCase):
+    def setUp(self):
+        self.ed25519 = Ed25519()
+        self.x25519 = X25519()
+
+    def test_identity_keys(self):
+        for _ in range(5):
+            seed = os.urandom(32)
+            ed_public_key, x_private_key, x_public_key = identity_keys(seed)
+            self.assertEqual(ed_public_key, self.ed25519.generate_public_key(seed))
+            self.assertEqual(x_public_key, self.x25519.generate_public_key(x_private_key))
+            # Same derivation as libsodium's key conversion.
+            self.assertEqual(x_private_key, crypto_sign_ed25519_sk_to_curve25519(seed + ed_public_key))
+            self.assertEqual(x_public_key, crypto_sign_ed25519_pk_to_curve25519(ed_public_key))
+
+        # The derived X25519 keys agree on a shared secret.
+        _, alice_private, alice_public = identity_keys(os.urandom(32))
+        _, bob_private, bob_public = identity_keys(os.urandom(32))
+        self.assertEqual(
+            self.x25519.scalar_multiply(alice_private, bob_public),
+            self.x25519.scalar_multiply(bob_private, alice_public),
+        )
+
+    def test_public_keys_to_x25519(self):
+        public_keys = [public_key for _, public_key in self.ed25519.generate_keypairs(6)]
+        converted = public_keys_to_x25519(public_keys)
+        self.assertEqual(converted, [crypto_sign_ed25519_pk_to_curve25519(pk) for pk in public_keys])
+        self.assertEqual(public_key_to_x25519(public_keys[0]), converted[0])
+        self.assertEqual(public_keys_to_x25519([]), [])
+
+        with self.assertRaises(ValueError):
+            # The identity point (y = 1) has no u-coordinate.
+            public_key_to_x25519((1).to_bytes(32, "little"))
+        with self.assertRaises(ValueError):
+            public_key_to_x25519((2).to_bytes(32, "little"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+from ed25519.ed25519 import Ed25519
+from ed25519.keyring import KeyRing
+from ed25519.utils import decode_edwards_point, edwards_base_mult, encode_edwards_point, edwards_points_equal
+
+
+def random_public_key():
+    return encode_edwards_point(edwards_base_mult(int.from_bytes(os.urandom(32), "little")))
+
+
+class TestKeyRing(unittest.TestCase):
+    def test_add_and_find(self):
+        public_keys = [random_public_key() for _ in range(100)]
+        ring = KeyRing(public_keys)
+        self.assertEqual(len(ring), 100)
+        for slot, public_key in enumerate(public_keys):
+            self.assertEqual(ring.find(public_key), slot)
+            self.assertEqual(ring.key_at(slot), public_key)
+        self.assertEqual(ring.add(public_keys[3]), 3)
+        self.assertEqual(len(ring), 100)
+        self.assertIsNone(ring.find(random_public_key()))
+        self.assertEqual(ring.lookup_many([public_keys[7], b"\x01" * 32]), [7, None])
+
+    def test_decoded_points(self):
+        public_keys = [random_public_key() for _ in range(10)]
+        ring = KeyRing(public_keys, decoded=True)
+        for slot, point in enumerate(ring.points(range(10))):
+            self.assertTrue(edwards_points_equal(point, decode_edwards_point(public_keys[slot])))
+        with self.assertRaises(ValueError):
+            ring.add((2).to_bytes(32, "little"))
+        self.assertEqual(len(ring), 10)
+
+    def test_batch_verify_with_keyring(self):
+        ed25519 = Ed25519()
+        signers = [ed25519.generate_private_key() for _ in range(4)]
+        ring = KeyRing((ed25519.generate_public_key(private_key) for private_key in signers), decoded=True)
+        batch = []
+        for i in range(12):
+            private_key = signers[i % 4]
+            message = os.urandom(16)
+            batch.append((ed25519.generate_public_key(private_key), message, ed25519.sign(private_key, message)))
+
+        verifier = Ed25519(key_tables=ring)
+        self.assertTrue(verifier.verify_batch(batch))
+        self.assertTrue(verifier.verify(*batch[0]))
+        public_key, message, signature = batch[1]
+        batch[1] = (public_key, message + b"!", signature)
+        self.assertFalse(verifier.verify_batch(batch))
+
+    def test_memory_is_compact(self):
+        public_keys = [random_public_key() for _ in range(2000)]
+        # A dict of encoded key -> tuple of four ints, the representation this replaces
+        points = {public_key: decode_edwards_point(public_key) for public_key in public_keys}
+        baseline = sys.getsizeof(points) + sum(
+            sys.getsizeof(public_key) + sys.getsizeof(point) + sum(sys.getsizeof(c) for c in point)
+            for public_key, point in points.items()
+        )
+        self.assertGreater(baseline / KeyRing(public_keys).memory_usage(), 8)
+        self.assertGreater(baseline / KeyRing(public_keys, decoded=True).memory_usage(), 5)
+
+    def test_get_keeps_recent_tables(self):
+        public_keys = [random_public_key() for _ in range(3)]
+        ring = KeyRing(public_keys, decoded=True, table_cache=2)
+        key = ring.get(public_keys[0])
+        self.assertIs(ring.get(public_keys[0]).table, key.table)
+        ring.get(public_keys[1])
+        ring.get(public_keys[2])
+        self.assertIsNot(ring.get(public_keys[0]), key)
+        uncached = KeyRing(public_keys, table_cache=0)
+        self.assertIsNot(uncached.get(public_keys[0]), uncached.get(public_keys[0]))
+        self.assertTrue(edwards_points_equal(uncached.get(public_keys[1]).point, ring.get(public_keys[1]).point))
+
+if __name__ == "__main__":
+    unittest.main()
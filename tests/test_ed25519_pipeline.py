@@ -0,0 +1,90 @@
+import unittest
+from ed25519.cache import VerificationCache
+from ed25519.ed25519 import Ed25519
+from ed25519.pipeline import VerificationPipeline, batch_challenges
+from ed25519.utils import challenge
+from tests.helpers import signed_batch
+
+
+class TestChallenges(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ed25519 = Ed25519()
+        cls.batch = signed_batch(cls.ed25519, 6, message_size=4096)
+
+    def test_batch_challenges(self):
+        ks = batch_challenges(self.batch)
+        self.assertEqual(ks, [challenge(*entry) for entry in self.batch])
+        self.assertEqual(batch_challenges(self.batch, 2, 4), ks[2:4])
+
+    def test_verify_batch_with_challenges(self):
+        ks = batch_challenges(self.batch)
+        self.assertTrue(self.ed25519.verify_batch(self.batch, challenges=ks))
+        self.assertTrue(self.ed25519.verify_batch(self.batch[:1], challenges=ks[:1]))
+        # Wrong challenges fail like a wrong message would
+        self.assertFalse(self.ed25519.verify_batch(self.batch, challenges=ks[1:] + ks[:1]))
+        with self.assertRaises(ValueError):
+            self.ed25519.verify_batch(self.batch, challenges=ks[1:])
+
+    def test_challenges_with_a_cache(self):
+        ed25519 = Ed25519(cache=VerificationCache())
+        ks = batch_challenges(self.batch)
+        self.assertTrue(ed25519.verify_batch(self.batch[:3], challenges=ks[:3]))
+        # The cached entries are skipped along with their challenges
+        self.assertTrue(ed25519.verify_batch(self.batch, challenges=ks))
+        self.assertEqual(ed25519.cache.hits, 3)
+        self.assertFalse(Ed25519(cache=VerificationCache()).verify_batch(self.batch[3:], challenges=ks[:3]))
+
+
+class TestVerificationPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ed25519 = Ed25519()
+        cls.pipeline = VerificationPipeline(cls.ed25519, hash_threads=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pipeline.close()
+
+    def test_verdicts_in_order(self):
+        good = signed_batch(self.ed25519, 5, message_size=4096)
+        public_key, message, signature = good[2]
+        forged = good[:2] + [(public_key, message + b"!", signature)] + good[3:]
+        truncated = good[:4] + [(public_key, message, signature[:63])]
+        batches = [good, forged, [], good[:1], truncated, good]
+        self.assertEqual(
+            list(self.pipeline.verify_batches(batches)),
+            [self.ed25519.verify_batch(batch) for batch in batches],
+        )
+        self.assertEqual(list(self.pipeline.verify_batches(batches)), [True, False, True, True, False, True])
+        self.assertTrue(self.pipeline.verify_batch(good))
+
+    def test_bounded_look_ahead(self):
+        batch = signed_batch(self.ed25519, 2)
+        pulled = []
+
+        def batches():
+            for i in range(20):
+                pulled.append(i)
+                yield batch
+
+        verdicts = self.pipeline.verify_batches(batches())
+        for i in range(5):
+            self.assertTrue(next(verdicts))
+            # The batch just checked, plus at most `depth` hashed ahead
+            self.assertLessEqual(len(pulled), i + 1 + self.pipeline.depth)
+        self.assertEqual(sum(verdicts), 15)
+
+    def test_arguments(self):
+        with self.assertRaises(ValueError):
+            VerificationPipeline(hash_threads=0)
+        with self.assertRaises(ValueError):
+            VerificationPipeline(depth=0)
+        with VerificationPipeline(Ed25519(cache=VerificationCache()), hash_threads=1, depth=1) as pipeline:
+            batch = signed_batch(pipeline.ed25519, 3)
+            self.assertEqual(list(pipeline.verify_batches([batch, batch])), [True, True])
+            self.assertEqual(pipeline.ed25519.cache.hits, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
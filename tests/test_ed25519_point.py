@@ -0,0 +1,54 @@
+import unittest
+import os
+from ed25519.point import EdwardsPoint, NIELS
+from ed25519.utils import (
+    affine_to_extended,
+    encode_edwards_point,
+    edwards_scalar_mult,
+    B_AFFINE,
+    L,
+)
+
+
+class TestEdwardsPoint(unittest.TestCase):
+    def setUp(self):
+        self.B = EdwardsPoint.base()
+
+    def test_arithmetic_matches_formulas(self):
+        k = int.from_bytes(os.urandom(32), "little")
+        expected = edwards_scalar_mult(k, affine_to_extended(B_AFFINE))
+        P = self.B * k
+        self.assertEqual(P.encode(), encode_edwards_point(expected))
+        self.assertEqual(k * self.B, P)
+
+        Q = EdwardsPoint.decode(P.encode())
+        self.assertEqual(Q * 3, Q + Q + Q)
+        self.assertEqual(Q * -2, -(Q.double()))
+        self.assertEqual(P - P, EdwardsPoint.identity())
+        self.assertTrue((self.B * L).is_identity())
+        self.assertEqual(Q.mul_by_cofactor(), Q * 8)
+
+    def test_niels_representation(self):
+        P = self.B * 12345
+        N = P.to_niels()
+        self.assertEqual(N.representation, NIELS)
+        Q = self.B * 777
+        self.assertEqual(Q + N, Q + P)
+        self.assertEqual(Q - N, Q - P)
+        self.assertEqual(N.encode(), P.encode())
+        self.assertEqual(N, P)
+
+    def test_encoding_is_memoized(self):
+        P = self.B * 99
+        first = P.encode()
+        self.assertIs(P.encode(), first)
+        self.assertEqual(bytes(P), first)
+        self.assertEqual(hash(P), hash(EdwardsPoint.decode(first)))
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            self.B.extra = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import tempfile
+from ed25519 import records
+from ed25519.__main__ import main
+from ed25519.ed25519 import Ed25519
+
+
+def run_cli(*argv):
+    with contextlib.redirect_stderr(io.StringIO()):
+        return main(list(argv))
+
+
+class TestRecordFormats(unittest.TestCase):
+    def test_binary_records(self):
+        record = (b"\x01" * 32, b"hello", b"\x02" * 64)
+        data = records.encode_binary_record(*record) * 3
+        parsed = list(records.parse_binary_records(data))
+        self.assertEqual([item for _, item in parsed], [record] * 3)
+        self.assertEqual(parsed[-1][0], len(data))
+        # A record cut short is an error at the end of the input, but not mid-stream
+        self.assertEqual(len(list(records.parse_binary_records(data[:-1], final=False))), 2)
+        with self.assertRaisesRegex(ValueError, "Truncated"):
+            list(records.parse_binary_records(data[:-1]))
+        fixed = records.encode_binary_record(*record, message_size=5)
+        self.assertEqual(len(fixed), 32 + 64 + 5)
+        self.assertEqual(list(records.parse_binary_records(fixed, message_size=5)), [(len(fixed), record)])
+
+    def test_json_records(self):
+        record = (b"\x01" * 32, b"hello", b"\x02" * 64)
+        for encoding in ("hex", "base64"):
+            line = records.encode_json_record({"message": records.encode_field(b"hello", encoding), "id": 7},
+                                              record[0], record[2], encoding)
+            data = line + b"\n" + line.rstrip(b"\n")  # a blank line, and no final line break
+            self.assertEqual([item for _, item in records.parse_json_records(data, encoding=encoding)], [record] * 2)
+            self.assertEqual(json.loads(line)["id"], 7)
+        with self.assertRaisesRegex(ValueError, "Malformed JSON record at byte 0"):
+            list(records.parse_json_records(b'{"message": "zz"}\n'))
+
+    def test_stream_matches_mapped_file(self):
+        record = (b"\x01" * 32, b"x" * 50, b"\x02" * 64)
+        data = records.encode_binary_record(*record) * 20
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "records.bin")
+            with open(path, "wb") as f:
+                f.write(data)
+            with records.mapped(path) as buffer:
+                mapped = list(records.parse_binary_records(buffer, 300))
+        streamed = list(records.read_stream(io.BytesIO(data), records.parse_binary_records, 300, chunk_size=7))
+        self.assertEqual(streamed, mapped)
+        self.assertEqual(len(streamed), 20 - 2)
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.key = self.path("key.hex")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(run_cli("keygen", self.key), 0)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_messages(self, name, start, stop):
+        with open(self.path(name), "a") as f:
+            for i in range(start, stop):
+                f.write(json.dumps({"id": i, "message": f"message {i}".encode().hex()}) + "\n")
+
+    def test_sign_and_verify(self):
+        self.write_messages("messages.jsonl", 0, 10)
+        self.assertEqual(run_cli("sign", self.key, self.path("messages.jsonl"), "-o", self.path("signed.jsonl"), "--batch-size", "3"), 0)
+        with open(self.path("signed.jsonl")) as f:
+            signed = [json.loads(line) for line in f]
+        self.assertEqual([obj["id"] for obj in signed], list(range(10)))
+        public_key = bytes.fromhex(signed[0]["public_key"])
+        self.assertTrue(Ed25519().verify(public_key, b"message 3", bytes.fromhex(signed[3]["signature"])))
+
+        # Tamper with record 4 and verify in binary form too
+        signed[4]["message"] = b"forged".hex()
+        with open(self.path("tampered.jsonl"), "w") as f:
+            f.writelines(json.dumps(obj) + "\n" for obj in signed)
+        self.assertEqual(run_cli("verify", self.path("tampered.jsonl"), "-o", self.path("verdicts.txt"), "--batch-size", "4"), 1)
+        with open(self.path("verdicts.txt")) as f:
+            verdicts = f.read().split("\n")[:-1]
+        self.assertEqual(verdicts, [f"{i}\t{'invalid' if i == 4 else 'valid'}" for i in range(10)])
+
+        with open(self.path("messages.bin"), "wb") as f:
+            for i in range(5):
+                f.write((8).to_bytes(4, "little") + b"binary %d" % i)
+        self.assertEqual(run_cli("sign", self.key, self.path("messages.bin"), "--format", "binary", "-o", self.path("signed.bin")), 0)
+        self.assertEqual(run_cli("verify", self.path("signed.bin"), "--format", "binary", "-o", self.path("binary.txt")), 0)
+
+    def test_checkpoint_resumes_after_the_verified_prefix(self):
+        self.write_messages("messages.jsonl", 0, 6)
+        checkpoint = self.path("verify.checkpoint")
+        verify = ("verify", self.path("signed.jsonl"), "-o", self.path("verdicts.txt"),
+                  "--checkpoint", checkpoint, "--batch-size", "4")
+        run_cli("sign", self.key, self.path("messages.jsonl"), "-o", self.path("signed.jsonl"))
+        self.assertEqual(run_cli(*verify), 0)
+
+        # The log grows, and the last run died after writing verdicts it did not checkpoint
+        self.write_messages("more.jsonl", 6, 11)
+        run_cli("sign", self.key, self.path("more.jsonl"), "-o", self.path("more_signed.jsonl"))
+        with open(self.path("signed.jsonl"), "a") as log, open(self.path("more_signed.jsonl")) as more:
+            log.write(more.read())
+        with open(self.path("verdicts.txt"), "a") as f:
+            f.write("6\tvali")
+        self.assertEqual(run_cli(*verify), 0)
+        with open(self.path("verdicts.txt")) as f:
+            self.assertEqual(f.read(), "".join(f"{i}\tvalid\n" for i in range(11)))
+        with open(checkpoint) as f:
+            self.assertEqual(json.load(f)["records"], 11)
+        # A checkpoint of another input is refused
+        self.assertEqual(run_cli("verify", self.path("more_signed.jsonl"), "--checkpoint", checkpoint), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import tempfile
+import multiprocessing
+from ed25519.ed25519 import Ed25519
+from ed25519.keys import KeyTableCache, VerifyingKey
+from ed25519.segment import KeyTableSegment, SEGMENT_KIND
+from ed25519.tables import pack_table
+from ed25519.utils import challenge, edwards_base_mult, encode_edwards_point, L
+
+
+def verify_in_worker(args):
+    """Open the segment in a separate process and verify against it."""
+    path, public_key, message, signature = args
+    with KeyTableSegment.open(path) as segment:
+        return public_key in segment and Ed25519(key_tables=segment).verify(public_key, message, signature)
+
+
+class TestKeyTableSegment(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "keys.seg")
+        self.ed25519 = Ed25519()
+        self.signers = []
+        for _ in range(5):
+            private_key = self.ed25519.generate_private_key()
+            self.signers.append((private_key, self.ed25519.generate_public_key(private_key)))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookup(self):
+        public_keys = [public_key for _, public_key in self.signers]
+        with KeyTableSegment.create(self.path, public_keys + public_keys[:2]) as segment:
+            self.assertEqual(len(segment), 5)
+            for public_key in public_keys:
+                slot = segment.find(public_key)
+                self.assertIsNotNone(slot)
+                self.assertEqual(segment.key_at(slot).table, VerifyingKey(public_key).table)
+
+            # Unknown keys are decoded on the fly.
+            outsider = self.ed25519.generate_public_key(os.urandom(32))
+            self.assertNotIn(outsider, segment)
+            self.assertEqual(segment.get(outsider).point, VerifyingKey(outsider).point)
+
+    def test_verify_reads_segment(self):
+        KeyTableSegment.create(self.path, [public_key for _, public_key in self.signers]).close()
+        batch = []
+        for private_key, public_key in self.signers:
+            message = os.urandom(20)
+            batch.append((public_key, message, self.ed25519.sign(private_key, message)))
+
+        with KeyTableSegment.open(self.path, check=True) as segment:
+            for method in ("standard", "lattice"):
+                verifier = Ed25519(verify_method=method, key_tables=segment)
+                for entry in batch:
+                    self.assertTrue(verifier.verify(*entry))
+                public_key, message, signature = batch[0]
+                self.assertFalse(verifier.verify(public_key, message + b"!", signature))
+            self.assertTrue(Ed25519(key_tables=segment).verify_batch(batch))
+
+        with multiprocessing.Pool(2) as pool:
+            results = pool.map(verify_in_worker, [(self.path,) + entry for entry in batch])
+        self.assertTrue(all(results))
+
+    def test_tampered_record_fails_closed(self):
+        victim = self.signers[0][1]
+        keys = sorted(public_key for _, public_key in self.signers)
+        records = [VerifyingKey(public_key).to_record() for public_key in keys]
+        slot = keys.index(victim)
+
+        # Swap in the multiples of a point whose scalar the attacker knows. The challenge
+        # still hashes the victim's key, so s = r + k * a would pass against that table.
+        a, r = (int.from_bytes(os.urandom(32), "little") % L for _ in range(2))
+        message = b"forged"
+        R = encode_edwards_point(edwards_base_mult(r))
+        k = challenge(victim, message, R + bytes(32))
+        forged = R + ((r + k * a) % L).to_bytes(32, "little")
+        records[slot][1:] = VerifyingKey(encode_edwards_point(edwards_base_mult(a))).to_record()[1:]
+        trusting = KeyTableCache()
+        trusting.add(VerifyingKey.from_record(records[slot]))
+        self.assertTrue(Ed25519(key_tables=trusting).verify(victim, message, forged))
+
+        with KeyTableSegment(pack_table(SEGMENT_KIND, records), check=True) as segment:
+            with self.assertRaises(ValueError):
+                segment.key_at(slot)
+            self.assertFalse(Ed25519(key_tables=segment).verify(victim, message, forged))
+            private_key, public_key = self.signers[1]
+            self.assertTrue(Ed25519(key_tables=segment).verify(public_key, message, self.ed25519.sign(private_key, message)))
+
+        # A single coordinate of one multiple is enough to be rejected
+        records = [VerifyingKey(public_key).to_record() for public_key in keys]
+        records[slot][-1] += 1
+        with KeyTableSegment(pack_table(SEGMENT_KIND, records)) as segment:
+            for _ in range(2):
+                # Rejected keys are not cached, so every lookup fails
+                with self.assertRaises(ValueError):
+                    segment.get(victim)
+
+    def test_rejects_other_tables(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a segment")
+        with self.assertRaises(ValueError):
+            KeyTableSegment.open(self.path)
+
+        with self.assertRaises(ValueError):
+            # y = 2 is not the y-coordinate of any curve point.
+            KeyTableSegment.pack([(2).to_bytes(32, "little")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import os
+import tempfile
+from ed25519.ed25519 import Ed25519
+from ed25519.keys import KeyTableCache, VerifyingKey
+from ed25519.tables import read_table, write_table, HEADER
+from ed25519.utils import (
+    build_base_point_table,
+    edwards_base_mult,
+    edwards_scalar_mult,
+    edwards_points_equal,
+    affine_to_extended,
+    B_AFFINE,
+    L,
+)
+
+
+class TestTableFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "table.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        records = [[1, 2, 3], [2**255 - 20, 0, 7]]
+        write_table(self.path, "test", records)
+        self.assertEqual(read_table(self.path, "test"), records)
+
+    def test_rejects_wrong_kind_and_corruption(self):
+        write_table(self.path, "test", [[1, 2, 3]])
+        self.assertIsNone(read_table(self.path, "other"))
+
+        with open(self.path, "r+b") as f:
+            f.seek(HEADER.size)
+            f.write(b"\xff")
+        self.assertIsNone(read_table(self.path, "test"))
+        self.assertIsNone(read_table(os.path.join(self.tmp.name, "missing.bin"), "test"))
+
+
+class TestPrecomputedTables(unittest.TestCase):
+    def test_base_table_round_trip(self):
+        records = build_base_point_table()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "base.bin")
+            write_table(path, "ed25519-base", records)
+            self.assertEqual(read_table(path, "ed25519-base"), records)
+
+    def test_base_mult_matches_double_and_add(self):
+        B = affine_to_extended(B_AFFINE)
+        for scalar in (0, 1, 8, 9, 255, L - 1, L + 5, int.from_bytes(os.urandom(32), "little")):
+            self.assertTrue(edwards_points_equal(edwards_base_mult(scalar), edwards_scalar_mult(scalar, B)))
+
+    def test_key_tables_verify(self):
+        ed25519 = Ed25519()
+        private_key = ed25519.generate_private_key()
+        public_key = ed25519.generate_public_key(private_key)
+        message = b"hot signer"
+        signature = ed25519.sign(private_key, message)
+
+        keys = KeyTableCache(max_size=4)
+        self.assertTrue(Ed25519(key_tables=keys).verify(public_key, message, signature))
+        self.assertIn(public_key, keys)
+        self.assertEqual(keys.get(public_key).table, VerifyingKey(public_key).table)
+        for method in ("standard", "lattice"):
+            verifier = Ed25519(verify_method=method, key_tables=keys)
+            self.assertTrue(verifier.verify(public_key, message, signature))
+            self.assertFalse(verifier.verify(public_key, message + b"!", signature))
+        self.assertTrue(Ed25519(key_tables=keys).verify_batch([(public_key, message, signature)] * 2))
+
+    def test_key_tables_lru(self):
+        keys = KeyTableCache(max_size=2)
+        ed25519 = Ed25519()
+        public_keys = [ed25519.generate_public_key(os.urandom(32)) for _ in range(3)]
+        for public_key in public_keys:
+            keys.get(public_key)
+        self.assertEqual(len(keys), 2)
+        self.assertNotIn(public_keys[0], keys)
+        with self.assertRaises(ValueError):
+            keys.get(b"\x00" * 31)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ed25519.cache import VerificationCache
+from ed25519.ed25519 import Ed25519
+from ed25519.keyring import KeyRing
+from ed25519.keys import KeyTableCache
+from ed25519.threads import CryptoThreadPool, FREE_THREADED
+from ed25519.utils import edwards_base_mult, encode_edwards_point
+from x25519.x25519 import X25519
+from tests.helpers import signed_batch
+
+
+class TestSharedState(unittest.TestCase):
+    def setUp(self):
+        # Switch threads as often as possible, so races show up even under the GIL
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+    def test_shared_instance_with_caches(self):
+        ed25519 = Ed25519(
+            cache=VerificationCache(max_size=64, stripes=4),
+            key_tables=KeyTableCache(max_size=8, stripes=2),
+        )
+        batch = signed_batch(ed25519, 12)
+        forged = [(public_key, message + b"!", signature) for public_key, message, signature in batch]
+
+        def check(i):
+            entry = batch[i % len(batch)]
+            return ed25519.verify(*entry) and not ed25519.verify(*forged[i % len(batch)])
+
+        with ThreadPoolExecutor(4) as executor:
+            self.assertTrue(all(executor.map(check, range(48))))
+        self.assertLessEqual(len(ed25519.cache), 64)
+        self.assertEqual(ed25519.cache.hits + ed25519.cache.misses, 96)
+
+    def test_striped_cache_bounds(self):
+        cache = VerificationCache(max_size=16, stripes=4)
+        for i in range(100):
+            cache.add(os.urandom(32))
+        self.assertLessEqual(len(cache), 16)
+        self.assertEqual(cache.evictions, 100 - len(cache))
+        with self.assertRaises(ValueError):
+            VerificationCache(max_size=2, stripes=3)
+
+    def test_keyring_lookups_while_growing(self):
+        public_keys = [encode_edwards_point(edwards_base_mult(i + 1)) for i in range(400)]
+        ring = KeyRing(public_keys[:20])
+        missing = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                missing.extend(public_key for public_key in public_keys[:20] if ring.find(public_key) is None)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        ring.extend(public_keys[20:])
+        done.set()
+        reader.join()
+        self.assertEqual(missing, [])
+        self.assertEqual(len(ring), 400)
+
+
+class TestCryptoThreadPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = CryptoThreadPool(threads=3, parallel=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_shards(self):
+        shards = self.pool._shards(list(range(50)), 8)
+        self.assertEqual([len(shard) for shard in shards], [16, 17, 17])
+        self.assertEqual(sum(shards, []), list(range(50)))
+        self.assertEqual(self.pool._shards(list(range(10)), 8), [list(range(10))])
+
+    def test_verify_batch(self):
+        self.pool._min_verify_shard = 8
+        batch = signed_batch(self.pool.ed25519, 30)
+        self.assertTrue(self.pool.verify_batch(batch))
+        public_key, message, signature = batch[25]
+        batch[25] = (public_key, message + b"!", signature)
+        self.assertFalse(self.pool.verify_batch(batch))
+
+    def test_scalar_multiply_many_in_order(self):
+        self.pool._min_x25519_shard = 8
+        pairs = [(os.urandom(32), os.urandom(32)) for _ in range(40)]
+        self.assertEqual(self.pool.scalar_multiply_many(pairs), X25519().scalar_multiply_many(pairs))
+
+    def test_serial_under_the_gil(self):
+        with CryptoThreadPool(threads=4) as pool:
+            self.assertEqual(pool.parallel, FREE_THREADED)
+        with CryptoThreadPool(threads=1, parallel=True) as pool:
+            self.assertFalse(pool.parallel)
+            pairs = [(os.urandom(32), os.urandom(32))]
+            self.assertEqual(pool.scalar_multiply_many(pairs), X25519().scalar_multiply_many(pairs))
+        with self.assertRaises(ValueError):
+            CryptoThreadPool(threads=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
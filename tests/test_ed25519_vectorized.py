@@ -0,0 +1,70 @@
+import unittest
+import os
+import random
+from unittest import mock
+from x25519.limbs import HAVE_NUMPY
+from ed25519.ed25519 import Ed25519
+from ed25519.utils import edwards_base_mult, edwards_multi_scalar_mult, edwards_points_equal, edwards_point_add_extended
+
+L = 2**252 + 27742317777372353535851937790883648493
+
+
+@unittest.skipUnless(HAVE_NUMPY, "NumPy is not installed")
+class TestVectorizedBatch(unittest.TestCase):
+    def setUp(self):
+        self.ed25519 = Ed25519()
+
+    def test_add_lanes(self):
+        from ed25519.vectorized import edwards_add_lanes, _points_to_lanes, _lanes_to_points
+
+        P = [edwards_base_mult(random.randrange(L)) for _ in range(6)] + [(0, 1, 1, 0)]
+        Q = [edwards_base_mult(random.randrange(L)) for _ in range(6)] + [P[0]]
+        result = _lanes_to_points(edwards_add_lanes(_points_to_lanes(P), _points_to_lanes(Q)))
+        for p, q, r in zip(P, Q, result):
+            self.assertTrue(edwards_points_equal(r, edwards_point_add_extended(p, q)))
+
+    def test_multi_scalar_mult_lanes(self):
+        from ed25519.vectorized import edwards_multi_scalar_mult_lanes
+
+        points = [edwards_base_mult(random.randrange(L)) for _ in range(20)]
+        scalars = [random.randrange(L) for _ in range(20)]
+        scalars[:4] = [0, 1, L - 1, 2**256 - 1]
+        self.assertTrue(edwards_points_equal(
+            edwards_multi_scalar_mult_lanes(scalars, points),
+            edwards_multi_scalar_mult(scalars, points),
+        ))
+        self.assertEqual(edwards_multi_scalar_mult_lanes([], []), (0, 1, 1, 0))
+
+    def test_bucket_windows(self):
+        import ed25519.vectorized
+
+        points = [edwards_base_mult(random.randrange(L)) for _ in range(10)]
+        scalars = [random.randrange(L) for _ in range(9)] + [2**256 - 1]
+        expected = edwards_multi_scalar_mult(scalars, points)
+        for window in (3, 5, 11):
+            with mock.patch.object(ed25519.vectorized, "BUCKET_WINDOW", window):
+                self.assertTrue(edwards_points_equal(ed25519.vectorized.edwards_multi_scalar_mult_lanes(scalars, points), expected))
+
+    def test_same_verdicts_as_scalar_path(self):
+        keypairs = list(self.ed25519.generate_keypairs(4))
+        batch = []
+        for i in range(12):
+            private_key, public_key = keypairs[i % len(keypairs)]
+            message = os.urandom(i)
+            batch.append((public_key, message, self.ed25519.sign(private_key, message)))
+
+        for vectorized in (False, True):
+            self.assertTrue(self.ed25519.verify_batch(batch, vectorized=vectorized))
+
+        tampered = list(batch)
+        public_key, message, signature = tampered[5]
+        tampered[5] = (public_key, message + b"!", signature)
+        wrong_signer = list(batch)
+        wrong_signer[2] = (keypairs[0][1],) + batch[2][1:]
+        for bad in (tampered, wrong_signer):
+            for vectorized in (False, True):
+                self.assertFalse(self.ed25519.verify_batch(bad, vectorized=vectorized))
+
+
+if __name__ == "__main__":
+    unittest.main()
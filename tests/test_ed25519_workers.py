@@ -0,0 +1,60 @@
+import unittest
+import os
+from unittest import mock
+from ed25519.ed25519 import Ed25519
+from ed25519.workers import CryptoWorkerPool, MAX_CHUNK_SIZE, MIN_CHUNK_SIZE
+from x25519.x25519 import X25519
+
+
+class TestCryptoWorkerPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = CryptoWorkerPool(processes=2, backend="python")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_workers_start_with_the_pool(self):
+        self.assertEqual(len(self.pool.pids), 2)
+        self.assertNotIn(os.getpid(), self.pool.pids)
+
+    def test_sign_many_in_order(self):
+        requests = [(os.urandom(32), b"message %d" % i) for i in range(50)]
+        ed25519 = Ed25519(backend="python")
+        # A generator input is consumed chunk by chunk
+        signatures = list(self.pool.sign_many(request for request in requests))
+        self.assertEqual(signatures, [ed25519.sign(private_key, message) for private_key, message in requests])
+        self.assertEqual(list(self.pool.sign_many([])), [])
+
+    def test_scalar_multiply_many_in_order(self):
+        pairs = [(os.urandom(32), os.urandom(32)) for _ in range(30)]
+        self.assertEqual(list(self.pool.scalar_multiply_many(pairs)), X25519(backend="python").scalar_multiply_many(pairs))
+
+    def test_small_jobs_run_in_the_calling_process(self):
+        import ed25519.workers
+
+        pairs = [(os.urandom(32), os.urandom(32)) for _ in range(5)]
+        with mock.patch.object(ed25519.workers, "SHARD_MIN_ITEMS", 6), \
+                mock.patch.object(self.pool._executor, "submit", side_effect=AssertionError("sent to a worker")):
+            self.assertEqual(list(self.pool.scalar_multiply_many(pairs)), X25519(backend="python").scalar_multiply_many(pairs))
+        with mock.patch.object(ed25519.workers, "SHARD_MIN_ITEMS", 5):
+            self.assertEqual(len(list(self.pool.scalar_multiply_many(pairs))), 5)
+
+    def test_chunk_size_adapts(self):
+        pool = self.pool
+        start = pool.chunk_sizes["sign"]
+        pool._adapt("sign", start, 1e-6)  # far too fast: grow, but at most 2x per chunk
+        self.assertEqual(pool.chunk_sizes["sign"], min(MAX_CHUNK_SIZE, 2 * start))
+        pool._adapt("sign", pool.chunk_sizes["sign"], 100.0)  # far too slow: shrink, at most 2x per chunk
+        self.assertEqual(pool.chunk_sizes["sign"], max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, 2 * start) // 2))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            CryptoWorkerPool(processes=0)
+        with self.assertRaises(ValueError):
+            CryptoWorkerPool(processes=1, chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
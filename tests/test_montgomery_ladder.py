@@ -1,6 +1,5 @@
 import unittest
 import random
-import time
 from x25519.x25519 import X25519
 from nacl.bindings import crypto_scalarmult
 
@@ -41,57 +40,14 @@ class TestX25519(unittest.TestCase):
         # Assert that the result matches PyNaCl's output
         self.assertEqual(result_x, expected_output, "Mismatch with PyNaCl result for large scalar")
 
-    def test_performance_comparison(self):
-        """
-        Compare the performance of our MontgomeryLadder scalar multiplication
-        with PyNaCl's implementation, using the same mid-range scalar and base point.
-        The test runs 10 iterations for each and prints the average time.
-        """
-        import time
-        from nacl.bindings import crypto_scalarmult
-
-        # Create a mid-range scalar.
-        scalar = (1 << 200) + 230703
-        scalar_bytes = scalar.to_bytes(32, 'little')
-        
-        # Standard base point for X25519.
+    def test_mid_range_scalar_matches_pynacl(self):
+        """The ladder agrees with PyNaCl for a mid-range scalar and the base point."""
+        scalar_bytes = ((1 << 200) + 230703).to_bytes(32, 'little')
         base_point = b'\x09' + b'\x00' * 31
-
-        iterations = 1000
-        total_time_ours = 0.0
-        total_time_pynacl = 0.0
-
-        # We'll store the last computed result for final verification.
-        result_ours = None
-        result_pynacl = None
-
-        for _ in range(iterations):
-            # Time our MontgomeryLadder implementation.
-            start_time = time.time()
-            result_ours = self.x25519_ladder.scalar_multiply(scalar_bytes, base_point)
-            duration_ours = time.time() - start_time
-            total_time_ours += duration_ours
-
-            # Time PyNaCl's implementation.
-            start_time = time.time()
-            result_pynacl = crypto_scalarmult(scalar_bytes, base_point)
-            duration_pynacl = time.time() - start_time
-            total_time_pynacl += duration_pynacl
-
-        avg_time_ours = total_time_ours / iterations
-        avg_time_pynacl = total_time_pynacl / iterations
-
-        print(f"Our implementation average scalar multiplication took {avg_time_ours:.6f} seconds.")
-        print(f"PyNaCl scalar multiplication average took {avg_time_pynacl:.6f} seconds.")
-
-        speedup = avg_time_ours/avg_time_pynacl
-        print(f"Speedup factor: {speedup:.2f}")
-        # Verify that both implementations produce a result of type bytes.
-        self.assertTrue(isinstance(result_ours, bytes))
-        self.assertTrue(isinstance(result_pynacl, bytes))
-        
-        # Optionally, check that the results match.
-        self.assertEqual(result_ours, result_pynacl)
+        self.assertEqual(
+            self.x25519_ladder.scalar_multiply(scalar_bytes, base_point),
+            crypto_scalarmult(scalar_bytes, base_point),
+        )
 
 
 if __name__ == "__main__":
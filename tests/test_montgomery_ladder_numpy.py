@@ -0,0 +1,95 @@
+import unittest
+import os
+import subprocess
+import sys
+import random
+from nacl.bindings import crypto_scalarmult
+from x25519 import limbs
+from x25519.metrics import Metrics
+from x25519.utils import HAVE_NUMPY, bytes_to_int, calculate_y_coordinate
+from x25519.x25519 import X25519, VECTORIZED_MIN_BATCH
+
+P = 2**255 - 19
+
+# RFC 7748, Section 5.2
+RFC_7748_VECTORS = [
+    (
+        "a546e36bf0527c9d3b16154b82465edd62144c0ac1fc5a18506a2244ba449ac4",
+        "e6db6867583030db3594c1a424b15f7c726624ec26b3353b10a903a6d0ab1c4c",
+        "c3da55379de9c6908e94ea4df28d084f32eccf03491c71f754b4075577a28552",
+    ),
+    (
+        "4b66e9d4d1b4673c5ad22691957d6af5c11b6421e0ea01d42ca4169e7918ba0d",
+        "e5210f12786811d3f4b7959d0538ae2c31dbe7106fc03c3efc4cd549c715a413",
+        "95cbde9476e8907d7aade45cb4b873f88b595a68799fa152e6f8f7647aac7957",
+    ),
+]
+
+
+@unittest.skipUnless(limbs.HAVE_NUMPY, "NumPy is not installed")
+class TestVectorizedLadder(unittest.TestCase):
+    def test_limb_arithmetic(self):
+        xs = [0, 1, 19, P - 1, 2**255 - 1] + [random.randrange(P) for _ in range(20)]
+        ys = [P - 1, P - 1, 2**26, P - 1, 2] + [random.randrange(P) for _ in range(20)]
+        f, g = limbs.to_limbs(xs), limbs.to_limbs(ys)
+        self.assertEqual(limbs.from_limbs(f), [x % P for x in xs])
+        self.assertEqual(limbs.from_limbs(limbs.mul(f, g)), [(x * y) % P for x, y in zip(xs, ys)])
+        # Unreduced sums and differences are valid inputs.
+        self.assertEqual(
+            limbs.from_limbs(limbs.mul(f - g, f + g)),
+            [((x - y) * (x + y)) % P for x, y in zip(xs, ys)],
+        )
+
+    def test_rfc_7748_vectors(self):
+        pairs = [(bytes.fromhex(k), bytes.fromhex(u)) for k, u, _ in RFC_7748_VECTORS]
+        results = X25519().scalar_multiply_many(pairs, vectorized=True)
+        self.assertEqual(results, [bytes.fromhex(out) for _, _, out in RFC_7748_VECTORS])
+
+    def test_matches_scalar_ladder_and_pynacl(self):
+        x25519 = X25519()
+        pairs = [(os.urandom(32), os.urandom(32)) for _ in range(40)]
+        # A low-order input gives the all-zero output.
+        pairs.append((os.urandom(32), bytes(32)))
+        vectorized = x25519.scalar_multiply_many(pairs, vectorized=True)
+        self.assertEqual(vectorized, x25519.scalar_multiply_many(pairs, vectorized=False))
+        for (private_key, public_key), result in zip(pairs[:-1], vectorized):
+            self.assertEqual(result, crypto_scalarmult(private_key, public_key))
+        self.assertEqual(vectorized[-1], bytes(32))
+        self.assertEqual(x25519.scalar_multiply_many([], vectorized=True), [])
+
+    def test_double_and_add_is_never_vectorized(self):
+        x25519 = X25519("double_and_add")
+        # A u with no point on the curve: double_and_add rejects it, the ladder would not
+        while True:
+            u = os.urandom(32)
+            try:
+                calculate_y_coordinate(bytes_to_int(u), 486662, P)
+            except ValueError:
+                break
+        pairs = [(os.urandom(32), u)] * VECTORIZED_MIN_BATCH
+        with self.assertRaises(ValueError):
+            x25519.scalar_multiply_many(pairs)
+        with self.assertRaises(ValueError):
+            x25519.scalar_multiply_many(pairs, vectorized=True)
+
+    def test_metrics(self):
+        metrics = Metrics()
+        pairs = [(os.urandom(32), os.urandom(32)) for _ in range(4)]
+        X25519(metrics=metrics).scalar_multiply_many(pairs, vectorized=True)
+        self.assertEqual(metrics.histogram("x25519.scalar_multiply_many").count, 1)
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_engines_import_numpy_on_first_use(self):
+        code = (
+            "import sys, ed25519.ed25519, x25519.x25519, ed25519.threads, ed25519.workers; "
+            "print('numpy' in sys.modules)"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False")
+        self.assertEqual(HAVE_NUMPY, limbs.HAVE_NUMPY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,5 @@
 import unittest
 import os
-import time
 from x25519.x25519 import X25519
 from x25519.utils import bytes_to_int, int_to_bytes
 from nacl.bindings import crypto_scalarmult, crypto_scalarmult_base
@@ -132,6 +131,23 @@ class TestX25519(unittest.TestCase):
         self.assertEqual(result_ladder, result_double_add, "Mismatch between ladder and double_and_add methods.")
 
 
+    def test_scalar_multiply_into(self):
+        x25519 = X25519()
+        pairs = [(os.urandom(32), x25519.generate_public_key(os.urandom(32))) for _ in range(3)]
+        out = bytearray(8 + 32 * len(pairs))
+        self.assertEqual(x25519.scalar_multiply_many_into(pairs, out, 8), len(out))
+        for i, (private_key, public_key) in enumerate(pairs):
+            self.assertEqual(out[8 + 32 * i:8 + 32 * (i + 1)], x25519.scalar_multiply(private_key, public_key))
+
+        view = memoryview(bytearray(32))
+        self.assertEqual(x25519.scalar_multiply_into(*pairs[0], view), 32)
+        self.assertEqual(view.tobytes(), out[8:40])
+
+        with self.assertRaises(ValueError):
+            x25519.scalar_multiply_into(*pairs[0], bytearray(40), 9)
+        with self.assertRaises(ValueError):
+            x25519.scalar_multiply_into(*pairs[0], bytes(32))
+
     def test_consistency_between_methods_and_pynacl(self):
         """Ensure that the result of 'ladder' matches 'double_and_add' and PyNaCl,
         and that public key generation agrees with PyNaCl, over many iterations."""
@@ -171,46 +187,5 @@ class TestX25519(unittest.TestCase):
             )
 
 
-    def test_performance_comparison(self):
-        """Compare performance of MontgomeryLadder and MontgomeryDoubleAdd averaged over multiple runs."""
-        import time
-        x25519_ladder = X25519(method='ladder')
-        x25519_double_add = X25519(method='double_and_add')
-        
-        private_key = os.urandom(32)
-        base_point = int.to_bytes(9, 32, 'little')
-        
-        iterations = 100
-        total_ladder_time = 0.0
-        total_double_add_time = 0.0
-
-        # Perform a few warm-up iterations
-        for _ in range(2):
-            x25519_ladder.scalar_multiply(private_key, base_point)
-            x25519_double_add.scalar_multiply(private_key, base_point)
-
-        # Run and time each implementation over multiple iterations.
-        for _ in range(iterations):
-            start_time = time.time()
-            result_ladder = x25519_ladder.scalar_multiply(private_key, base_point)
-            total_ladder_time += time.time() - start_time
-
-            start_time = time.time()
-            result_double_add = x25519_double_add.scalar_multiply(private_key, base_point)
-            total_double_add_time += time.time() - start_time
-
-            # Verify that both implementations produce the same result.
-            self.assertEqual(result_ladder, result_double_add)
-
-        avg_ladder_time = total_ladder_time / iterations
-        avg_double_add_time = total_double_add_time / iterations
-
-        print(f"MontgomeryLadder Average Time: {avg_ladder_time:.6f}s")
-        print(f"MontgomeryDoubleAdd Average Time: {avg_double_add_time:.6f}s")
-        speedup = avg_double_add_time / avg_ladder_time
-        print(f"MontgomeryLadder is {speedup:.2f} times faster than MontgomeryDoubleAdd.")
-        # For instance, assert that ladder is no more than 5 times slower than double_and_add.
-        self.assertTrue(avg_ladder_time <= avg_double_add_time * 5)
-
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+from ed25519.cache import VerificationCache
+from ed25519.ed25519 import Ed25519
+from x25519.metrics import Histogram, Metrics, NULL_TRACE
+from x25519.x25519 import X25519
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.001
+        return self.now
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram(self):
+        histogram = Histogram((0.001, 0.01, 0.1))
+        for value in (0.0005, 0.001, 0.005, 0.05, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.quantile(0.4), 0.001)
+        self.assertEqual(histogram.quantile(0.6), 0.01)
+        self.assertEqual(histogram.quantile(1.0), float("inf"))
+        with self.assertRaises(ValueError):
+            Histogram((0.1, 0.01))
+        with self.assertRaises(ValueError):
+            Histogram().quantile(0.5)
+
+    def test_phases_and_spans(self):
+        spans = []
+        metrics = Metrics(on_span=spans.append, clock=FakeClock())
+        trace = metrics.trace("op")
+        trace.mark("hash")
+        trace.mark("decode")
+        trace.mark("hash")
+        trace.finish()
+        # Each clock reading advances 1 ms; repeated phases are summed
+        self.assertEqual([(s.phase, round(s.duration, 6)) for s in spans],
+                         [("hash", 0.002), ("decode", 0.001), ("total", 0.004)])
+        self.assertEqual(metrics.histogram("op", "hash").count, 1)
+        self.assertEqual(metrics.histogram("op").count, 1)
+
+    def test_sampling(self):
+        metrics = Metrics(sample_rate=0.25)
+        traces = [metrics.trace("op") for _ in range(100)]
+        for trace in traces:
+            trace.finish()
+        self.assertEqual(sum(trace is not NULL_TRACE for trace in traces), 25)
+        self.assertEqual(metrics.calls["op"], 100)
+        self.assertEqual(metrics.histogram("op").count, 25)
+        self.assertIs(Metrics(sample_rate=0).trace("op"), NULL_TRACE)
+        with self.assertRaises(ValueError):
+            Metrics(sample_rate=1.5)
+
+    def test_prometheus_export(self):
+        metrics = Metrics(buckets=(0.001, 0.01), clock=FakeClock())
+        metrics.trace("ed25519.verify").finish()
+        text = metrics.prometheus()
+        self.assertIn("# TYPE p79_phase_duration_seconds histogram", text)
+        self.assertIn('p79_operations_total{operation="ed25519.verify"} 1', text)
+        self.assertIn('p79_phase_duration_seconds_bucket{operation="ed25519.verify",phase="total",le="0.001"} 1', text)
+        self.assertIn('p79_phase_duration_seconds_bucket{operation="ed25519.verify",phase="total",le="+Inf"} 1', text)
+        self.assertIn('p79_phase_duration_seconds_count{operation="ed25519.verify",phase="total"} 1', text)
+        metrics.reset()
+        self.assertNotIn("ed25519.verify", metrics.prometheus())
+
+    def test_ed25519_and_x25519_phases(self):
+        metrics = Metrics()
+        ed = Ed25519(metrics=metrics, cache=VerificationCache())
+        private_key = os.urandom(32)
+        public_key = ed.generate_public_key(private_key)
+        signature = ed.sign(private_key, b"message")
+        self.assertTrue(ed.verify(public_key, b"message", signature))
+        self.assertTrue(ed.verify(public_key, b"message", signature))
+        self.assertFalse(ed.verify_batch([(public_key, b"other", signature)] * 2))
+
+        x25519 = X25519(metrics=metrics)
+        x25519.scalar_multiply(os.urandom(32), x25519.generate_public_key(os.urandom(32)))
+
+        phases = {}
+        for operation, phase in metrics.histograms:
+            phases.setdefault(operation, set()).add(phase)
+        self.assertEqual(phases["ed25519.sign"], {"hash", "scalar_mult", "encode", "total"})
+        self.assertEqual(phases["ed25519.verify"], {"cache", "decode", "hash", "scalar_mult", "compare", "total"})
+        self.assertEqual(phases["ed25519.verify_batch"], {"cache", "decode", "hash", "scalar_mult", "compare", "total"})
+        self.assertEqual(phases["x25519.scalar_multiply"], {"decode", "scalar_mult", "encode", "total"})
+        # The second verify was a cache hit: no decode
+        self.assertEqual(metrics.histogram("ed25519.verify", "total").count, 2)
+        self.assertEqual(metrics.histogram("ed25519.verify", "decode").count, 1)
+        self.assertEqual(metrics.calls["x25519.scalar_multiply"], 2)
+
+    def test_signing_into_buffers(self):
+        metrics = Metrics()
+        ed = Ed25519(metrics=metrics)
+        keys = [os.urandom(32) for _ in range(2)]
+        out = bytearray(64 * 3)
+        ed.sign_many_into([(keys[0], b"a"), (keys[1], b"b"), (keys[0], b"c")], out)
+        ed.sign_into(keys[1], b"d", bytearray(64))
+        # One trace per bulk call, its phases summed over the signatures
+        self.assertEqual(metrics.histogram("ed25519.sign_many_into").count, 1)
+        self.assertEqual(metrics.histogram("ed25519.sign_many_into", "hash").count, 1)
+        self.assertEqual(metrics.histogram("ed25519.sign").count, 1)
+        self.assertEqual(out[:64], ed.sign(keys[0], b"a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+from collections import Counter
+import ed25519.utils
+import x25519.utils
+from ed25519.ed25519 import Ed25519
+from ed25519.utils import edwards_base_mult, edwards_point_add_extended, edwards_point_double_extended
+from x25519.opcount import counting, counted
+from x25519.x25519 import X25519
+
+
+class TestOperationCounts(unittest.TestCase):
+    def test_ladder_counts(self):
+        x25519 = X25519("ladder")
+        public_key = x25519.generate_public_key(os.urandom(32))
+        with counting() as counts:
+            x25519.scalar_multiply(os.urandom(32), public_key)
+        ladder = counts.per_call("X25519.scalar_multiply")
+        # 255 ladder steps of 4 squarings and 6 products, then one inversion and one product
+        self.assertEqual(ladder["square"], 4 * 255)
+        self.assertEqual(ladder["mul"] + ladder["mul_small"], 6 * 255 + 1)
+        self.assertEqual(ladder["inverse"], 1)
+        self.assertNotIn("sqrt", ladder)
+
+    def test_point_formulas_are_counted_once(self):
+        P = edwards_base_mult(int.from_bytes(os.urandom(32), "little"))
+        with counting() as counts:
+            edwards_point_add_extended(P, P)
+            edwards_point_double_extended(P)
+        self.assertEqual(dict(counts), {"mul": 13, "square": 4})
+
+    def test_counts_are_deterministic_and_attributed(self):
+        ed = Ed25519()
+        private_key = os.urandom(32)
+        public_key = ed.generate_public_key(private_key)
+        signature = ed.sign(private_key, b"message")
+        batch = [(public_key, b"message", signature)] * 3
+        runs = []
+        for _ in range(2):
+            with counting() as counts:
+                ed.sign(private_key, b"message")
+                ed.verify(public_key, b"message", signature)
+                ed.verify_batch(batch, vectorized=False)
+            runs.append(counts)
+        # Batch verification draws random coefficients; signing and verifying do not
+        for label in ("Ed25519.sign", "Ed25519.verify"):
+            self.assertEqual(runs[0].calls[label], runs[1].calls[label])
+        counts = runs[0]
+        self.assertEqual(set(counts.calls), {"Ed25519.sign", "Ed25519.verify", "Ed25519.verify_batch"})
+        # Decoding R and A takes one square root each
+        self.assertEqual(counts.per_call("Ed25519.verify")["sqrt"], 2)
+        # Everything happened inside one of the three calls
+        total = Counter()
+        for call in counts.calls.values():
+            total.update(call)
+        self.assertEqual(total, counts)
+
+    def test_nesting_and_decorator(self):
+        x25519 = X25519()
+        public_key = x25519.generate_public_key(os.urandom(32))
+
+        @counted("handshake")
+        def handshake():
+            return x25519.scalar_multiply(os.urandom(32), public_key)
+
+        with counting() as outer:
+            with counting() as inner:
+                handshake()
+            handshake()
+        self.assertEqual(outer.invocations["handshake"], 2)
+        self.assertEqual(inner.invocations["handshake"], 1)
+        # The enclosing call gets the operations of the calls it makes
+        self.assertNotIn("X25519.scalar_multiply", outer.calls)
+        self.assertEqual(outer["square"], 2 * inner["square"])
+        # Outside counting() the decorator is a plain call
+        self.assertEqual(len(handshake()), 32)
+
+    def test_instrumentation_is_removed(self):
+        field_mul, sign = x25519.utils.field_mul, Ed25519.sign
+        with counting():
+            self.assertIsNot(ed25519.utils.field_mul, field_mul)
+        self.assertIs(x25519.utils.field_mul, field_mul)
+        self.assertIs(ed25519.utils.field_mul, field_mul)
+        self.assertIs(Ed25519.sign, sign)
+
+
+if __name__ == "__main__":
+    unittest.main()
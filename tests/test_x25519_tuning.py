@@ -0,0 +1,103 @@
+import unittest
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+from unittest import mock
+import ed25519.ed25519
+from benchmarks import tuning as autotuning
+from ed25519.ed25519 import Ed25519
+from x25519 import tuning
+from tests.helpers import signed_batch
+
+
+class TestTuningProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "tuning.json")
+
+    def test_round_trip_keeps_defaults_for_missing_settings(self):
+        tuning.save({"ed25519.vectorized_batch_min": 64}, self.path, meta={"host": "test"})
+        settings = tuning.load(self.path)
+        self.assertEqual(settings["ed25519.vectorized_batch_min"], 64)
+        self.assertEqual(settings["ed25519.bucket_window"], tuning.DEFAULTS["ed25519.bucket_window"])
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["meta"], {"host": "test"})
+
+    def test_missing_and_disabled_profiles_give_defaults(self):
+        self.assertEqual(tuning.load(self.path), tuning.DEFAULTS)
+        with mock.patch.dict(os.environ, {tuning.PROFILE_ENV_VAR: ""}):
+            self.assertIsNone(tuning.profile_path())
+            self.assertEqual(tuning.load(), tuning.DEFAULTS)
+            with self.assertRaises(ValueError):
+                tuning.save({}, None)
+        with mock.patch.dict(os.environ, {tuning.PROFILE_ENV_VAR: self.path}):
+            self.assertEqual(tuning.profile_path(), self.path)
+
+    def test_bad_profiles_are_ignored_with_a_warning(self):
+        with self.assertRaises(ValueError):
+            tuning.save({"ed25519.bucket_window": 40}, self.path)
+        with self.assertRaises(ValueError):
+            tuning.save({"no.such.setting": 1}, self.path)
+        for content in ("{not json", json.dumps({"version": 99, "settings": {}}),
+                        json.dumps({"version": 1, "settings": {"x25519.vectorized_min_batch": "many"}})):
+            with open(self.path, "w") as f:
+                f.write(content)
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                self.assertEqual(tuning.load(self.path), tuning.DEFAULTS)
+            self.assertEqual(len(caught), 1)
+
+    def test_engines_read_the_profile_at_import(self):
+        tuning.save({"ed25519.vectorized_batch_min": 64, "ed25519.bucket_window": 6,
+                     "x25519.vectorized_min_batch": 32, "workers.shard_min_items": 100}, self.path)
+        code = (
+            "import ed25519.ed25519, ed25519.vectorized, ed25519.workers, x25519.x25519; "
+            "print(ed25519.ed25519.VECTORIZED_BATCH_MIN, ed25519.vectorized.BUCKET_WINDOW, "
+            "x25519.x25519.VECTORIZED_MIN_BATCH, ed25519.workers.SHARD_MIN_ITEMS)"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True,
+            env=dict(os.environ, **{tuning.PROFILE_ENV_VAR: self.path}),
+        ).stdout
+        self.assertEqual(output.split(), ["64", "6", "32", "100"])
+
+
+class TestBatchVerifyThreshold(unittest.TestCase):
+    def test_small_batches_are_verified_one_by_one(self):
+        engine = Ed25519()
+        batch = signed_batch(engine, 3)
+        public_key, message, signature = batch[1]
+        forged = batch[:1] + [(public_key, message + b"!", signature)] + batch[2:]
+        for threshold in (2, 4):
+            with mock.patch.object(ed25519.ed25519, "BATCH_VERIFY_MIN", threshold):
+                self.assertTrue(engine.verify_batch(batch))
+                self.assertFalse(engine.verify_batch(forged))
+
+
+class TestAutotune(unittest.TestCase):
+    def test_crossover(self):
+        timings = {("base", 1): 1, ("cand", 1): 2, ("base", 2): 2, ("cand", 2): 1,
+                   ("base", 4): 1, ("cand", 4): 2, ("base", 8): 4, ("cand", 8): 1, ("base", 16): 8, ("cand", 16): 1}
+
+        def timed(kind):
+            return lambda size: (kind, size)
+
+        with mock.patch.object(autotuning, "time_call", lambda call, repeats: timings[call]):
+            # Faster at 2, slower again at 4: only a win that lasts counts
+            self.assertEqual(autotuning.crossover((1, 2, 4, 8, 16), timed("base"), timed("cand")), 8)
+            self.assertEqual(autotuning.crossover((1, 4), timed("cand"), timed("base")), 1)
+            self.assertEqual(autotuning.crossover((1, 4), timed("base"), timed("cand")), 5)
+
+    def test_tune_batch_verify_min(self):
+        threshold = autotuning.tune_batch_verify_min(sizes=(2, 3), repeats=2)
+        self.assertIn(threshold, (2, 3, 4))
+        self.assertEqual(ed25519.ed25519.BATCH_VERIFY_MIN, tuning.setting("ed25519.batch_verify_min"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+# Backend registry: dispatch to libsodium (through PyNaCl) when available,
+# otherwise use the pure-Python engines in this package.
+import os
+import threading
+import warnings
+from typing import Callable, Optional
+
+# Environment variable selecting the default backend for X25519 and Ed25519
+BACKEND_ENV_VAR = "P79_BACKEND"
+
+# 'python' always uses the pure-Python engines, 'auto' uses the first registered
+# accelerated backend that loads and passes its self-test, any other name forces that backend.
+PYTHON_BACKEND = "python"
+AUTO_BACKEND = "auto"
+
+
+class BackendRegistry:
+    """
+    A registry of accelerated backends for one primitive.
+
+    Each backend is registered as a factory returning an object with the same methods
+    as the pure-Python class it replaces. A backend is loaded once per process, and
+    only after a differential self-test against the pure-Python engine succeeds
+    (under a lock, so threads resolving at the same time load it once).
+    resolve() returns None when the pure-Python engine should be used.
+    """
+
+    def __init__(self, self_test: Callable[[object], None]) -> None:
+        self._self_test = self_test
+        self._factories: dict[str, Callable[[], object]] = {}
+        self._loaded: dict[str, object] = {}
+        self._errors: dict[str, Exception] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], object]) -> None:
+        """Register an accelerated backend under the given name."""
+        if name in (PYTHON_BACKEND, AUTO_BACKEND):
+            raise ValueError(f"Backend name '{name}' is reserved.")
+        self._factories[name] = factory
+
+    def names(self) -> list[str]:
+        """All selectable backend names."""
+        return [AUTO_BACKEND, PYTHON_BACKEND] + list(self._factories)
+
+    def available(self) -> list[str]:
+        """The accelerated backends that load and pass their self-test on this host."""
+        return [name for name in self._factories if self._load(name) is not None]
+
+    def resolve(self, name: Optional[str] = None) -> Optional[object]:
+        """
+        Return the backend object for `name`, or None for the pure-Python engine.
+
+        If `name` is None, the BACKEND_ENV_VAR environment variable is used and
+        defaults to 'python'. With 'auto', unavailable backends are skipped;
+        forcing a backend that cannot be used raises an error.
+        """
+        if name is None:
+            name = os.environ.get(BACKEND_ENV_VAR, PYTHON_BACKEND)
+        if name == PYTHON_BACKEND:
+            return None
+        if name == AUTO_BACKEND:
+            for candidate in self._factories:
+                backend = self._load(candidate)
+                if backend is not None:
+                    return backend
+            return None
+        if name not in self._factories:
+            raise ValueError(f"Backend must be one of {self.names()}.")
+        backend = self._load(name)
+        if backend is None:
+            raise RuntimeError(f"Backend '{name}' is unavailable: {self._errors[name]}")
+        return backend
+
+    def _load(self, name: str) -> Optional[object]:
+        with self._lock:
+            if name not in self._loaded and name not in self._errors:
+                try:
+                    backend = self._factories[name]()
+                    self._self_test(backend)
+                except ImportError as error:
+                    self._errors[name] = error
+                except Exception as error:
+                    warnings.warn(f"Backend '{name}' failed its self-test and is disabled: {error}")
+                    self._errors[name] = error
+                else:
+                    self._loaded[name] = backend
+            return self._loaded.get(name)
+
+
+class SodiumX25519:
+    """X25519 through libsodium's crypto_scalarmult (via PyNaCl)."""
+
+    name = "libsodium"
+
+    def __init__(self) -> None:
+        from nacl import bindings
+        self._bindings = bindings
+
+    def scalar_multiply(self, private_key: bytes, public_key: bytes) -> Optional[bytes]:
+        """
+        Return the shared x-coordinate, or None when libsodium refuses the input
+        (it rejects low-order points that give an all-zero result), in which case
+        the caller falls back to the pure-Python engine so the result is unchanged.
+        """
+        try:
+            return self._bindings.crypto_scalarmult(bytes(private_key), bytes(public_key))
+        except Exception:
+            return None
+
+    def generate_public_key(self, private_key: bytes) -> bytes:
+        if len(private_key) != 32:
+            raise ValueError("Scalar must be exactly 32 bytes.")
+        return self._bindings.crypto_scalarmult_base(bytes(private_key))
+
+
+def _self_test_x25519(backend) -> None:
+    """Compare a backend against the pure-Python ladder on RFC 7748 and random inputs."""
+    from x25519.x25519 import X25519
+
+    reference = X25519('ladder', backend=PYTHON_BACKEND)
+    scalar = bytes.fromhex("a546e36bf0527c9d3b16154b82465edd62144c0ac1fc5a18506a2244ba449ac4")
+    u = bytes.fromhex("e6db6867583030db3594c1a424b15f7c726624ec26b3353b10a903a6d0ab1c4c")
+    expected = bytes.fromhex("c3da55379de9c6908e94ea4df28d084f32eccf03491c71f754b4075577a28552")
+    if backend.scalar_multiply(scalar, u) != expected:
+        raise RuntimeError("RFC 7748 vector mismatch")
+
+    private_key = os.urandom(32)
+    public_key = backend.generate_public_key(private_key)
+    if public_key != reference.generate_public_key(private_key):
+        raise RuntimeError("public key mismatch")
+    if backend.scalar_multiply(private_key, u) != reference.scalar_multiply(private_key, u):
+        raise RuntimeError("scalar multiplication mismatch")
+
+
+registry = BackendRegistry(_self_test_x25519)
+registry.register("libsodium", SodiumX25519)
@@ -0,0 +1,127 @@
+# Field arithmetic mod 2^255 - 19 on NumPy limb arrays, many elements per operation
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the vectorized engines check HAVE_NUMPY
+    np = None
+
+HAVE_NUMPY = np is not None
+
+P = 2**255 - 19
+
+# Radix 2^25.5: limb i holds LIMB_BITS[i] bits at bit offset LIMB_SHIFTS[i] (26, 25, 26, ...)
+NUM_LIMBS = 10
+LIMB_BITS = [26 - (i & 1) for i in range(NUM_LIMBS)]
+LIMB_SHIFTS = [sum(LIMB_BITS[:i]) for i in range(NUM_LIMBS)]
+
+
+def require_numpy() -> None:
+    """Raise RuntimeError if NumPy is not installed."""
+    if not HAVE_NUMPY:
+        raise RuntimeError("The vectorized engine requires NumPy (pip install numpy).")
+
+
+def to_limbs(values: list[int]):
+    """
+    Pack field elements into a (10, K) int64 array, one column (lane) per element.
+    Values are reduced mod p first.
+    """
+    require_numpy()
+    rows = []
+    for value in values:
+        value %= P
+        rows.append([(value >> shift) & ((1 << bits) - 1) for shift, bits in zip(LIMB_SHIFTS, LIMB_BITS)])
+    return np.array(rows, dtype=np.int64).reshape(len(values), NUM_LIMBS).T.copy()
+
+
+def from_limbs(f) -> list[int]:
+    """Unpack a limb array into one reduced integer per lane."""
+    f = carry(f.copy())
+    values = []
+    for lane in f.T.tolist():
+        values.append(sum(limb << shift for limb, shift in zip(lane, LIMB_SHIFTS)) % P)
+    return values
+
+
+def constant(value: int, lanes: int):
+    """The same field element in every lane."""
+    require_numpy()
+    return np.repeat(to_limbs([value]), lanes, axis=1)
+
+
+def carry(h):
+    """
+    Propagate carries in place so every limb fits its width again (the top carry
+    wraps around times 19, since 2^255 = 19 mod p). Limbs may be negative on input;
+    the arithmetic shift floors, so they are non-negative afterwards.
+    """
+    for i in range(NUM_LIMBS):
+        c = h[i] >> LIMB_BITS[i]
+        h[i] -= c << LIMB_BITS[i]
+        if i + 1 < NUM_LIMBS:
+            h[i + 1] += c
+        else:
+            h[0] += 19 * c
+    c = h[0] >> LIMB_BITS[0]
+    h[0] -= c << LIMB_BITS[0]
+    h[1] += c
+    return h
+
+
+def _constant(rows: list) -> "np.ndarray":
+    """A read-only (NUM_LIMBS, 1) column, so threads can share it."""
+    array = np.array(rows, dtype=np.int64)[:, None]
+    array.setflags(write=False)
+    return array
+
+
+# Constant arrays used by mul and carry_loose, built at import (None without NumPy)
+_BITS = _ODD_DOUBLE = None
+if HAVE_NUMPY:
+    _BITS = _constant(LIMB_BITS)
+    # The product of two odd limbs lands one bit above the limb boundary
+    # (25.5 * i rounds up twice), so it is counted twice in the lower limb
+    _ODD_DOUBLE = _constant([1 + (i & 1) for i in range(NUM_LIMBS)])
+
+
+def carry_loose(h):
+    """
+    Two rounds of carries on all limbs at once, enough to bring the output of a
+    product back below 2^26 + 2^20 per limb (not fully reduced, which mul accepts).
+    """
+    for _ in range(2):
+        c = h >> _BITS
+        h -= c << _BITS
+        h[1:] += c[:-1]
+        h[0] += 19 * c[-1]
+    return h
+
+
+def mul(f, g):
+    """
+    Lane-wise product f * g. Inputs may be sums or differences of two outputs of
+    mul (limbs below 2^27 in absolute value), which keeps every accumulated term
+    below 2^63; the result is loosely carried.
+    """
+    g2 = g * _ODD_DOUBLE
+    h = np.zeros((2 * NUM_LIMBS - 1, f.shape[1]), dtype=np.int64)
+    for i in range(NUM_LIMBS):
+        h[i:i + NUM_LIMBS] += f[i] * (g2 if i & 1 else g)
+    # Limbs 10..18 carry weight 2^255 = 19
+    h[:NUM_LIMBS - 1] += 19 * h[NUM_LIMBS:]
+    return carry_loose(h[:NUM_LIMBS])
+
+
+def square(f):
+    return mul(f, f)
+
+
+def mul_small(f, k: int):
+    """Lane-wise f * k for a constant k below 2^20."""
+    return carry_loose(f * k)
+
+
+def conditional_swap(mask, f, g) -> None:
+    """Swap the lanes of f and g (in place) where mask is -1; mask is 0 elsewhere."""
+    d = mask & (f ^ g)
+    f ^= d
+    g ^= d
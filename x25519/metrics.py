@@ -0,0 +1,205 @@
+# Per-phase latency histograms and span hooks for sign, verify, verify_batch and X25519
+import bisect
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+# Histogram bucket upper bounds in seconds: 1 us to ~4 s, a factor of 2 apart
+DEFAULT_BUCKETS = tuple(1e-6 * 2 ** i for i in range(23))
+
+
+class Span(NamedTuple):
+    """
+    One timed phase of an operation, as passed to the on_span callback.
+    A phase that ran several times (e.g. once per batch entry) is reported once,
+    starting when it first ran, with the summed duration. The phase of the span
+    covering the whole call is "total".
+    """
+    operation: str
+    phase: str
+    start: float
+    duration: float
+
+
+class Histogram:
+    """Latency histogram with fixed bucket upper bounds (seconds)."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("Bucket bounds must be a non-empty increasing sequence.")
+        self.buckets = tuple(buckets)
+        # One count per bound plus the overflow (+Inf) bucket, not cumulative
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-th quantile (0 <= q <= 1),
+        inf if it falls in the overflow bucket. Raises ValueError when empty.
+        """
+        if not self.count:
+            raise ValueError("The histogram is empty.")
+        rank = max(1, -(-self.count * q // 1))
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Trace:
+    """
+    Timing of one sampled call. The instrumented code calls mark(phase) at the end of
+    each phase; the time since the previous mark is added to that phase.
+    """
+
+    __slots__ = ("_metrics", "operation", "start", "_last", "phases")
+
+    def __init__(self, metrics: "Metrics", operation: str) -> None:
+        self._metrics = metrics
+        self.operation = operation
+        self.start = self._last = metrics.clock()
+        # phase -> [first start, summed duration]
+        self.phases: dict[str, list[float]] = {}
+
+    def mark(self, phase: str) -> None:
+        now = self._metrics.clock()
+        entry = self.phases.get(phase)
+        if entry is None:
+            self.phases[phase] = [self._last, now - self._last]
+        else:
+            entry[1] += now - self._last
+        self._last = now
+
+    def finish(self) -> None:
+        self._metrics._finish(self, self._metrics.clock())
+
+
+class _NullTrace:
+    """Stands in for a Trace when a call is not sampled or metrics are off."""
+
+    __slots__ = ()
+
+    def mark(self, phase: str) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Metrics:
+    """
+    Per-phase latency histograms for Ed25519 and X25519 operations.
+
+    Pass an instance as `metrics=` to Ed25519 or X25519. A sampled call records the
+    duration of each of its phases (e.g. hash, decode, scalar_mult, encode, compare)
+    and of the whole call into histograms keyed by (operation, phase), and reports
+    them as Span objects to on_span, e.g. to forward them to an external tracer.
+
+    Args:
+        sample_rate: Fraction of calls that are timed (0 to 1). Sampling is by
+            stride, not random: a rate of 0.01 times exactly every 100th call.
+            Every call is still counted in the operations total.
+        on_span: Optional callback receiving a Span per phase and one per call
+            (phase "total"). It runs on the calling thread, so keep it short.
+        buckets: Histogram bucket upper bounds in seconds.
+        clock: Time source (defaults to time.perf_counter).
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        on_span: Optional[Callable[[Span], None]] = None,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1.")
+        Histogram(buckets)  # validate the bounds once
+        self.sample_rate = sample_rate
+        self.on_span = on_span
+        self.buckets = tuple(buckets)
+        self.clock = clock
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self.calls: dict[str, int] = {}
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def trace(self, operation: str):
+        """
+        Start timing a call of `operation`: returns a Trace if the call is sampled,
+        otherwise NULL_TRACE, whose mark and finish do nothing.
+        """
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+            self._credit += self.sample_rate
+            if self._credit < 1:
+                return NULL_TRACE
+            self._credit -= 1
+        return Trace(self, operation)
+
+    def _finish(self, trace: Trace, end: float) -> None:
+        spans = [Span(trace.operation, phase, start, duration) for phase, (start, duration) in trace.phases.items()]
+        spans.append(Span(trace.operation, "total", trace.start, end - trace.start))
+        with self._lock:
+            for span in spans:
+                key = (span.operation, span.phase)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(self.buckets)
+                histogram.observe(span.duration)
+        if self.on_span is not None:
+            for span in spans:
+                self.on_span(span)
+
+    def histogram(self, operation: str, phase: str = "total") -> Histogram:
+        """The histogram of one phase of an operation. Raises KeyError if none was recorded."""
+        return self.histograms[(operation, phase)]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.calls.clear()
+            self._credit = 0.0
+
+    def prometheus(self, prefix: str = "p79") -> str:
+        """
+        The metrics in the Prometheus text exposition format: a counter of calls per
+        operation, and a histogram of the sampled phase durations (seconds) labelled
+        by operation and phase.
+        """
+        with self._lock:
+            calls = sorted(self.calls.items())
+            histograms = sorted(
+                (key, list(h.counts), h.sum, h.count) for key, h in self.histograms.items()
+            )
+        lines = [
+            f"# HELP {prefix}_operations_total Calls per operation, sampled or not.",
+            f"# TYPE {prefix}_operations_total counter",
+        ]
+        for operation, count in calls:
+            lines.append(f'{prefix}_operations_total{{operation="{operation}"}} {count}')
+        lines += [
+            f"# HELP {prefix}_phase_duration_seconds Duration of each phase of the sampled calls.",
+            f"# TYPE {prefix}_phase_duration_seconds histogram",
+        ]
+        for (operation, phase), counts, total, count in histograms:
+            labels = f'operation="{operation}",phase="{phase}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{prefix}_phase_duration_seconds_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{prefix}_phase_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{prefix}_phase_duration_seconds_sum{{{labels}}} {total!r}")
+            lines.append(f"{prefix}_phase_duration_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
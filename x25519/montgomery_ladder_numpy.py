@@ -0,0 +1,97 @@
+from x25519 import limbs
+from x25519.limbs import np
+from x25519.utils import batch_mult_inverse
+
+# Constants for Curve25519
+P = 2**255 - 19  # Prime modulus
+A24 = 121665  # (486662 - 2) // 4
+
+
+class VectorizedMontgomeryLadder:
+    """
+    Runs many Montgomery ladders in lockstep on NumPy limb arrays (x25519.limbs).
+
+    Every lane is one independent scalar multiplication. The ladder step is the same
+    straight-line formula sequence as MontgomeryLadder._ladder_step, applied to all
+    lanes at once, and the per-bit conditional swap is the same mask-based swap with
+    one mask per lane. The projective results are converted with one batched
+    inversion (Montgomery's trick) instead of one inversion per lane.
+
+    The interface mirrors MontgomeryLadder: scalars are already clamped integers and
+    points are affine x-coordinates. Requires NumPy.
+    """
+
+    def __init__(self, a24: int = A24) -> None:
+        limbs.require_numpy()
+        self.a24 = a24
+
+    def scalar_multiply_many(self, scalars: list[int], us: list[int]) -> list[int]:
+        """
+        Compute scalars[i] * us[i] for every lane i.
+
+        Args:
+            scalars: Clamped scalars (below 2^255).
+            us: Affine x-coordinates of the input points.
+
+        Returns:
+            The affine x-coordinates of the results (0 where the result is the point at infinity).
+        """
+        if len(scalars) != len(us):
+            raise ValueError("Need one point per scalar.")
+        lanes = len(scalars)
+        if lanes == 0:
+            return []
+
+        # Bits of every scalar, bits[t] holding bit t of all lanes
+        scalar_bytes = b"".join(scalar.to_bytes(32, "little") for scalar in scalars)
+        bits = np.unpackbits(
+            np.frombuffer(scalar_bytes, dtype=np.uint8).reshape(lanes, 32), axis=1, bitorder="little"
+        ).T.astype(np.int64)
+
+        x1 = limbs.to_limbs([u % (1 << 255) for u in us])
+        x2, z2 = limbs.constant(1, lanes), limbs.constant(0, lanes)
+        x3, z3 = x1.copy(), limbs.constant(1, lanes)
+        swap = np.zeros(lanes, dtype=np.int64)
+
+        # Process bits 254 down to 0, swapping per lane with a mask (as constant_swap does)
+        for t in range(254, -1, -1):
+            k_t = bits[t]
+            mask = -(swap ^ k_t)
+            limbs.conditional_swap(mask, x2, x3)
+            limbs.conditional_swap(mask, z2, z3)
+            swap = k_t
+            x2, z2, x3, z3 = self._ladder_step(x2, z2, x3, z3, x1)
+
+        # Final swap
+        mask = -swap
+        limbs.conditional_swap(mask, x2, x3)
+        limbs.conditional_swap(mask, z2, z3)
+
+        # One shared inversion for all lanes; z2 = 0 (point at infinity) maps to 0 as in the RFC
+        xs = limbs.from_limbs(x2)
+        zs = limbs.from_limbs(z2)
+        inverses = batch_mult_inverse([z or 1 for z in zs], P)
+        return [(x * inv) % P if z else 0 for x, z, inv in zip(xs, zs, inverses)]
+
+    def _ladder_step(self, x2, z2, x3, z3, x1):
+        """One ladder step for all lanes (see MontgomeryLadder._ladder_step)."""
+        A_val = x2 + z2
+        B_val = x2 - z2
+        AA = limbs.square(A_val)
+        BB = limbs.square(B_val)
+        E = AA - BB
+
+        C_val = x3 + z3
+        D_val = x3 - z3
+        DA = limbs.mul(D_val, A_val)
+        CB = limbs.mul(C_val, B_val)
+
+        # Update x3 and z3
+        x3_new = limbs.square(DA + CB)
+        z3_new = limbs.mul(x1, limbs.square(DA - CB))
+
+        # Update x2 and z2
+        x2_new = limbs.mul(AA, BB)
+        z2_new = limbs.mul(E, AA + limbs.mul_small(E, self.a24))
+
+        return x2_new, z2_new, x3_new, z3_new
@@ -0,0 +1,230 @@
+# Field-operation counters: how many multiplications, squarings, inversions and square
+# roots an operation performs, attributed to the high-level call (sign, verify, ...) it ran in
+import functools
+import importlib
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+# Products where one factor is below this bound (a24, 2, ...) are counted as mul_small
+SMALL_FACTOR = 1 << 32
+
+
+class OperationCounts(Counter):
+    """
+    The field operations counted in one counting() block.
+
+    The counter itself holds the totals; `calls` holds the totals per high-level call
+    (e.g. "Ed25519.verify") and `invocations` how many times each of them ran.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: dict[str, Counter] = {}
+        self.invocations: Counter = Counter()
+
+    def per_call(self, label: str) -> dict[str, float]:
+        """The average counts of one `label` call."""
+        if not self.invocations[label]:
+            raise KeyError(f"No {label!r} call was counted.")
+        n = self.invocations[label]
+        return {operation: count / n for operation, count in self.calls[label].items()}
+
+
+def _cost(**counts: int) -> Callable[..., dict[str, int]]:
+    return lambda *args, **kwargs: counts
+
+
+def _field_mul_cost(a: int, b: int, p: int) -> dict[str, int]:
+    if a == b:
+        return {"square": 1}
+    if min(abs(a), abs(b)) < SMALL_FACTOR:
+        return {"mul_small": 1}
+    return {"mul": 1}
+
+
+def _batch_inverse_cost(n: int, extra_muls: int = 0) -> dict[str, int]:
+    # Montgomery's trick: one inversion and 3(n-1) multiplications
+    if n == 0:
+        return {}
+    return {"inverse": 1, "mul": 3 * (n - 1) + extra_muls}
+
+
+def _lanes(*arrays) -> int:
+    return max(array.shape[-1] for array in arrays)
+
+
+# The instrumented functions and the cost of one call. Field operations made inside
+# one of them are part of its cost and are not counted again, so the point formulas
+# (some written with inline arithmetic) count what their formulas say.
+# Cached precomputation (the base-point comb, key tables) is counted when it is built.
+INSTRUMENTED = [
+    ("x25519.utils", "field_mul", _field_mul_cost),
+    ("x25519.utils", "mult_inverse", _cost(inverse=1)),
+    ("x25519.utils", "batch_mult_inverse", lambda values, p: _batch_inverse_cost(len(values))),
+    ("x25519.utils", "sqrt_mod", _cost(sqrt=1)),
+    ("x25519.limbs", "mul", lambda f, g: {"mul": _lanes(f, g)}),
+    ("x25519.limbs", "square", lambda f: {"square": _lanes(f)}),
+    ("x25519.limbs", "mul_small", lambda f, k: {"mul_small": _lanes(f)}),
+    ("ed25519.utils", "affine_to_extended", _cost(mul=1)),
+    ("ed25519.utils", "extended_to_niels", _cost(mul=1)),
+    ("ed25519.utils", "edwards_point_add_extended", _cost(mul=9)),
+    ("ed25519.utils", "edwards_point_add_niels", _cost(mul=7)),
+    ("ed25519.utils", "edwards_point_double_extended", _cost(square=4, mul=4)),
+    ("ed25519.utils", "normalize_extended", _cost(inverse=1, mul=3)),
+    ("ed25519.utils", "edwards_points_equal", _cost(mul=4)),
+    (
+        "ed25519.utils",
+        "encode_edwards_points",
+        lambda points: _batch_inverse_cost(len(points), extra_muls=2 * len(points)),
+    ),
+]
+
+# The high-level calls operations are attributed to (the outermost one, when they nest)
+HIGH_LEVEL_CALLS = [
+    ("ed25519.ed25519", "Ed25519", (
+        "generate_public_key", "sign", "sign_into", "sign_many_into",
+        "verify", "verify_batch", "verify_batch_columnar",
+    )),
+    ("x25519.x25519", "X25519", (
+        "generate_public_key", "scalar_multiply", "scalar_multiply_many",
+        "scalar_multiply_into", "scalar_multiply_many_into",
+    )),
+    ("x25519.montgomery_ladder", "MontgomeryLadder", ("scalar_multiply",)),
+    ("x25519.montgomery_ladder_numpy", "VectorizedMontgomeryLadder", ("scalar_multiply_many",)),
+]
+
+# Counting state. It is process-wide (not per thread): count one thread at a time.
+_active: list[OperationCounts] = []
+_label: Optional[str] = None
+_depth = 0
+_patches: list[tuple[object, str, object]] = []
+
+
+def _record(cost: dict[str, int]) -> None:
+    cost = {operation: count for operation, count in cost.items() if count}
+    for counts in _active:
+        counts.update(cost)
+        if _label is not None:
+            counts.calls[_label].update(cost)
+
+
+def _instrument(function: Callable, cost: Callable[..., dict[str, int]]) -> Callable:
+    @functools.wraps(function)
+    def counted_function(*args, **kwargs):
+        global _depth
+        if _depth:
+            return function(*args, **kwargs)
+        _record(cost(*args, **kwargs))
+        _depth += 1
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _depth -= 1
+    return counted_function
+
+
+@contextmanager
+def attribute(label: str) -> Iterator[None]:
+    """
+    Attribute the operations counted inside the block to `label`, unless the block
+    runs inside another attributed call (then they belong to the enclosing one).
+    """
+    global _label
+    if _label is not None or not _active:
+        yield
+        return
+    _label = label
+    for counts in _active:
+        counts.invocations[label] += 1
+        counts.calls.setdefault(label, Counter())
+    try:
+        yield
+    finally:
+        _label = None
+
+
+def counted(label: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator form of attribute() for your own functions; the label defaults to the
+    function's qualified name. Outside counting() it only checks whether counting is on.
+    """
+    def decorate(function: Callable) -> Callable:
+        name = label or function.__qualname__
+
+        @functools.wraps(function)
+        def attributed(*args, **kwargs):
+            if not _active:
+                return function(*args, **kwargs)
+            with attribute(name):
+                return function(*args, **kwargs)
+        return attributed
+    return decorate
+
+
+def _install() -> None:
+    # Replace every module-level reference to an instrumented function (the
+    # `from x25519.utils import field_mul` copies included), then wrap the high-level methods.
+    wrappers = {}
+    for module_name, name, cost in INSTRUMENTED:
+        function = getattr(importlib.import_module(module_name), name)
+        wrappers[id(function)] = (function, _instrument(function, cost))
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not isinstance(namespace, dict):
+            continue
+        for attr, value in list(namespace.items()):
+            entry = wrappers.get(id(value))
+            if entry is not None and entry[0] is value:
+                namespace[attr] = entry[1]
+                _patches.append((namespace, attr, value))
+
+    for module_name, class_name, methods in HIGH_LEVEL_CALLS:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        for method in methods:
+            original = cls.__dict__[method]
+            setattr(cls, method, counted(f"{class_name}.{method}")(original))
+            _patches.append((cls, method, original))
+
+
+def _uninstall() -> None:
+    while _patches:
+        target, attr, original = _patches.pop()
+        if isinstance(target, dict):
+            target[attr] = original
+        else:
+            setattr(target, attr, original)
+
+
+@contextmanager
+def counting() -> Iterator[OperationCounts]:
+    """
+    Count the field operations performed inside the block:
+
+        with counting() as counts:
+            Ed25519().verify(public_key, message, signature)
+        counts.per_call("Ed25519.verify")   # {"mul": ..., "square": ..., "inverse": ..., "sqrt": ...}
+
+    The primitives and point formulas are only wrapped while a block is open, so the
+    library runs unmodified (and at full speed) otherwise. Blocks may nest; each
+    sees everything counted while it is open. Vectorized (NumPy) operations count
+    one operation per lane. Work done by a native backend is not counted.
+    The wrappers are installed process-wide, so operations run by other threads
+    while a block is open are counted too: count with one thread at a time.
+    """
+    counts = OperationCounts()
+    if not _active:
+        try:
+            _install()
+        except BaseException:
+            _uninstall()
+            raise
+    _active.append(counts)
+    try:
+        yield counts
+    finally:
+        # Remove by identity: two counters with the same counts compare equal
+        del _active[next(i for i, active in enumerate(_active) if active is counts)]
+        if not _active:
+            _uninstall()
@@ -0,0 +1,107 @@
+# Host tuning profile: batch thresholds, window widths and worker counts, read at import
+#
+# The crossovers between the scalar and NumPy paths, the bucket width of the Pippenger
+# method and the point where a process pool pays off depend on the CPU and the Python
+# version. `python -m benchmarks tune` measures them on the host and saves a profile:
+#
+#     {"version": 1, "meta": {...where it was measured...}, "settings": {name: value}}
+#
+# The engines read their constants from PROFILE when they are imported; settings the
+# profile leaves out keep the defaults below.
+import json
+import os
+import warnings
+from typing import Optional
+
+PROFILE_VERSION = 1
+
+# Path of the profile; set it to an empty string to ignore any saved profile
+PROFILE_ENV_VAR = "P79_TUNING"
+DEFAULT_PROFILE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "p79-25519", "tuning.json")
+
+# name: (default, smallest value, largest value); every setting is an integer
+SETTINGS: dict[str, tuple[int, int, int]] = {
+    # Batches smaller than this are verified one signature at a time by verify_batch
+    "ed25519.batch_verify_min": (2, 2, 1 << 16),
+    # Batches from this size on use the NumPy bucket method (when NumPy is installed)
+    "ed25519.vectorized_batch_min": (128, 2, 1 << 20),
+    # Bits per signed digit of the bucket method (2^(bits - 1) buckets per window)
+    "ed25519.bucket_window": (8, 2, 12),
+    # Bulk X25519 from this many pairs on runs the NumPy ladder
+    "x25519.vectorized_min_batch": (128, 1, 1 << 20),
+    # Worker processes of a CryptoWorkerPool; 0 starts one per core
+    "workers.processes": (0, 0, 1024),
+    # Pool jobs with fewer items than this run in the calling process
+    "workers.shard_min_items": (1, 1, 1 << 20),
+}
+
+DEFAULTS: dict[str, int] = {name: default for name, (default, _, _) in SETTINGS.items()}
+
+
+def profile_path() -> Optional[str]:
+    """The profile path, or None if profiles are disabled."""
+    path = os.environ.get(PROFILE_ENV_VAR, DEFAULT_PROFILE_PATH)
+    return path or None
+
+
+def validate(settings: dict) -> dict[str, int]:
+    """Check settings against SETTINGS; raises ValueError on an unknown name or a bad value."""
+    for name, value in settings.items():
+        if name not in SETTINGS:
+            raise ValueError(f"Unknown tuning setting {name!r}.")
+        _, low, high = SETTINGS[name]
+        if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+            raise ValueError(f"Tuning setting {name!r} must be an integer in [{low}, {high}], not {value!r}.")
+    return dict(settings)
+
+
+def load(path: Optional[str] = None) -> dict[str, int]:
+    """
+    The defaults, updated with the settings of the profile at `path` (by default
+    profile_path()). A missing profile gives the defaults; a profile that cannot be
+    used (malformed, another version, bad values) is ignored with a warning, so a
+    stale file never stops the library from importing.
+    """
+    path = path if path is not None else profile_path()
+    settings = dict(DEFAULTS)
+    if path is None or not os.path.exists(path):
+        return settings
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+        if not isinstance(profile, dict) or profile.get("version") != PROFILE_VERSION:
+            raise ValueError(f"not a version {PROFILE_VERSION} tuning profile")
+        settings.update(validate(profile.get("settings", {})))
+    except (OSError, ValueError) as error:
+        warnings.warn(f"Ignoring the tuning profile {path}: {error}")
+        return dict(DEFAULTS)
+    return settings
+
+
+def save(settings: dict, path: Optional[str] = None, meta: Optional[dict] = None) -> str:
+    """
+    Write a profile (atomically) and return its path. Only the given settings are
+    stored; the others keep their defaults when the profile is loaded.
+    """
+    path = path if path is not None else profile_path()
+    if path is None:
+        raise ValueError(f"No profile path: {PROFILE_ENV_VAR} is set to an empty string.")
+    profile = {"version": PROFILE_VERSION, "meta": meta or {}, "settings": validate(settings)}
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(profile, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+# The profile of this process, read once at import
+PROFILE: dict[str, int] = load()
+
+
+def setting(name: str) -> int:
+    """The value of a setting in this process's profile."""
+    return PROFILE[name]
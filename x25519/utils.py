@@ -1,11 +1,44 @@
 # This file contains the utility functions used in the X25519 implementation
+import importlib.util
 from typing import Tuple
 
+# Whether NumPy is installed, found without importing it: the vectorized engines
+# (x25519.limbs and the modules built on it) are imported on their first use, so a
+# process that never runs them does not pay for importing NumPy.
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# sqrt(-1) mod 2^255 - 19, i.e. 2^((p-1)/4) mod p
+SQRT_M1 = 19681161376707505956807079304988542015446066515923890162744021073123829784752
+
 def mult_inverse(a: int, p: int) -> int:
     """Compute the multiplicative inverse using Fermat's Little Theorem of a mod p."""
     return pow(a, p - 2, p)
 
 
+def batch_mult_inverse(values: list[int], p: int) -> list[int]:
+    """
+    Invert many elements of F_p with a single exponentiation (Montgomery's trick).
+    
+    The prefix products a_0, a_0*a_1, ... are inverted once and unwound, which costs
+    3(n-1) multiplications plus one inversion instead of n inversions.
+    All values must be non-zero mod p.
+    """
+    prefix = []
+    acc = 1
+    for value in values:
+        acc = (acc * value) % p
+        prefix.append(acc)
+    if not values:
+        return []
+    inv = mult_inverse(acc, p)
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = (inv * prefix[i - 1]) % p
+        inv = (inv * values[i]) % p
+    inverses[0] = inv
+    return inverses
+
+
 def field_add(a: int, b: int, p: int) -> int:
     """Addition in the finite field F_p."""
     return (a + b) % p
@@ -39,7 +72,7 @@ def sqrt_mod(a: int, p: int = 2**255 - 19) -> int:
         return r
     elif (r * r) % p == (-a) % p:
         # Compute sqrt(-1) modulo p.
-        I = pow(2, (p - 1) // 4, p)
+        I = SQRT_M1 if p == 2**255 - 19 else pow(2, (p - 1) // 4, p)
         return (r * I) % p
     else:
         raise ValueError("No square root exists for a modulo p")
@@ -122,6 +155,21 @@ def int_to_bytes(value: int, length: int = 32) -> bytes:
     """
     return value.to_bytes(length, "little")
 
+def output_view(out, offset: int, length: int) -> memoryview:
+    """
+    Return a writable view of out[offset:offset + length], for functions that write
+    their results into a caller-provided bytearray or memoryview.
+    
+    Raises:
+        ValueError: If out is read-only or too short.
+    """
+    view = memoryview(out).cast("B")
+    if view.readonly:
+        raise ValueError("Output buffer is read-only.")
+    if offset < 0 or offset + length > len(view):
+        raise ValueError("Output buffer is too short.")
+    return view[offset:offset + length]
+
 def constant_swap(swap: int, x2: int, x3: int) -> Tuple[int, int]:
     mask = -swap
     dummy = mask & (x2 ^ x3)
@@ -1,11 +1,17 @@
 import os
-from x25519.utils import clamp_scalar, bytes_to_int, int_to_bytes, calculate_y_coordinate
+from x25519.utils import clamp_scalar, bytes_to_int, int_to_bytes, calculate_y_coordinate, output_view, HAVE_NUMPY
 from x25519.montgomery_ladder import MontgomeryLadder
 from x25519.montgomery_double_add import MontgomeryDoubleAdd
-from typing import Literal
+from x25519.backends import registry
+from x25519.metrics import Metrics, NULL_TRACE
+from x25519 import tuning
+from typing import Iterable, Literal, Optional, Union
 
 P = 2**255 - 19  # Prime modulus for Curve25519
 
+# Below this many pairs the per-call NumPy overhead outweighs running the lanes together
+VECTORIZED_MIN_BATCH = tuning.setting("x25519.vectorized_min_batch")
+
 
 class X25519:
     """
@@ -15,12 +21,33 @@ class X25519:
     
     This class handles clamping, byte conversion, and selecting the desired method.
     By default, the 'ladder' method is used.
+
+    The backend selects who does the arithmetic: 'python' (the method above), 'libsodium'
+    (forced, errors if unavailable) or 'auto' (libsodium when importable and its self-test
+    passes, otherwise the pure-Python method). None reads the P79_BACKEND environment
+    variable, which defaults to 'python'.
+
+    With metrics (x25519.metrics.Metrics), scalar_multiply records the duration of its
+    phases (decode, scalar_mult, encode) as the operation "x25519.scalar_multiply", and
+    a vectorized scalar_multiply_many records one "x25519.scalar_multiply_many" per call.
     """
 
-    def __init__(self, method: Literal['ladder', 'double_and_add'] = 'ladder') -> None:
+    def __init__(
+        self,
+        method: Literal['ladder', 'double_and_add'] = 'ladder',
+        backend: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
         if method not in ['ladder', 'double_and_add']:
             raise ValueError("Method must be 'ladder' or 'double_and_add'.")
         self.method = method
+        self._backend = registry.resolve(backend)
+        self.metrics = metrics
+
+    @property
+    def backend(self) -> str:
+        """Name of the backend in use."""
+        return self._backend.name if self._backend is not None else 'python'
 
     def scalar_multiply(self, private_key: bytes, public_key: bytes) -> bytes:
         """
@@ -33,8 +60,17 @@ class X25519:
         Returns:
             32-byte little-endian representation of the resulting x-coordinate.
         """
+        trace = self.metrics.trace("x25519.scalar_multiply") if self.metrics is not None else NULL_TRACE
+        if self._backend is not None:
+            result = self._backend.scalar_multiply(private_key, public_key)
+            trace.mark("backend")
+            if result is not None:
+                trace.finish()
+                return result
+
         scalar = clamp_scalar(private_key)
         u = bytes_to_int(public_key)
+        trace.mark("decode")
         
         if self.method == 'ladder':
             ladder = MontgomeryLadder(p=P)
@@ -45,8 +81,86 @@ class X25519:
             if y_coordinate is None:
                 raise ValueError("Failed to calculate y-coordinate.")
             result_x, _ = double_add.scalar_multiply(scalar, (u, y_coordinate))
+        trace.mark("scalar_mult")
 
-        return int_to_bytes(result_x)
+        result = int_to_bytes(result_x)
+        trace.mark("encode")
+        trace.finish()
+        return result
+
+    def scalar_multiply_many(
+        self,
+        pairs: Iterable[tuple[bytes, bytes]],
+        vectorized: Optional[bool] = None,
+    ) -> list[bytes]:
+        """
+        Perform X25519 scalar multiplication for many (private_key, public_key) pairs.
+
+        With the pure-Python backend and the 'ladder' method, large batches run as lanes
+        of one vectorized Montgomery ladder (VectorizedMontgomeryLadder) when NumPy is
+        installed. vectorized=None decides by batch size (VECTORIZED_MIN_BATCH), True
+        forces the vectorized engine (RuntimeError without NumPy, ValueError with the
+        'double_and_add' method, which validates u and would give different verdicts),
+        False computes each pair on its own with scalar_multiply.
+        
+        Returns:
+            The 32-byte results, in the order of the pairs.
+        """
+        pairs = list(pairs)
+        if vectorized is None:
+            vectorized = (
+                HAVE_NUMPY and self._backend is None and self.method == 'ladder'
+                and len(pairs) >= VECTORIZED_MIN_BATCH
+            )
+        if not vectorized:
+            return [self.scalar_multiply(private_key, public_key) for private_key, public_key in pairs]
+        if self.method != 'ladder':
+            raise ValueError("The vectorized engine only runs the 'ladder' method.")
+
+        # Imported here so that importing this module does not import NumPy
+        from x25519.montgomery_ladder_numpy import VectorizedMontgomeryLadder
+
+        trace = self.metrics.trace("x25519.scalar_multiply_many") if self.metrics is not None else NULL_TRACE
+        scalars = [clamp_scalar(private_key) for private_key, _ in pairs]
+        us = [bytes_to_int(public_key) for _, public_key in pairs]
+        trace.mark("decode")
+        xs = VectorizedMontgomeryLadder().scalar_multiply_many(scalars, us)
+        trace.mark("scalar_mult")
+        results = [int_to_bytes(x) for x in xs]
+        trace.mark("encode")
+        trace.finish()
+        return results
+
+    def scalar_multiply_into(
+        self,
+        private_key: bytes,
+        public_key: bytes,
+        out: Union[bytearray, memoryview],
+        offset: int = 0,
+    ) -> int:
+        """
+        Perform X25519 scalar multiplication and write the 32-byte result to
+        out[offset:offset + 32]. Returns the offset just past it.
+        Raises ValueError if out is read-only or too short.
+        """
+        return self.scalar_multiply_many_into([(private_key, public_key)], out, offset)
+
+    def scalar_multiply_many_into(
+        self,
+        pairs: Iterable[tuple[bytes, bytes]],
+        out: Union[bytearray, memoryview],
+        offset: int = 0,
+    ) -> int:
+        """
+        Perform X25519 scalar multiplication for each (private_key, public_key) pair and
+        write the 32-byte results back to back into out, starting at offset (computed
+        as in scalar_multiply_many). Returns the offset just past the last result.
+        """
+        pairs = list(pairs)
+        view = output_view(out, offset, 32 * len(pairs))
+        for i, result in enumerate(self.scalar_multiply_many(pairs)):
+            view[32 * i:32 * (i + 1)] = result
+        return offset + 32 * len(pairs)
 
 
     @staticmethod
@@ -70,6 +184,8 @@ class X25519:
         Returns:
             32-byte public key.
         """
+        if self._backend is not None:
+            return self._backend.generate_public_key(private_key)
         BASE_X = b'\x09' + b'\x00' * 31 # x-coordinate of the base point for Curve25519
         return self.scalar_multiply(private_key, BASE_X)
 